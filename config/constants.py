@@ -23,10 +23,26 @@ MAX_RETRY_ATTEMPTS = 3
 
 # Limites pour le mode AUTO itératif
 MAX_AUTO_ITERATIONS = 15  # Limite de sécurité pour éviter les boucles infinies
+# Historique du mode AUTO envoyé au modèle (compacté après chaque étape)
+AUTO_HISTORY_MAX_TOKENS = 4096  # Budget estimé (~4 caractères par token)
+AUTO_HISTORY_FULL_STEPS = 3  # Étapes récentes gardées en détail, les autres sur une ligne
+# Précision "améliorer" sans contenu: l'étape pré-générée pendant la saisie est gardée
+AUTO_IMPROVE_FILLER_MAX_LENGTH = 20
+AUTO_IMPROVE_FILLER_WORDS = frozenset({
+    'ok', 'oui', 'o', 'yes', 'y', 'non', 'rien', 'continue', 'continuer',
+    'vas-y', 'go', 'suite', 'pareil', 'idem'
+})
 
 # Limites de buffer pour sortie commande (protection mémoire)
 MAX_OUTPUT_SIZE_BYTES = 1 * 1024 * 1024  # 1MB max pour stdout/stderr
 OUTPUT_BUFFER_SIZE = 8192  # 8KB buffer pour lecture streaming
+OUTPUT_CALLBACK_BATCH_LINES = 64  # Lignes par appel du callback d'affichage (sortie déjà complète)
+
+# Shell PTY: la sentinelle n'est cherchée que dans la fin du buffer (O(N) au lieu
+# de O(N²) sur les gros outputs). La fenêtre doit rester > taille de lecture
+# pour qu'aucun marqueur ne soit sauté entre deux lectures.
+PTY_READ_SIZE = 4096  # Octets lus par appel read_nonblocking
+PTY_SEARCH_WINDOW_SIZE = 8192  # Fenêtre de recherche des sentinelles
 
 
 # ===== TIMEOUTS =====
@@ -40,19 +56,62 @@ MIN_PARALLEL_WORKERS = 2
 MAX_PARALLEL_WORKERS = 8
 
 # ===== MULTIPROCESSING =====
-# Type d'exécuteur: 'process' (vrai parallélisme) ou 'thread' (concurrent I/O)
-PARALLEL_EXECUTOR_TYPE = 'process'  # 'process' = multiprocessing, 'thread' = threading
-
 # Méthode de démarrage des processus ('spawn', 'fork', 'forkserver')
 # 'spawn' est recommandé pour Windows et est le plus sûr
 PARALLEL_PROCESS_START_METHOD = 'spawn'
 
-# Seuil minimum de tâches pour activer le multiprocessing
+# Seuil minimum de tâches pour activer l'exécution parallèle
 # En dessous de ce seuil, on utilise l'exécution séquentielle (évite l'overhead)
 MIN_TASKS_FOR_PARALLEL = 2
 
-# Fallback automatique sur threading si pickling échoue
-PARALLEL_FALLBACK_TO_THREAD = True
+# Analyses de parallélisation gardées par plan (ré-exécution après rollback, /plan)
+PARALLEL_ANALYSIS_CACHE_SIZE = 32
+
+# Intervalle de vérification d'une demande d'arrêt pendant un groupe parallèle
+PARALLEL_STOP_POLL_SECONDS = 0.1
+
+# Coût estimé d'une étape par action (ms), pour décider si un groupe vaut un dispatch
+# vers le pool. Action inconnue → PARALLEL_DEFAULT_STEP_COST_MS
+PARALLEL_STEP_COST_MS = {
+    'create_structure': 5,
+    'create_file': 10,
+    'git_commit': 200,
+    'run_command': 1000,
+}
+PARALLEL_DEFAULT_STEP_COST_MS = 1000
+
+# En dessous de ce coût total estimé, le groupe est exécuté séquentiellement
+# (le dispatch vers le pool coûterait plus que le travail lui-même)
+PARALLEL_MIN_GROUP_COST_MS = 50
+
+
+# ===== CACHE SÉMANTIQUE (modes FAST/AUTO) =====
+SEMANTIC_CACHE_SIZE = 128  # Réponses IA conservées (ring buffer)
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Similarité cosinus minimale pour un hit
+# Verbes critiques: une demande qui en contient doit les partager exactement
+# avec l'entrée en cache (évite "supprime X" servi pour "liste X")
+SEMANTIC_CACHE_CRITICAL_TOKENS = frozenset({
+    'rm', 'dd', 'sudo', 'mkfs', 'chmod', 'chown', 'kill', 'killall', 'shutdown',
+    'reboot', 'mv', 'truncate', 'shred', 'supprime', 'supprimer', 'efface',
+    'effacer', 'delete', 'remove', 'format', 'formate', 'formater'
+})
+
+
+# ===== CACHE DE TEMPLATES (demande normalisée → commande) =====
+TEMPLATE_CACHE_FILE = CACHE_DIR / "template_cache.json"
+TEMPLATE_CACHE_SIZE = 1024  # Templates conservés (éviction LRU)
+
+
+# ===== CACHE DE PLANS (demande de projet normalisée → plan de l'agent) =====
+PLAN_CACHE_FILE = CACHE_DIR / "plan_cache.json"
+PLAN_CACHE_SIZE = 256  # Plans conservés (éviction LRU)
+# Hits après lesquels un plan en cache est régénéré en arrière-plan pour revalidation
+PLAN_CACHE_REFRESH_HITS = 5
+PLAN_CACHE_REFRESH_QUEUE_SIZE = 10  # Revalidations en attente (au-delà: ignorées)
+# Analyses de demandes gardées en mémoire (ProjectPlanner.analyze_request)
+ANALYSIS_CACHE_SIZE = 256
+# Similarité de Jaccard minimale entre mots-clés pour réutiliser une analyse
+ANALYSIS_CACHE_JACCARD = 0.85
 
 
 # ===== AUTO-CORRECTION =====
@@ -63,6 +122,8 @@ MAX_CORRECTION_HISTORY = 50
 # ===== AFFICHAGE =====
 SECTION_WIDTH = 60
 PROGRESS_BAR_LENGTH = 40
+# Répertoires dont l'emplacement de .git/HEAD est mémorisé (prompt, éviction LRU)
+GIT_HEAD_CACHE_SIZE = 128
 
 
 # ===== CACHE =====
@@ -173,7 +173,7 @@ def get_help_text() -> str:
     commands_table.add_row("/cache", "Stats du cache (/cache clear)")
     commands_table.add_row("/hardware", "Infos hardware et optimisations")
     commands_table.add_row("/rollback", "Gère snapshots (list|restore|stats)")
-    commands_table.add_row("/security", "Rapport de sécurité")
+    commands_table.add_row("/security", "Rapport de sécurité (/security reload)")
     commands_table.add_row("/corrections", "Stats auto-correction (stats|last)")
     commands_table.add_row("/quit", "Quitte le terminal IA")
 
@@ -16,6 +16,8 @@ class Settings:
         self.ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama2")
         self.ollama_timeout = int(os.getenv("OLLAMA_TIMEOUT", "120"))
+        # Modèle d'embeddings (ex: nomic-embed-text) du cache sémantique; vide = cache désactivé
+        self.ollama_embed_model = os.getenv("OLLAMA_EMBED_MODEL", "").strip() or None
         self.auto_warmup = os.getenv("AUTO_WARMUP", "true").lower() == "true"  # Préchauffer le modèle au démarrage
 
         # Configuration streaming IA (affichage en temps réel du raisonnement)
@@ -92,6 +92,25 @@ class HistoryManager:
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde de l'historique: {e}")
 
+    def _append_entry(self, entry: Dict) -> None:
+        """
+        Ajoute une entrée en fin de fichier (une seule écriture O_APPEND)
+
+        Évite de réécrire tout l'historique (jusqu'à max_size lignes) à chaque commande.
+
+        Args:
+            entry: Entrée d'historique
+        """
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        try:
+            fd = os.open(self.history_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.error(f"Erreur lors de la sauvegarde de l'historique: {e}")
+
     def add_command(self, command: str, mode: str = "manual", success: bool = True) -> None:
         """
         Ajoute une commande à l'historique
@@ -125,8 +144,8 @@ class HistoryManager:
         # Réinitialiser l'index de navigation
         self.current_index = len(self.history)
 
-        # Sauvegarder
-        self._save_history()
+        # Sauvegarder (ajout d'une ligne; le fichier est retaillé au chargement)
+        self._append_entry(entry)
 
     def get_all(self) -> List[Dict]:
         """
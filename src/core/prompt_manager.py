@@ -4,6 +4,7 @@ Génère et personnalise le prompt du shell selon le mode, le contexte, etc.
 """
 
 import os
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from pathlib import Path
 import getpass
@@ -13,6 +14,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich import box
 from src.terminal.rich_console import get_console
+from config.constants import GIT_HEAD_CACHE_SIZE
 
 
 class PromptManager:
@@ -55,6 +57,9 @@ class PromptManager:
         'bright_white': '\033[97m',
     }
 
+    # Symboles de mode déjà colorés (MANUAL, AUTO, AGENT)
+    _EMOJI_MODES = frozenset(('⌨️', '🤖', '🏗️'))
+
     def __init__(self, enable_colors: bool = True):
         """
         Initialise le gestionnaire de prompt
@@ -62,10 +67,18 @@ class PromptManager:
         Args:
             enable_colors: Activer les couleurs ANSI
         """
-        self.enable_colors = enable_colors and self._supports_colors()
+        # Support des couleurs évalué une seule fois (variables d'env stables)
+        self._colors_supported = self._supports_colors()
+        self.enable_colors = enable_colors and self._colors_supported
         self.username = getpass.getuser()
         self.hostname = platform.node()
 
+        # Cache du dernier prompt généré (repaints fréquents sous prompt_toolkit)
+        self._prompt_cache: Optional[str] = None
+        self._prompt_cache_key: Optional[tuple] = None
+        # Emplacement du fichier .git/HEAD par répertoire (évite la remontée, LRU borné)
+        self._git_head_paths: 'OrderedDict[str, Path]' = OrderedDict()
+
     def _supports_colors(self) -> bool:
         """Vérifie si le terminal supporte les couleurs ANSI"""
         # Sur Windows, vérifier si c'est Windows Terminal ou un terminal moderne
@@ -119,29 +132,81 @@ class PromptManager:
 
         return path
 
-    def get_git_branch(self, directory: str) -> Optional[str]:
+    def _find_git_head(self, directory: str) -> Optional[Path]:
         """
-        Détecte la branche Git courante
+        Localise le fichier .git/HEAD du dépôt contenant le répertoire
+
+        Seul un dépôt trouvé est mémorisé (GIT_HEAD_CACHE_SIZE répertoires au
+        plus): hors dépôt, la remontée est refaite à chaque appel pour qu'un
+        `git init` soit vu immédiatement.
 
         Args:
             directory: Le répertoire à vérifier
 
         Returns:
-            Nom de la branche Git ou None
+            Chemin du fichier HEAD ou None hors d'un dépôt Git
         """
+        git_head_path = self._git_head_paths.get(directory)
+        if git_head_path is not None:
+            self._git_head_paths.move_to_end(directory)
+            return git_head_path
+
+        git_head_path = None
         try:
             git_dir = Path(directory)
             while git_dir != git_dir.parent:
                 git_head = git_dir / '.git' / 'HEAD'
                 if git_head.exists():
-                    content = git_head.read_text().strip()
-                    if content.startswith('ref: refs/heads/'):
-                        return content.replace('ref: refs/heads/', '')
-                    return 'detached'
+                    git_head_path = git_head
+                    break
                 git_dir = git_dir.parent
-        except:
+        except OSError:
             pass
-        return None
+
+        if git_head_path is not None:
+            self._git_head_paths[directory] = git_head_path
+            while len(self._git_head_paths) > GIT_HEAD_CACHE_SIZE:
+                self._git_head_paths.popitem(last=False)
+        return git_head_path
+
+    def _git_head_mtime(self, directory: str) -> Optional[float]:
+        """
+        Retourne la date de modification de .git/HEAD (un seul os.stat)
+
+        Args:
+            directory: Le répertoire à vérifier
+
+        Returns:
+            mtime du fichier HEAD ou None
+        """
+        git_head = self._find_git_head(directory)
+        if git_head is None:
+            return None
+        try:
+            return os.stat(git_head).st_mtime
+        except OSError:
+            return None
+
+    def get_git_branch(self, directory: str) -> Optional[str]:
+        """
+        Détecte la branche Git courante
+
+        Args:
+            directory: Le répertoire à vérifier
+
+        Returns:
+            Nom de la branche Git ou None
+        """
+        git_head = self._find_git_head(directory)
+        if git_head is None:
+            return None
+        try:
+            content = git_head.read_text().strip()
+            if content.startswith('ref: refs/heads/'):
+                return content.replace('ref: refs/heads/', '')
+            return 'detached'
+        except OSError:
+            return None
 
     def generate_prompt(
         self,
@@ -166,6 +231,14 @@ class PromptManager:
         Returns:
             Le prompt formaté
         """
+        # Entrées inchangées (et HEAD non modifié) → prompt identique
+        key = (
+            mode_symbol, current_dir, show_user, show_host, show_git, multiline,
+            self._git_head_mtime(current_dir) if show_git else None
+        )
+        if key == self._prompt_cache_key:
+            return self._prompt_cache
+
         parts = []
 
         # Mode symbol (colorisé selon le mode)
@@ -201,11 +274,15 @@ class PromptManager:
             line1 = ' '.join(parts)
             # Deuxième ligne avec le prompt
             prompt_char = self.colorize('>', 'bright_white')
-            return f"\n{line1}\n{prompt_char} "
+            prompt = f"\n{line1}\n{prompt_char} "
         else:
             # Tout sur une ligne
             prompt_char = self.colorize('>', 'bright_white')
-            return f"\n{' '.join(parts)} {prompt_char} "
+            prompt = f"\n{' '.join(parts)} {prompt_char} "
+
+        self._prompt_cache_key = key
+        self._prompt_cache = prompt
+        return prompt
 
     def _colorize_mode_symbol(self, symbol: str) -> str:
         """
@@ -217,20 +294,9 @@ class PromptManager:
         Returns:
             Symbole colorisé
         """
-        # Mapping symbole → couleur
-        colors = {
-            '⌨️': 'cyan',        # MANUAL
-            '🤖': 'bright_green', # AUTO
-            '🏗️': 'bright_yellow' # AGENT
-        }
-
-        # Si le symbole est un emoji, pas besoin de colorer
-        # Sinon, appliquer la couleur correspondante
-        for emoji, color in colors.items():
-            if emoji in symbol:
-                return symbol  # Les emojis sont déjà colorés
-
-        # Fallback: colorer en blanc
+        # Les emojis de mode sont déjà colorés, seul le fallback est colorisé
+        if symbol in self._EMOJI_MODES:
+            return symbol
         return self.colorize(symbol, 'bright_white')
 
     def generate_simple_prompt(self, mode_symbol: str, current_dir: str) -> str:
@@ -323,7 +389,7 @@ class PromptManager:
             'enable_colors': self.enable_colors,
             'username': self.username,
             'hostname': self.hostname,
-            'supports_colors': self._supports_colors()
+            'supports_colors': self._colors_supported
         }
 
     def __repr__(self) -> str:
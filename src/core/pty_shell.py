@@ -4,18 +4,67 @@ Utilise pexpect pour maintenir une session bash persistante
 """
 
 import os
+import re
+import atexit
+import weakref
 import logging
 from typing import Dict, Any, Optional
-import pexpect
 from pathlib import Path
-from src.utils.text_processing import (
-    strip_ansi_codes,
-    clean_command_echo,
-    extract_exit_code_from_output
-)
+from src.utils.text_processing import clean_pty_output
+from config.constants import PTY_READ_SIZE, PTY_SEARCH_WINDOW_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Prompt fixe configuré dans le shell PTY
+SHELL_PROMPT = 'CoTer> '
+
+# Sentinelle émise par PROMPT_COMMAND après chaque commande: exit code + cwd
+# en un seul aller-retour (remplace les anciens 'echo $?' et 'pwd')
+SENTINEL_PROMPT_COMMAND = 'printf "__COTER__:%s:%s\\n" "$?" "$PWD"'
+SENTINEL_RE = re.compile(r'__COTER__:(-?\d+):([^\r\n]*)\r?\n' + re.escape(SHELL_PROMPT))
+
+# Marqueur de fin de configuration au démarrage: le format printf diffère du
+# marqueur affiché, l'écho de la ligne de configuration ne peut donc pas matcher
+BOOT_MARKER_FORMAT = '__COTER_%s__'
+BOOT_MARKER = '__COTER_BOOT__'
+
+# Builtins silencieux en cas de succès (fast path: pas de nettoyage d'output)
+_NO_OUTPUT_CMDS = frozenset({'cd', 'export', 'unset', 'alias', 'unalias'})
+# Métacaractères shell: la commande peut alors produire un output
+_SHELL_METACHARS_RE = re.compile(r'[;&|<>`\n]|\$\(')
+
+
+def _is_silent_command(command: str) -> bool:
+    """
+    Vérifie si une commande ne produit aucun output quand elle réussit
+
+    'cd -', 'export' / 'alias' sans affectation et les options ('-p', ...)
+    affichent quelque chose et sont donc exclus.
+
+    Args:
+        command: Commande shell
+
+    Returns:
+        True si l'output peut être ignoré en cas de succès
+    """
+    parts = command.split(maxsplit=1)
+    if len(parts) != 2 or parts[0] not in _NO_OUTPUT_CMDS:
+        return False
+
+    args = parts[1]
+    if args.startswith('-') or _SHELL_METACHARS_RE.search(args):
+        return False
+    if parts[0] in ('export', 'alias'):
+        return '=' in args
+    return True
+
+
+def _close_at_exit(shell_ref: 'weakref.ref') -> None:
+    """Ferme le shell à la sortie de l'interpréteur s'il existe encore"""
+    shell = shell_ref()
+    if shell is not None:
+        shell.close()
+
 
 class PersistentShell:
     """
@@ -27,29 +76,43 @@ class PersistentShell:
     - cd fonctionne nativement
     - Aliases et functions shell fonctionnent
     - C'est un VRAI terminal shell interactif
+
+    Fermer explicitement avec close() ou utiliser un bloc with:
+        with PersistentShell() as shell:
+            shell.execute("ls")
     """
 
-    def __init__(self, shell_path: str = "/bin/bash", timeout: int = 30):
+    def __init__(self, shell_path: str = "/bin/bash", timeout: int = 30,
+                 env: Optional[Dict[str, str]] = None):
         """
         Initialise une session shell PTY persistante
 
         Args:
             shell_path: Chemin vers le shell (bash par défaut)
             timeout: Timeout pour les commandes en secondes
+            env: Environnement isolé du shell (None = hérite de os.environ)
         """
         self.shell_path = shell_path
         self.timeout = timeout
+        self.env = env
         self.shell = None
         self.current_dir = os.getcwd()
-        self.prompt_pattern = r'.*[$#] $'  # Pattern pour détecter le prompt
+        self.prompt_pattern = SHELL_PROMPT  # Prompt fixe posé au démarrage
+        self._needs_drain = False  # Sortie résiduelle après un timeout
 
         # Démarrer la session
         self._start_shell()
 
+        # Fermeture à la sortie sans __del__ (weakref: l'objet reste collectable)
+        atexit.register(_close_at_exit, weakref.ref(self))
+
         logger.info(f"Session PTY démarrée: {shell_path} (PID: {self.shell.pid})")
 
     def _start_shell(self):
         """Démarre une nouvelle session shell PTY"""
+        # Import différé: pexpect n'est chargé qu'au premier shell démarré
+        import pexpect
+
         try:
             # Spawn un shell bash interactif
             self.shell = pexpect.spawn(
@@ -57,34 +120,49 @@ class PersistentShell:
                 ['-i'],  # Mode interactif
                 encoding='utf-8',
                 timeout=self.timeout,
-                env=os.environ.copy()
+                maxread=PTY_READ_SIZE,
+                # Fenêtre glissante: le regex ne rescanne pas tout l'output
+                # (spawn.before conserve malgré tout la sortie complète)
+                searchwindowsize=PTY_SEARCH_WINDOW_SIZE,
+                env=self.env  # None: hérite de l'environnement sans copie
             )
 
-            # Attendre le prompt initial de bash
-            self.shell.expect([r'.*[$#] ', r'.*[$#]$'], timeout=5)
-
-            # Configurer le prompt pour faciliter la détection
-            # PS1 simple sans couleurs pour parsing facile
-            self.shell.sendline('export PS1="CoTer> "')
-            self.shell.expect('CoTer> ', timeout=5)
-            self.prompt_pattern = 'CoTer> '
-
-            # Désactiver Bracketed Paste Mode (empêche les séquences ^[[?2004l/h)
-            self.shell.sendline('bind "set enable-bracketed-paste off" 2>/dev/null || true')
-            self.shell.expect(self.prompt_pattern, timeout=5)
+            # pexpect lit déjà par blocs (select + os.read de maxread octets):
+            # le vrai coût fixe par commande était le sleep de 50 ms avant
+            # chaque envoi. Inutile ici: la commande n'est envoyée qu'après
+            # la sentinelle + prompt, quand bash attend déjà une saisie.
+            self.shell.delaybeforesend = None
+
+            # Configuration envoyée sans attendre le prompt initial de bash
+            # (inconnu: PS1 de l'utilisateur, bruit du .bashrc), en un seul
+            # aller-retour:
+            # - PS1 simple sans couleurs pour parsing facile
+            # - Bracketed Paste Mode désactivé (empêche les séquences ^[[?2004l/h)
+            # - Historique bash désactivé (on gère le nôtre)
+            # - Répertoire courant
+            # - Sentinelle après chaque commande (exit code + cwd avant le prompt)
+            # - Marqueur de boot, construit par printf pour ne pas matcher l'écho
+            self.shell.sendline(
+                f'export PS1="{SHELL_PROMPT}"; '
+                'bind "set enable-bracketed-paste off" 2>/dev/null; '
+                'unset HISTFILE 2>/dev/null; '
+                f'cd "{self.current_dir}" 2>/dev/null; '
+                f"PROMPT_COMMAND='{SENTINEL_PROMPT_COMMAND}'; "
+                f"printf '{BOOT_MARKER_FORMAT}\\n' BOOT"
+            )
 
-            # Désactiver l'historique bash (on gère le nôtre) - silencieusement
-            self.shell.sendline('unset HISTFILE 2>/dev/null')
-            self.shell.expect(self.prompt_pattern, timeout=5)
+            # Chaînes fixes (expect_exact): pas de regex sur le bruit de démarrage
+            self.shell.expect_exact(BOOT_MARKER, timeout=10)
+            self.shell.expect_exact(SHELL_PROMPT, timeout=5)
 
-            # Aller dans le répertoire courant
-            self.shell.sendline(f'cd "{self.current_dir}" 2>/dev/null')
-            self.shell.expect(self.prompt_pattern, timeout=5)
+            # Listes de patterns compilées une fois par shell (expect_list),
+            # pexpect ne reconstruit plus son searcher à chaque commande
+            self._expect_list = self.shell.compile_pattern_list(
+                [SENTINEL_RE, pexpect.TIMEOUT, pexpect.EOF]
+            )
 
-            # Vider le buffer pour éviter les restes de configuration
-            self.shell.buffer = ''
-            if hasattr(self.shell, 'before'):
-                self.shell.before = ''
+            # La sentinelle consomme tout jusqu'au prompt: buffer déjà vide
+            self._needs_drain = False
 
             logger.debug("Shell PTY configuré avec succès (mode propre)")
 
@@ -92,111 +170,114 @@ class PersistentShell:
             logger.error(f"Erreur lors du démarrage du shell PTY: {e}")
             raise
 
-    def execute(self, command: str) -> Dict[str, Any]:
+    def _drain(self):
         """
-        Exécute une commande dans le shell persistant
+        Resynchronise le flux après un timeout
+
+        Consomme la sentinelle tardive de la commande interrompue: le match
+        pexpect jette alors toute la sortie résiduelle qui la précède.
+        """
+        index = self.shell.expect_list(self._expect_list, timeout=1)
+        if index == 0:
+            logger.debug("[BUFFER NETTOYÉ] Jeté %d caractères résiduels", len(self.shell.before))
+            self._needs_drain = False
+        else:
+            logger.warning("Commande précédente toujours en cours, sortie résiduelle conservée")
+
+    def _send_command(self, command: str):
+        """Envoie une commande au shell (redémarré si mort, resynchronisé si besoin)"""
+        if not self.shell or not self.shell.isalive():
+            logger.warning("Shell PTY mort, redémarrage...")
+            self._start_shell()
+
+        logger.debug("Exécution PTY: %.100s", command)
+
+        # Sortie résiduelle uniquement possible après un timeout
+        if self._needs_drain:
+            self._drain()
+
+        # Envoyer la commande
+        self.shell.sendline(command)
+
+    def _build_result(self, index: int, command: str) -> Dict[str, Any]:
+        """
+        Construit le résultat d'une commande à partir du match de la sentinelle
 
         Args:
-            command: Commande shell à exécuter
+            index: Index retourné par expect (0=sentinelle, 1=timeout, 2=EOF)
+            command: Commande exécutée
 
         Returns:
             Dict avec 'output', 'success', 'exit_code'
         """
-        if not self.shell or not self.shell.isalive():
-            logger.warning("Shell PTY mort, redémarrage...")
+        if index == 1:  # Timeout
+            logger.warning(f"Timeout lors de l'exécution: {command}")
+            self._needs_drain = True
+            return {
+                'output': f"Timeout ({self.timeout}s)",
+                'success': False,
+                'exit_code': -1
+            }
+        elif index == 2:  # EOF (shell fermé)
+            logger.error("Shell PTY terminé inopinément")
             self._start_shell()
+            return {
+                'output': "Shell terminé, redémarrage...",
+                'success': False,
+                'exit_code': -1
+            }
 
-        try:
-            logger.debug(f"Exécution PTY: {command[:100]}")
-
-            # Nettoyer le buffer AVANT d'envoyer la commande (évite race condition)
-            # Lire et jeter tout le contenu résiduel du buffer
-            try:
-                junk = self.shell.read_nonblocking(size=100000, timeout=0)
-                if junk:
-                    logger.debug(f"[BUFFER NETTOYÉ] Jeté {len(junk)} bytes: {repr(junk[:100])}")
-            except:
-                pass  # Pas grave si le buffer est vide
-
-            # Envoyer la commande
-            self.shell.sendline(command)
-
-            # Attendre le prompt suivant
-            index = self.shell.expect([
-                self.prompt_pattern,
-                pexpect.TIMEOUT,
-                pexpect.EOF
-            ], timeout=self.timeout)
-
-            if index == 1:  # Timeout
-                logger.warning(f"Timeout lors de l'exécution: {command}")
-                return {
-                    'output': f"Timeout ({self.timeout}s)",
-                    'success': False,
-                    'exit_code': -1
-                }
-            elif index == 2:  # EOF (shell fermé)
-                logger.error("Shell PTY terminé inopinément")
-                self._start_shell()
-                return {
-                    'output': "Shell terminé, redémarrage...",
-                    'success': False,
-                    'exit_code': -1
-                }
-
-            # Récupérer l'output (tout avant le prompt)
-            raw_output = self.shell.before
-
-            # Logs de debug pour diagnostiquer les problèmes
-            logger.debug(f"[PTY] RAW OUTPUT (100 premiers chars): {repr(raw_output[:100])}")
-
-            # Nettoyer les séquences ANSI AVANT tout traitement
-            clean_output = strip_ansi_codes(raw_output)
-            logger.debug(f"[PTY] CLEAN OUTPUT (100 premiers chars): {repr(clean_output[:100])}")
-
-            # Nettoyer l'output (enlever la commande elle-même qui est echo par bash)
-            output = clean_command_echo(clean_output, command)
-            logger.debug(f"[PTY] FINAL OUTPUT (100 premiers chars): {repr(output[:100])}")
-
-            # Récupérer l'exit code de la dernière commande
-            # Vider le buffer AVANT pour isoler cette commande interne
-            self.shell.buffer = ''
-            if hasattr(self.shell, 'before'):
-                self.shell.before = ''
-
-            self.shell.sendline('echo $?')
-            self.shell.expect(self.prompt_pattern, timeout=5)
-
-            # Nettoyer l'output de echo $?
-            exit_code_raw = self.shell.before
-            exit_code_clean = strip_ansi_codes(exit_code_raw)
-
-            # Extraire l'exit code (utilise l'utilitaire centralisé)
-            exit_code = extract_exit_code_from_output(exit_code_clean)
-            success = (exit_code == 0)
-
-            # Vider le buffer AVANT _update_current_dir() pour l'isoler complètement
-            self.shell.buffer = ''
-            if hasattr(self.shell, 'before'):
-                self.shell.before = ''
-
-            # Mettre à jour le working directory (au cas où cd)
-            self._update_current_dir()
-
-            # Vider le buffer APRÈS toutes les commandes internes pour la prochaine commande
-            self.shell.buffer = ''
-            if hasattr(self.shell, 'before'):
-                self.shell.before = ''
-
-            logger.debug(f"Commande terminée - Exit code: {exit_code}, Success: {success}")
+        # Exit code et working directory extraits de la sentinelle
+        exit_code = int(self.shell.match.group(1))
+        success = (exit_code == 0)
+        self.current_dir = self.shell.match.group(2) or self.current_dir
 
+        # Fast path: builtin silencieux réussi (cd, export X=1, ...)
+        if success and _is_silent_command(command):
             return {
-                'output': output,
-                'success': success,
-                'exit_code': exit_code,
+                'output': '',
+                'success': True,
+                'exit_code': 0,
                 'command': command
             }
 
+        # Récupérer l'output (tout avant la sentinelle)
+        raw_output = self.shell.before
+
+        # Logs de debug pour diagnostiquer les problèmes
+        logger.debug("[PTY] RAW OUTPUT (100 premiers chars): %r", raw_output[:100])
+
+        # Nettoyer les séquences ANSI et l'écho de la commande par bash
+        output = clean_pty_output(raw_output, command)
+        logger.debug("[PTY] FINAL OUTPUT (100 premiers chars): %r", output[:100])
+
+        logger.debug("Commande terminée - Exit code: %d, Success: %s", exit_code, success)
+
+        return {
+            'output': output,
+            'success': success,
+            'exit_code': exit_code,
+            'command': command
+        }
+
+    def execute(self, command: str) -> Dict[str, Any]:
+        """
+        Exécute une commande dans le shell persistant
+
+        Args:
+            command: Commande shell à exécuter
+
+        Returns:
+            Dict avec 'output', 'success', 'exit_code'
+        """
+        try:
+            self._send_command(command)
+
+            # Attendre la sentinelle (output + exit code + cwd en un aller-retour)
+            index = self.shell.expect_list(self._expect_list, timeout=self.timeout)
+
+            return self._build_result(index, command)
+
         except Exception as e:
             logger.error(f"Erreur lors de l'exécution PTY: {e}", exc_info=True)
             return {
@@ -205,41 +286,23 @@ class PersistentShell:
                 'exit_code': -1
             }
 
-    def _update_current_dir(self):
-        """Met à jour le répertoire courant depuis le shell"""
+    def refresh_cwd(self):
+        """
+        Force la mise à jour du répertoire courant depuis le shell
+
+        execute() lit déjà le cwd dans la sentinelle de chaque commande: aucun
+        'pwd' n'est envoyé dans le cas courant. Cette méthode reste disponible
+        pour les appelants qui doivent resynchroniser explicitement.
+        """
         try:
-            # Vider le buffer AVANT pour isoler cette commande interne
-            self.shell.buffer = ''
-            if hasattr(self.shell, 'before'):
-                self.shell.before = ''
-
-            self.shell.sendline('pwd')
-            self.shell.expect(self.prompt_pattern, timeout=5)
-
-            # Nettoyer les séquences ANSI
-            pwd_raw = self.shell.before
-            pwd_clean = strip_ansi_codes(pwd_raw)
-            pwd_lines = [l.strip() for l in pwd_clean.split('\n') if l.strip()]
-
-            # Chercher la ligne qui ressemble à un chemin
-            for line in pwd_lines:
-                # Ignorer la commande "pwd" elle-même
-                if 'pwd' in line.lower():
-                    continue
-                # Chemin Unix commence par /
-                if line.startswith('/'):
-                    self.current_dir = line
-                    logger.debug(f"Working directory: {self.current_dir}")
-                    return
-                # Chemin Windows : lettre + : + reste du chemin (ex: C:\Users\...)
-                if len(line) > 2 and line[1] == ':' and line[0].isalpha():
-                    self.current_dir = line
-                    logger.debug(f"Working directory: {self.current_dir}")
-                    return
-
-            # Fallback: prendre la deuxième ligne (après "pwd")
-            if len(pwd_lines) > 1:
-                self.current_dir = pwd_lines[1]
+            # ':' ne produit aucune sortie: le cwd vient directement du groupe
+            # de la sentinelle (ASCII brut émis par printf, rien à nettoyer)
+            self.shell.sendline(':')
+            self.shell.expect(SENTINEL_RE, timeout=5)
+
+            if self.shell.match.group(2):
+                self.current_dir = self.shell.match.group(2)
+                logger.debug("Working directory: %s", self.current_dir)
 
         except Exception as e:
             logger.warning(f"Erreur lors de la mise à jour du cwd: {e}")
@@ -261,6 +324,8 @@ class PersistentShell:
 
     def close(self):
         """Ferme proprement la session shell"""
+        import pexpect
+
         if self.shell and self.shell.isalive():
             logger.info("Fermeture de la session PTY...")
             try:
@@ -271,8 +336,10 @@ class PersistentShell:
             finally:
                 self.shell.close()
 
-    def __del__(self):
-        """Destructeur - ferme le shell à la destruction de l'objet"""
+    def __enter__(self) -> 'PersistentShell':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
 
     def __repr__(self):
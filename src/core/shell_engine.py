@@ -3,6 +3,7 @@ Shell Engine - Moteur du shell hybride CoTer
 Gère les modes MANUAL/AUTO/AGENT et leur état
 """
 
+from collections import Counter, deque
 from enum import Enum
 from typing import Optional, Dict, Any
 import logging
@@ -31,10 +32,11 @@ class ShellMode(Enum):
     def from_string(cls, mode_str: str) -> 'ShellMode':
         """Convertit une chaîne en ShellMode"""
         mode_str = mode_str.lower().strip()
-        for mode in cls:
-            if mode.value == mode_str:
-                return mode
-        raise ValueError(f"Mode invalide: {mode_str}. Modes valides: {[m.value for m in cls]}")
+        try:
+            # Lookup O(1) dans la table valeur → membre de l'Enum
+            return cls(mode_str)
+        except ValueError:
+            raise ValueError(f"Mode invalide: {mode_str}. Modes valides: {[m.value for m in cls]}") from None
 
 
 class ShellEngine:
@@ -48,6 +50,24 @@ class ShellEngine:
     - Les statistiques d'utilisation
     """
 
+    # Nombre maximum de modes conservés dans l'historique (ring buffer)
+    MAX_MODE_HISTORY = 256
+
+    # Tables immuables, construites une seule fois au chargement de la classe
+    _SYMBOLS = {
+        ShellMode.MANUAL: "⌨️",   # Clavier pour mode manuel
+        ShellMode.AUTO: "🤖",     # Robot pour mode IA
+        ShellMode.FAST: "⚡",     # Éclair pour mode rapide
+        ShellMode.AGENT: "🏗️"     # Construction pour mode projet
+    }
+
+    _DESCRIPTIONS = {
+        ShellMode.MANUAL: "Mode Shell Direct - Commandes exécutées sans IA",
+        ShellMode.AUTO: "Mode IA Activé - Langage naturel via Ollama (Itératif)",
+        ShellMode.FAST: "Mode IA Rapide - Une commande optimale et c'est fini",
+        ShellMode.AGENT: "Mode Projet Autonome - Planification multi-étapes"
+    }
+
     def __init__(self, default_mode: ShellMode = ShellMode.MANUAL):
         """
         Initialise le moteur du shell
@@ -56,8 +76,9 @@ class ShellEngine:
             default_mode: Mode par défaut au démarrage (MANUAL par défaut)
         """
         self._current_mode = default_mode
-        self._mode_history = [default_mode]
-        self._command_count = {mode: 0 for mode in ShellMode}
+        self._mode_history = deque([default_mode], maxlen=self.MAX_MODE_HISTORY)
+        self._mode_change_count = 0
+        self._command_count = Counter()
         self._session_start_mode = default_mode
 
         logger.info(f"ShellEngine initialisé en mode {default_mode.value}")
@@ -89,6 +110,7 @@ class ShellEngine:
         old_mode = self._current_mode
         self._current_mode = new_mode
         self._mode_history.append(new_mode)
+        self._mode_change_count += 1
 
         logger.info(f"Mode changé: {old_mode.value} → {new_mode.value}")
         return True
@@ -110,7 +132,12 @@ class ShellEngine:
         return self.switch_mode(ShellMode.AGENT)
 
     def increment_command_count(self) -> None:
-        """Incrémente le compteur de commandes pour le mode actuel"""
+        """
+        Incrémente le compteur de commandes pour le mode actuel
+
+        Appelé par les handlers au moment où une commande est réellement
+        exécutée (pas pour une demande bloquée, annulée ou sans commande).
+        """
         self._command_count[self._current_mode] += 1
 
     def get_command_count(self, mode: Optional[ShellMode] = None) -> int:
@@ -140,16 +167,17 @@ class ShellEngine:
         return {
             "current_mode": self._current_mode.value,
             "session_start_mode": self._session_start_mode.value,
-            "mode_changes": len(self._mode_history) - 1,
-            "command_counts": {mode.value: count for mode, count in self._command_count.items()},
+            "mode_changes": self._mode_change_count,
+            "command_counts": {mode.value: self._command_count[mode] for mode in ShellMode},
             "total_commands": self.get_total_command_count(),
             "mode_history": [mode.value for mode in self._mode_history]
         }
 
     def reset_statistics(self) -> None:
         """Réinitialise les statistiques (commandes, historique)"""
-        self._command_count = {mode: 0 for mode in ShellMode}
-        self._mode_history = [self._current_mode]
+        self._command_count = Counter()
+        self._mode_history = deque([self._current_mode], maxlen=self.MAX_MODE_HISTORY)
+        self._mode_change_count = 0
         logger.info("Statistiques réinitialisées")
 
     def is_manual_mode(self) -> bool:
@@ -175,13 +203,7 @@ class ShellEngine:
         Returns:
             Emoji/symbole représentant le mode
         """
-        symbols = {
-            ShellMode.MANUAL: "⌨️",   # Clavier pour mode manuel
-            ShellMode.AUTO: "🤖",     # Robot pour mode IA
-            ShellMode.FAST: "⚡",     # Éclair pour mode rapide
-            ShellMode.AGENT: "🏗️"     # Construction pour mode projet
-        }
-        return symbols[self._current_mode]
+        return self._SYMBOLS[self._current_mode]
 
     def get_mode_description(self) -> str:
         """
@@ -190,13 +212,7 @@ class ShellEngine:
         Returns:
             Description textuelle du mode
         """
-        descriptions = {
-            ShellMode.MANUAL: "Mode Shell Direct - Commandes exécutées sans IA",
-            ShellMode.AUTO: "Mode IA Activé - Langage naturel via Ollama (Itératif)",
-            ShellMode.FAST: "Mode IA Rapide - Une commande optimale et c'est fini",
-            ShellMode.AGENT: "Mode Projet Autonome - Planification multi-étapes"
-        }
-        return descriptions[self._current_mode]
+        return self._DESCRIPTIONS[self._current_mode]
 
     def __repr__(self) -> str:
         return f"ShellEngine(mode={self._current_mode.value}, commands={self.get_total_command_count()})"
@@ -3,14 +3,37 @@ Handlers pour le traitement des commandes et entrées utilisateur
 
 Ce package contient les gestionnaires séparés pour différents types de commandes
 afin de réduire la complexité de TerminalInterface (principe SRP).
+
+Les handlers sont importés à la demande (PEP 562): importer le package ne
+charge pas leurs dépendances (shell PTY, client Ollama, Rich...).
 """
 
-from .special_command_handler import SpecialCommandHandler
-from .mode_handler import ModeHandler
-from .user_input_handler import UserInputHandler
+import importlib
 
-__all__ = [
+__all__ = (
     'SpecialCommandHandler',
     'ModeHandler',
     'UserInputHandler'
-]
+)
+
+# Nom exporté → sous-module qui le définit
+_LAZY_IMPORTS = {
+    'SpecialCommandHandler': '.special_command_handler',
+    'ModeHandler': '.mode_handler',
+    'UserInputHandler': '.user_input_handler',
+}
+
+
+def __getattr__(name):
+    """Importe un handler au premier accès puis le met en cache dans le module"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
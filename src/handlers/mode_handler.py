@@ -5,9 +5,20 @@ Extrait de terminal_interface.py pour réduire la complexité
 et séparer les responsabilités.
 """
 
-from typing import TYPE_CHECKING, Callable, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 from config import prompts
-from config.constants import MAX_AUTO_ITERATIONS
+from config.constants import (
+    MAX_AUTO_ITERATIONS,
+    AUTO_IMPROVE_FILLER_MAX_LENGTH,
+    AUTO_IMPROVE_FILLER_WORDS
+)
+from src.core.shell_engine import ShellMode
+from src.modules.command_parser import HistoryStep
+from src.utils.semantic_cache import SemanticCache
+from src.utils.template_cache import TemplateCache
 
 if TYPE_CHECKING:
     from src.terminal_interface import TerminalInterface
@@ -39,13 +50,78 @@ class ModeHandler:
         self.logger = terminal.logger
         self.settings = terminal.settings
         self.executor = terminal.executor
-        self.parser = terminal.parser
-        self.ollama = terminal.ollama
         self.security = terminal.security
-        self.agent = terminal.agent
         self.shell_engine = terminal.shell_engine
         self.result_handler = terminal.result_handler
 
+        # Méthodes du terminal liées une fois (appelées à chaque étape AUTO)
+        self._stream_tags = terminal._stream_ai_response_with_tags
+        self._stream_history = terminal._stream_ai_response_with_history
+        self._is_task_completed = terminal._is_task_completed
+        self._prompt_next = terminal._prompt_next_action_with_arrows
+        self._confirm = terminal.user_input.confirm_command
+        self._autonomous = terminal._handle_autonomous_mode
+
+        # Handler par mode (un seul lookup au lieu d'une chaîne de is_*_mode())
+        self._mode_dispatch = {
+            ShellMode.MANUAL: self.handle_manual_mode,
+            ShellMode.AUTO: self._dispatch_auto,
+            ShellMode.FAST: self._dispatch_fast,
+            ShellMode.AGENT: self._dispatch_agent
+        }
+
+        # Plan d'arrière-plan en attente pour la requête AUTO en cours
+        self._plan_future = None
+        # Interruption de la pré-génération en cours (None si aucune)
+        self._spec_cancel = None
+        # Réponse IA à mettre en cache sémantique après exécution réussie
+        # (demande, réponse, cwd, scope), None si aucune
+        self._sem_pending = None
+
+    # Dépendances des modes IA: résolues au premier accès (jamais en MANUAL)
+
+    @cached_property
+    def parser(self):
+        """CommandParser du terminal"""
+        return self.terminal.parser
+
+    @cached_property
+    def ollama(self):
+        """Client Ollama du terminal"""
+        return self.terminal.ollama
+
+    @cached_property
+    def agent(self):
+        """Agent autonome du terminal"""
+        return self.terminal.agent
+
+    @cached_property
+    def _spec_executor(self) -> ThreadPoolExecutor:
+        """Pré-génération de l'étape AUTO suivante pendant la saisie « améliorer »"""
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="AutoSpeculation")
+
+    @cached_property
+    def _sem_cache(self) -> Optional[SemanticCache]:
+        """Cache sémantique des réponses IA (None sans modèle d'embeddings configuré)"""
+        if not self.ollama.embed_model:
+            return None
+        return SemanticCache(self.ollama.embed)
+
+    @cached_property
+    def _template_cache(self) -> TemplateCache:
+        """Cache de templates: demande normalisée → commande (lu sur disque au premier accès)"""
+        return TemplateCache()
+
+    def close(self) -> None:
+        """Libère les ressources des modes IA (plan en attente, thread de pré-génération)"""
+        if self._plan_future is not None:
+            self._plan_future.cancel()
+            self._plan_future = None
+        if self._spec_cancel is not None:
+            self._spec_cancel.set()
+        if '_spec_executor' in self.__dict__:
+            self._spec_executor.shutdown(wait=False)
+
     def handle_user_request(self, user_input: str) -> None:
         """
         Route une demande utilisateur vers le mode approprié.
@@ -53,38 +129,27 @@ class ModeHandler:
         Args:
             user_input: Demande de l'utilisateur
         """
-        # Incrémenter le compteur de commandes
-        self.shell_engine.increment_command_count()
-
         try:
-            # MODE MANUAL : Exécution directe sans IA
-            if self.shell_engine.is_manual_mode():
-                self.handle_manual_mode(user_input)
-                return
-
-            # MODE AUTO : Parsing IA itératif avec boucle
-            elif self.shell_engine.is_auto_mode():
-                self.console.print()
-                self.handle_auto_mode(user_input)
-                return
+            self._mode_dispatch[self.shell_engine.current_mode](user_input)
+        except Exception as error:
+            self.logger.error(f"Erreur lors du traitement: {error}", exc_info=True)
+            self.console.error(f"Erreur: {error}", blank_before=True)
 
-            # MODE FAST : Parsing IA one-shot (une commande et c'est fini)
-            elif self.shell_engine.is_fast_mode():
-                self.console.print()
-                self.handle_fast_mode(user_input)
-                return
+    def _dispatch_auto(self, user_input: str) -> None:
+        """MODE AUTO : Parsing IA itératif avec boucle"""
+        self.console.print()
+        self.handle_auto_mode(user_input)
 
-            # MODE AGENT : Toujours proposer le mode autonome
-            elif self.shell_engine.is_agent_mode():
-                self.console.print()
-                self.console.info("Mode AGENT : Analyse en cours...")
-                self.terminal._handle_autonomous_mode(user_input)
-                return
+    def _dispatch_fast(self, user_input: str) -> None:
+        """MODE FAST : Parsing IA one-shot (une commande et c'est fini)"""
+        self.console.print()
+        self.handle_fast_mode(user_input)
 
-        except Exception as error:
-            self.logger.error(f"Erreur lors du traitement: {error}", exc_info=True)
-            self.console.print()
-            self.console.error(f"Erreur: {error}")
+    def _dispatch_agent(self, user_input: str) -> None:
+        """MODE AGENT : Toujours proposer le mode autonome"""
+        self.shell_engine.increment_command_count()
+        self.console.info("Mode AGENT : Analyse en cours...", blank_before=True)
+        self._autonomous(user_input)
 
     # ═══════════════════════════════════════════════════════════════
     # MODE MANUAL
@@ -102,6 +167,7 @@ class ModeHandler:
             if self.terminal.builtins.is_builtin(user_input):
                 result = self.terminal.builtins.execute(user_input)
                 if result is not None:
+                    self.shell_engine.increment_command_count()
                     # Commande builtin exécutée - utiliser le handler unifié
                     self.result_handler.handle_result(
                         result=result,
@@ -111,16 +177,12 @@ class ModeHandler:
                     )
                     return
 
-            # Callback pour afficher la sortie en temps réel
-            def stream_output(line: str) -> None:
-                """Affiche chaque ligne de sortie en temps réel"""
-                self.console.print(f"[output]{line}[/output]")
-
             # Exécution avec shell PTY
+            self.shell_engine.increment_command_count()
             self.console.print()  # Ligne vide avant la sortie
             result = self.executor.execute_pty(
                 user_input,
-                output_callback=stream_output
+                output_callback=self.console.print_output
             )
 
             # Traiter le résultat via le handler unifié (display + history + logging)
@@ -148,23 +210,11 @@ class ModeHandler:
         Args:
             user_input: Demande en langage naturel
         """
-        self.logger.info(f"Entrée en mode FAST one-shot - Demande: {user_input[:100]}...")
+        self.logger.info("Entrée en mode FAST one-shot - Demande: %.100s...", user_input)
         try:
-            # Parser la demande avec streaming
+            # Parser la demande avec streaming (prompt système FAST)
             self.console.info("⚡ Mode FAST - Génération d'une commande optimale...")
-
-            # Temporairement changer le prompt système pour mode FAST
-            from config.prompts import SYSTEM_PROMPT_FAST
-            original_prompt = self.parser._get_parsing_system_prompt
-
-            # Override temporaire de la méthode pour utiliser SYSTEM_PROMPT_FAST
-            self.parser._get_parsing_system_prompt = lambda: SYSTEM_PROMPT_FAST
-
-            try:
-                ai_response = self.terminal._stream_ai_response_with_tags(user_input)
-            finally:
-                # Restaurer le prompt original
-                self.parser._get_parsing_system_prompt = original_prompt
+            ai_response = self._cached_ai_response(user_input, "fast")
 
             command = ai_response.get('command')
             risk_level = ai_response.get('risk_level', 'unknown')
@@ -178,53 +228,35 @@ class ModeHandler:
             is_valid, security_level, security_reason = self.security.validate_command(command)
 
             if not is_valid:
-                self.console.print()
-                self.console.error("Commande bloquée")
+                self.console.error("Commande bloquée", blank_before=True)
                 self.console.print(f"   Raison: {security_reason}")
                 self.logger.warning(f"Commande bloquée: {command} - {security_reason}")
                 return
 
             # Demander confirmation si nécessaire
             if security_level == 'high' or risk_level == 'high':
-                if not self.terminal._confirm_command(command, security_level, security_reason):
+                if not self._confirm(command, security_level, security_reason):
                     self.console.error("Commande annulée")
                     return
 
             # Exécuter la commande avec streaming
+            self.shell_engine.increment_command_count()
             self.console.info("Exécution...")
             self.console.print()  # Ligne vide avant la sortie
 
-            # Callback pour afficher la sortie en temps réel
-            def stream_output(line: str) -> None:
-                """Affiche chaque ligne de sortie en temps réel"""
-                self.console.print(f"[output]{line}[/output]")
-
             result = self.executor.execute_streaming(
                 command,
-                output_callback=stream_output,
+                output_callback=self.console.print_output,
                 strict_mode=False
             )
 
-            # Traiter le résultat
-            self.result_handler.handle_result(
-                result,
-                command,
-                user_input,
-                "fast",
-                skip_output=True
-            )
-
-            # Enregistrer dans l'historique de sécurité
-            self.security.record_command_execution(
-                command=command,
-                success=result['success'],
-                risk_level=security_level
-            )
+            # Traiter le résultat (affichage, historiques, logs)
+            self._finalize_step(result, command, user_input, "fast", security_level)
 
-            # Ajouter à l'historique du parser
-            self.parser.add_to_history(user_input, command, result.get('output', ''))
+            # Mémoriser la forme de la demande (jamais pour une commande à risque élevé)
+            self._remember_command(user_input, command, "fast", result, security_level, risk_level)
 
-            self.logger.info(f"Fin du mode FAST one-shot - Commande: {command}")
+            self.logger.info("Fin du mode FAST one-shot - Commande: %s", command)
 
         except Exception as error:
             self.logger.error(f"Erreur mode fast: {error}", exc_info=True)
@@ -242,7 +274,7 @@ class ModeHandler:
         Args:
             user_input: Demande en langage naturel
         """
-        self.logger.info(f"Entrée en mode AUTO itératif - Demande: {user_input[:100]}...")
+        self.logger.info("Entrée en mode AUTO itératif - Demande: %.100s...", user_input)
         try:
             # Vérifier si la planification en arrière-plan est disponible
             if self._try_background_planning(user_input):
@@ -251,23 +283,32 @@ class ModeHandler:
             # BOUCLE ITÉRATIVE
             context_history = []  # Historique des commandes et résultats
             step_number = 0
-            self.logger.info(f"Démarrage de la boucle itérative (max {MAX_AUTO_ITERATIONS} étapes)")
+            speculative_response = None  # Étape pré-générée pendant "améliorer"
+            self.logger.info("Démarrage de la boucle itérative (max %d étapes)", MAX_AUTO_ITERATIONS)
 
             while step_number < MAX_AUTO_ITERATIONS:
+                # Plan d'arrière-plan devenu prêt entre deux étapes: il prend le relais
+                if step_number and self._poll_background_plan():
+                    self.logger.info("Plan d'arrière-plan exécuté après %d étapes", step_number)
+                    return
+
                 step_number += 1
-                self.logger.debug(f"Itération {step_number}/{MAX_AUTO_ITERATIONS}")
-                self.console.print()
-                self.console.info(f"🔄 Étape {step_number}/{MAX_AUTO_ITERATIONS}")
+                self.logger.debug("Itération %d/%d", step_number, MAX_AUTO_ITERATIONS)
+                self.console.info(f"🔄 Étape {step_number}/{MAX_AUTO_ITERATIONS}", blank_before=True)
 
-                # Générer la commande suivante avec l'IA
-                ai_response = self._generate_next_command(user_input, context_history)
+                # Générer la commande suivante avec l'IA (ou reprendre la pré-génération)
+                if speculative_response is not None:
+                    ai_response, speculative_response = speculative_response, None
+                    self.console.info(f"Étape pré-générée → {ai_response['command']}")
+                else:
+                    ai_response = self._generate_next_command(user_input, context_history)
 
                 command = ai_response.get('command')
                 risk_level = ai_response.get('risk_level', 'unknown')
                 explanation = ai_response.get('explanation', '')
 
-                self.logger.info(f"Commande générée: {command}")
-                self.logger.debug(f"Risk level: {risk_level}, Explication: {explanation[:100]}...")
+                self.logger.info("Commande générée: %s", command)
+                self.logger.debug("Risk level: %s, Explication: %.100s...", risk_level, explanation)
 
                 if not command:
                     # Pas de commande générée
@@ -275,9 +316,11 @@ class ModeHandler:
                     self.console.warning("Aucune commande générée")
                     break
 
-                # Valider et exécuter la commande
+                # Valider et exécuter la commande (la 1re étape, sans historique,
+                # est mémorisée sous le prompt "default" comme en mode FAST)
                 execution_result = self._validate_and_execute_command(
-                    command, user_input, risk_level
+                    command, user_input, risk_level,
+                    cache_scope=None if context_history else "default"
                 )
 
                 if execution_result is None:
@@ -285,33 +328,31 @@ class ModeHandler:
                     break
 
                 # Ajouter au contexte itératif
-                context_history.append({
-                    'command': command,
-                    'output': execution_result.get('output', ''),
-                    'success': execution_result['success']
-                })
-                self.logger.debug(f"Contexte mis à jour: {len(context_history)} étapes au total")
+                context_history.append(HistoryStep(
+                    command, execution_result.get('output', ''), execution_result['success']
+                ))
+                self.parser.compact_history(context_history)
+                self.logger.debug("Contexte mis à jour: %d étapes au total", len(context_history))
 
                 # Détecter si la tâche est complétée
-                if self.terminal._is_task_completed(explanation):
+                if self._is_task_completed(explanation):
                     self.logger.info("Tâche détectée comme complétée par l'IA")
-                    self.console.print()
-                    self.console.success("✓ Tâche complétée!")
+                    self.console.success("✓ Tâche complétée!", blank_before=True)
                     break
 
                 # Demander à l'utilisateur s'il veut continuer
-                user_choice = self.terminal._prompt_next_action_with_arrows()
-                self.logger.info(f"Choix utilisateur: {user_choice}")
+                user_choice = self._prompt_next()
+                self.logger.info("Choix utilisateur: %s", user_choice)
 
                 if user_choice == "stop":
                     self.logger.info("Arrêt de la boucle itérative demandé par l'utilisateur")
                     self.console.info("Arrêt demandé par l'utilisateur")
                     break
                 elif user_choice == "improve":
-                    # Demander des précisions supplémentaires
-                    improvement = input("\n💬 Que voulez-vous préciser/améliorer ? ").strip()
+                    # Demander des précisions (l'étape suivante est pré-générée pendant la saisie)
+                    improvement, speculative_response = self._read_improvement(user_input, context_history)
                     if improvement:
-                        self.logger.info(f"Précision utilisateur ajoutée: {improvement[:100]}...")
+                        self.logger.info("Précision utilisateur ajoutée: %.100s...", improvement)
                         user_input = f"{user_input}\n\nPrécision: {improvement}"
                         self.console.success("Précision prise en compte")
                     continue
@@ -325,15 +366,19 @@ class ModeHandler:
                 self.logger.warning(f"Limite de {MAX_AUTO_ITERATIONS} itérations atteinte")
                 self.console.warning(f"⚠️  Limite de {MAX_AUTO_ITERATIONS} itérations atteinte")
 
-            self.logger.info(f"Fin du mode AUTO itératif - {step_number} étapes exécutées")
+            self.logger.info("Fin du mode AUTO itératif - %d étapes exécutées", step_number)
 
         except KeyboardInterrupt:
             self.logger.info("Interruption par l'utilisateur (Ctrl+C) en mode AUTO")
-            self.console.print()
-            self.console.warning("Interruption par l'utilisateur (Ctrl+C)")
+            self.console.warning("Interruption par l'utilisateur (Ctrl+C)", blank_before=True)
         except Exception as error:
             self.logger.error(f"Erreur mode auto: {error}", exc_info=True)
             self.console.error(f"Erreur: {error}")
+        finally:
+            # Requête terminée: un plan encore en file n'est plus utile
+            if self._plan_future is not None:
+                self._plan_future.cancel()
+                self._plan_future = None
 
     # ═══════════════════════════════════════════════════════════════
     # MÉTHODES PRIVÉES - MODE AUTO
@@ -343,57 +388,145 @@ class ModeHandler:
         """
         Tente d'utiliser la planification en arrière-plan si disponible.
 
+        La requête est soumise au planificateur puis interrogée sans attente:
+        si le plan n'est pas prêt, la boucle itérative démarre et le réinterroge
+        au début de chaque étape (_poll_background_plan).
+
         Args:
             user_input: Demande utilisateur
 
         Returns:
             True si un plan a été exécuté avec succès, False sinon
         """
-        if not self.terminal.background_planner or not self.terminal.background_planner.is_running:
+        planner = self.terminal.background_planner
+        self._plan_future = None
+        if not planner or not planner.is_running:
             return False
 
         # Envoyer la requête pour analyse en arrière-plan
-        self.terminal.background_planner.analyze_request_async(user_input)
+        self._plan_future = planner.analyze_request_async(user_input)
         self.logger.debug("Requête envoyée au planificateur en arrière-plan")
 
-        # Vérifier si un plan est déjà disponible
-        import time
-        time.sleep(0.1)  # Petit délai pour laisser l'analyse démarrer
+        return self._poll_background_plan()
+
+    def _poll_background_plan(self) -> bool:
+        """
+        Exécute le plan d'arrière-plan de la requête en cours s'il est prêt (non bloquant).
+
+        Returns:
+            True si un plan a été exécuté avec succès, False sinon
+        """
+        future = self._plan_future
+        if future is None or not future.done():
+            return False
+
+        # Résultat consommé une seule fois
+        self._plan_future = None
+        try:
+            planning = future.result(timeout=0)
+        except Exception as error:
+            self.logger.warning(f"Planification en arrière-plan échouée: {error}")
+            return False
 
-        # Récupérer le dernier plan disponible
-        latest_plan = self.terminal.background_planner.get_latest_plan()
-        latest_analysis = self.terminal.background_planner.get_latest_analysis()
+        plan = planning.get('plan')
+        analysis = planning.get('analysis') or {}
 
         # Si un plan complexe est disponible et auto-exécution activée
-        if (latest_plan and latest_analysis and
-            latest_analysis.get('is_complex') and
-            getattr(self.settings, 'background_planning_auto_execute', True)):
+        if not (plan and analysis.get('is_complex') and
+                getattr(self.settings, 'background_planning_auto_execute', True)):
+            return False
 
-            self.console.print()
-            self.console.info("🎯 Plan détecté pour cette requête")
+        self.console.info("🎯 Plan détecté pour cette requête", blank_before=True)
 
-            # Exécuter le plan automatiquement
-            self.logger.info("Exécution automatique du plan en arrière-plan")
+        # Exécuter le plan automatiquement
+        self.logger.info("Exécution automatique du plan en arrière-plan")
 
-            exec_result = self.agent.execute_plan(latest_plan)
+        exec_result = self.agent.execute_plan(plan)
 
-            if exec_result.get('success'):
-                self.console.success("✓ Plan exécuté avec succès!")
+        if exec_result.get('success'):
+            self.console.success("✓ Plan exécuté avec succès!")
 
-                # Marquer comme exécuté dans le stockage
-                if self.terminal.plan_storage:
-                    request_id = latest_plan.get('_metadata', {}).get('request_id')
-                    if request_id:
-                        recent_plans = self.terminal.plan_storage.get_recent_plans(limit=1)
-                        if recent_plans:
-                            self.terminal.plan_storage.mark_executed(recent_plans[0]['id'], 'success')
+            # Marquer comme exécuté dans le stockage
+            if self.terminal.plan_storage:
+                request_id = plan.get('_metadata', {}).get('request_id')
+                if request_id:
+                    recent_plans = self.terminal.plan_storage.get_recent_plans(limit=1)
+                    if recent_plans:
+                        self.terminal.plan_storage.mark_executed(recent_plans[0]['id'], 'success')
 
-                return True
-            else:
-                self.console.warning("⚠️  Le plan a échoué, passage en mode itératif")
+            return True
 
+        self.console.warning("⚠️  Le plan a échoué, passage en mode itératif")
         return False
 
+    def _read_improvement(self, user_input: str, context_history: list) -> Tuple[str, Optional[dict]]:
+        """
+        Lit la précision de l'utilisateur tout en pré-générant l'étape suivante
+
+        La génération (sans la précision) démarre avant input(): si la
+        précision est vide ou de remplissage ("ok", "continue"...), son
+        résultat est gardé et le temps de saisie a masqué la latence du
+        modèle. Sinon elle est interrompue et l'étape sera régénérée.
+
+        Args:
+            user_input: Demande utilisateur (précisions déjà incluses)
+            context_history: Historique des étapes précédentes
+
+        Returns:
+            Tuple (précision significative ou "", réponse pré-générée ou None)
+        """
+        cancel_event = threading.Event()
+        self._spec_cancel = cancel_event
+        future = self._spec_executor.submit(
+            self._speculate_next_command, user_input, list(context_history), cancel_event
+        )
+
+        try:
+            improvement = input("\n💬 Que voulez-vous préciser/améliorer ? ").strip()
+
+            filler = improvement.lower().strip(" .!")
+            if not filler or (len(improvement) <= AUTO_IMPROVE_FILLER_MAX_LENGTH
+                              and filler in AUTO_IMPROVE_FILLER_WORDS):
+                try:
+                    response = future.result()
+                except Exception as e:
+                    self.logger.warning("Pré-génération échouée: %s", e)
+                    return "", None
+                return "", response if response and response.get('command') else None
+
+            cancel_event.set()
+            future.cancel()
+            return improvement, None
+        except BaseException:
+            # Ctrl+C pendant la saisie ou l'attente: la génération est interrompue
+            cancel_event.set()
+            raise
+        finally:
+            self._spec_cancel = None
+
+    def _speculate_next_command(self, user_input: str, context_history: list,
+                                cancel_event: threading.Event) -> Optional[dict]:
+        """
+        Génère l'étape suivante sans affichage (thread de pré-génération)
+
+        Args:
+            user_input: Demande utilisateur
+            context_history: Copie de l'historique des étapes
+            cancel_event: Interrompt la génération (et la requête HTTP) si levé
+
+        Returns:
+            Réponse IA parsée, ou None si interrompue
+        """
+        stream_gen = self.parser.parse_with_history(user_input, context_history)
+        try:
+            while not cancel_event.is_set():
+                next(stream_gen)
+            return None
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            stream_gen.close()
+
     def _generate_next_command(self, user_input: str, context_history: list) -> dict:
         """
         Génère la prochaine commande avec l'IA en fonction du contexte.
@@ -407,19 +540,60 @@ class ModeHandler:
         """
         if context_history:
             # Avec historique (étapes > 1)
-            self.logger.debug(f"Génération avec historique ({len(context_history)} étapes précédentes)")
-            return self.terminal._stream_ai_response_with_history(user_input, context_history)
+            self.logger.debug("Génération avec historique (%d étapes précédentes)", len(context_history))
+            return self._stream_history(user_input, context_history)
         else:
             # Première étape, pas d'historique
             self.logger.debug("Première génération (sans historique)")
             self.console.info("Analyse de votre demande...")
-            return self.terminal._stream_ai_response_with_tags(user_input)
+            return self._cached_ai_response(user_input, "default")
+
+    def _cached_ai_response(self, user_input: str, system_prompt_key: str) -> dict:
+        """
+        Réponse IA pour une demande, servie par les caches si possible
+        (template puis cache sémantique) avant tout appel au modèle.
+
+        Args:
+            user_input: Demande utilisateur
+            system_prompt_key: Prompt système du parser ("default" ou "fast"),
+                sert aussi de scope aux caches (réponses différentes par prompt)
+
+        Returns:
+            Réponse IA avec command, explanation, risk_level
+        """
+        templated = self._template_cache.lookup(user_input, system_prompt_key)
+        if templated:
+            self.logger.info("Commande issue du cache de templates: %s", templated)
+            self.console.info(f"Demande connue → {templated}")
+            return {
+                'command': templated,
+                'explanation': '',
+                'risk_level': self.parser.risk_assessor.assess_risk(templated).level.value
+            }
+
+        sem_cache = self._sem_cache
+        if sem_cache is None:
+            return self._stream_tags(user_input, system_prompt_key)
+
+        cwd = self.executor.get_current_directory()
+
+        cached = sem_cache.lookup(user_input, cwd, system_prompt_key)
+        if cached:
+            self.logger.info("Réponse servie par le cache sémantique: %s", cached.get('command'))
+            self.console.info(f"Demande similaire en cache → {cached.get('command')}")
+            return cached
+
+        # Mise en cache différée: seulement après une exécution validée et réussie
+        ai_response = self._stream_tags(user_input, system_prompt_key)
+        self._sem_pending = (user_input, ai_response, cwd, system_prompt_key)
+        return ai_response
 
     def _validate_and_execute_command(
         self,
         command: str,
         user_input: str,
-        risk_level: str
+        risk_level: str,
+        cache_scope: Optional[str] = None
     ) -> Optional[dict]:
         """
         Valide et exécute une commande générée par l'IA.
@@ -428,6 +602,8 @@ class ModeHandler:
             command: Commande à exécuter
             user_input: Demande utilisateur originale
             risk_level: Niveau de risque de la commande
+            cache_scope: Scope sous lequel mémoriser la commande après succès
+                (None: commande dépendante de l'historique, non mémorisée)
 
         Returns:
             Résultat d'exécution ou None si bloqué/annulé
@@ -436,46 +612,76 @@ class ModeHandler:
         is_valid, security_level, security_reason = self.security.validate_command(command)
 
         if not is_valid:
-            self.console.print()
-            self.console.error("Commande bloquée")
+            self.console.error("Commande bloquée", blank_before=True)
             self.console.print(f"   Raison: {security_reason}")
             self.logger.warning(f"Commande bloquée: {command} - {security_reason}")
             return None
 
         # Demander confirmation si nécessaire
         if security_level == 'high' or risk_level == 'high':
-            if not self.terminal._confirm_command(command, security_level, security_reason):
+            if not self._confirm(command, security_level, security_reason):
                 self.console.error("Commande annulée")
                 return None
 
         # Exécuter la commande
+        self.shell_engine.increment_command_count()
         self.console.info("Exécution...")
         self.console.print()
 
-        def stream_output(line: str) -> None:
-            self.console.print(f"[output]{line}[/output]")
-
         result = self.executor.execute_streaming(
             command,
-            output_callback=stream_output,
+            output_callback=self.console.print_output,
             strict_mode=False
         )
 
         # Enregistrer dans l'historique
-        self.result_handler.handle_result(
-            result,
-            command,
-            user_input,
-            "auto",
-            skip_output=True
-        )
+        self._finalize_step(result, command, user_input, "auto", security_level)
+
+        if cache_scope is not None:
+            self._remember_command(user_input, command, cache_scope, result, security_level, risk_level)
+
+        return result
+
+    def _remember_command(self, user_input: str, command: str, scope: str, result: dict,
+                          security_level: str, risk_level: str) -> None:
+        """
+        Mémorise la commande d'une demande après une exécution validée et réussie
+        (jamais une commande à risque élevé): template, et réponse IA en attente
+        dans le cache sémantique si elle a produit cette commande.
+
+        Args:
+            user_input: Demande utilisateur
+            command: Commande exécutée
+            scope: Prompt système ayant produit la commande ("default" ou "fast")
+            result: Résultat de l'exécution
+            security_level: Niveau de risque retourné par le validateur
+            risk_level: Niveau de risque estimé par le parser
+        """
+        pending, self._sem_pending = self._sem_pending, None
+        if not result['success'] or security_level == 'high' or risk_level == 'high':
+            return
+
+        self._template_cache.store(user_input, command, scope)
+        if pending is not None and pending[0] == user_input and pending[3] == scope \
+                and pending[1].get('command') == command:
+            self._sem_cache.store(*pending)
+
+    def _finalize_step(self, result: dict, command: str, user_input: str,
+                       mode: str, security_level: str) -> None:
+        """
+        Enregistre une commande IA exécutée (modes FAST et AUTO).
 
+        Args:
+            result: Résultat de l'exécution (sortie déjà streamée)
+            command: Commande exécutée
+            user_input: Demande utilisateur
+            mode: Mode shell ("fast" ou "auto")
+            security_level: Niveau de risque retourné par le validateur
+        """
+        self.result_handler.handle_result(result, command, user_input, mode, skip_output=True)
         self.security.record_command_execution(
             command=command,
             success=result['success'],
             risk_level=security_level
         )
-
         self.parser.add_to_history(user_input, command, result.get('output', ''))
-
-        return result
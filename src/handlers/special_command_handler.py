@@ -5,13 +5,45 @@ Extrait de terminal_interface.py pour réduire la complexité
 et appliquer le principe SRP (Single Responsibility Principle).
 """
 
-from typing import TYPE_CHECKING, Optional
+import sys
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Callable, List, Optional
 from config import prompts
+from src.utils.prefix_trie import PrefixTrie
 
 if TYPE_CHECKING:
     from src.terminal_interface import TerminalInterface
 
 
+def requires(attr: str, message: str):
+    """
+    Décorateur: n'exécute le handler que si le composant du terminal est actif
+
+    Usage:
+        @requires('agent', "Le mode agent n'est pas activé")
+        def _handle_rollback_command(self, command, parts_lower):
+            ...
+
+    Args:
+        attr: Attribut de TerminalInterface à vérifier (ex: 'agent')
+        message: Erreur affichée si le composant est absent
+
+    Returns:
+        Décorateur configuré
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not getattr(self.terminal, attr):
+                console = self.console
+                console.print()
+                console.error(message)
+                return None
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class SpecialCommandHandler:
     """
     Gère l'exécution des commandes spéciales du terminal.
@@ -23,6 +55,8 @@ class SpecialCommandHandler:
         terminal: Référence vers l'instance TerminalInterface parente
     """
 
+    __slots__ = ('terminal', 'console', 'logger', '_exact_commands', '_prefix_commands', '_dispatch')
+
     def __init__(self, terminal: 'TerminalInterface'):
         """
         Initialise le gestionnaire de commandes spéciales.
@@ -34,6 +68,83 @@ class SpecialCommandHandler:
         self.console = terminal.console
         self.logger = terminal.logger
 
+        # Table de dispatch: une recherche dans un dict au lieu d'une chaîne de if.
+        # Les commandes d'une seule ligne pointent directement sur la méthode
+        # cible (pas de frame d'un handler relais): le display_manager doit donc
+        # exister avant la création du handler.
+        display = terminal.display_manager
+        exact_commands = {
+            # Commandes de base
+            '/quit': terminal._quit,
+            '/exit': terminal._quit,
+            '/help': partial(self.console.print_help, prompts.HELP_TEXT),
+            '/clear': self._handle_clear_history,
+            # Commandes de mode
+            '/manual': self._handle_manual_mode,
+            '/auto': self._handle_auto_mode,
+            '/fast': self._handle_fast_mode,
+            '/status': display.show_shell_status,
+            # Commandes d'information
+            '/history': display.show_history,
+            '/models': display.list_models,
+            '/change': display.list_models,
+            '/info': display.show_system_info,
+            '/templates': display.list_templates,
+            '/hardware': display.show_hardware_info,
+            # Commandes agent
+            '/pause': self._handle_pause,
+            '/resume': self._handle_resume,
+            '/stop': self._handle_stop,
+        }
+        # Clés internées: '/quit' & co. ne sont pas des identifiants, le compilateur
+        # ne les interne pas (les sous-commandes 'stats', 'clear'... le sont déjà)
+        self._exact_commands = {sys.intern(name): handler for name, handler in exact_commands.items()}
+
+        # Commandes suivies d'arguments, par préfixe (un parcours de l'arbre
+        # au lieu d'un startswith par commande)
+        self._prefix_commands = PrefixTrie()
+        for prefix, handler in (
+            ('/agent', self._handle_agent_command),
+            ('/cache', self._handle_cache_command),
+            ('/rollback', self._handle_rollback_command),
+            ('/security', self._handle_security_command),
+            ('/corrections', self._handle_corrections_command),
+            ('/plan', self._handle_plan_command),
+        ):
+            self._prefix_commands.insert(prefix, handler)
+
+        self._dispatch = self._build_dispatch()
+
+    def _build_dispatch(self):
+        """
+        Construit la fonction de dispatch du chemin chaud.
+
+        Les tables sont capturées en arguments par défaut (variables locales
+        de la fonction): aucun accès self.* par commande.
+
+        Returns:
+            Fonction (cmd_lower, command) -> bool, True si la commande a été traitée
+        """
+        def dispatch(cmd_lower: str, command: str,
+                     exact_get=self._exact_commands.get,
+                     prefix_lookup=self._prefix_commands.longest_prefix) -> bool:
+            # Commandes exactes (/help, /auto, ...)
+            handler = exact_get(cmd_lower)
+            if handler is not None:
+                handler()
+                return True
+
+            # Commandes avec arguments (/agent <demande>, /cache clear, ...)
+            handler = prefix_lookup(cmd_lower)
+            if handler is not None:
+                # Découpage fait une seule fois, partagé avec le sous-handler
+                handler(command, cmd_lower.split())
+                return True
+
+            return False
+
+        return dispatch
+
     def handle_command(self, command: str) -> bool:
         """
         Traite une commande spéciale.
@@ -44,119 +155,28 @@ class SpecialCommandHandler:
         Returns:
             True si la commande a été traitée, False sinon
         """
-        cmd_lower = command.lower()
-
-        # Commandes de base
-        if cmd_lower in ['/quit', '/exit']:
-            self._handle_quit()
-            return True
-
-        if cmd_lower == '/help':
-            self._handle_help()
-            return True
-
-        if cmd_lower == '/clear':
-            self._handle_clear_history()
-            return True
-
-        # Commandes de mode
-        if cmd_lower == '/manual':
-            self._handle_manual_mode()
-            return True
-
-        if cmd_lower == '/auto':
-            self._handle_auto_mode()
-            return True
-
-        if cmd_lower == '/fast':
-            self._handle_fast_mode()
-            return True
-
-        if cmd_lower == '/status':
-            self._handle_status()
-            return True
-
-        # Commandes d'information
-        if cmd_lower == '/history':
-            self._handle_history()
-            return True
-
-        if cmd_lower in ['/models', '/change']:
-            self._handle_models()
-            return True
-
-        if cmd_lower == '/info':
-            self._handle_info()
-            return True
-
-        if cmd_lower == '/templates':
-            self._handle_templates()
-            return True
-
-        if cmd_lower == '/hardware':
-            self._handle_hardware()
-            return True
-
-        # Commandes agent
-        if cmd_lower.startswith('/agent'):
-            self._handle_agent_command(command)
-            return True
-
-        if cmd_lower == '/pause':
-            self._handle_pause()
-            return True
-
-        if cmd_lower == '/resume':
-            self._handle_resume()
-            return True
-
-        if cmd_lower == '/stop':
-            self._handle_stop()
-            return True
-
-        # Commandes cache
-        if cmd_lower.startswith('/cache'):
-            self._handle_cache_command(command)
-            return True
-
-        # Commandes rollback
-        if cmd_lower.startswith('/rollback'):
-            self._handle_rollback_command(command)
-            return True
-
-        # Commandes sécurité
-        if cmd_lower == '/security':
-            self._handle_security()
-            return True
-
-        # Commandes corrections
-        if cmd_lower.startswith('/corrections'):
-            self._handle_corrections_command(command)
-            return True
-
-        # Commandes plan
-        if cmd_lower.startswith('/plan'):
-            self._handle_plan_command(command)
-            return True
-
-        # Commande inconnue
-        self.console.print()
-        self.console.error(f"Commande inconnue: {command}")
-        self.console.print("[dim]Tapez /help pour voir les commandes disponibles[/dim]")
+        return self._dispatch(command.lower(), command) or self._handle_unknown(command)
+
+    def _handle_unknown(self, command: str) -> bool:
+        """
+        Signale une commande spéciale inconnue.
+
+        Args:
+            command: Commande saisie
+
+        Returns:
+            False (commande non traitée)
+        """
+        console = self.console
+        console.print()
+        console.error(f"Commande inconnue: {command}")
+        console.print("[dim]Tapez /help pour voir les commandes disponibles[/dim]")
         return False
 
     # ═══════════════════════════════════════════════════════════════
     # COMMANDES DE BASE
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_quit(self):
-        """Quitte l'application"""
-        self.terminal._quit()
-
-    def _handle_help(self):
-        """Affiche l'aide"""
-        self.console.print_help(prompts.HELP_TEXT)
-
     def _handle_clear_history(self):
         """Efface l'historique"""
         self.logger.info("Effacement de l'historique demandé")
@@ -202,45 +222,13 @@ class SpecialCommandHandler:
             self.console.print()
             self.console.info("Déjà en mode FAST")
 
-    def _handle_status(self):
-        """Affiche le statut du shell"""
-        self.terminal.display_manager.show_shell_status()
-
-    # ═══════════════════════════════════════════════════════════════
-    # COMMANDES D'INFORMATION
-    # ═══════════════════════════════════════════════════════════════
-
-    def _handle_history(self):
-        """Affiche l'historique"""
-        self.terminal.display_manager.show_history()
-
-    def _handle_models(self):
-        """Liste les modèles disponibles"""
-        self.terminal.display_manager.list_models()
-
-    def _handle_info(self):
-        """Affiche les informations système"""
-        self.terminal.display_manager.show_system_info()
-
-    def _handle_templates(self):
-        """Liste les templates disponibles"""
-        self.terminal.display_manager.list_templates()
-
-    def _handle_hardware(self):
-        """Affiche les informations hardware"""
-        self.terminal.display_manager.show_hardware_info()
-
     # ═══════════════════════════════════════════════════════════════
     # COMMANDES AGENT
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_agent_command(self, command: str):
-        """Gère les commandes /agent"""
-        if not self.terminal.agent:
-            self.console.print()
-            self.console.error("Mode agent autonome désactivé")
-            return
-
+    @requires('agent', "Mode agent autonome désactivé")
+    def _handle_agent_command(self, command: str, parts_lower: List[str]):
+        """Gère les commandes /agent (la demande garde sa casse: lue dans command)"""
         # Basculer en mode AGENT
         self.terminal.shell_engine.switch_to_agent()
 
@@ -287,182 +275,198 @@ class SpecialCommandHandler:
     # COMMANDES CACHE
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_cache_command(self, command: str):
+    def _handle_cache_command(self, command: str, parts_lower: List[str]):
         """Gère les commandes /cache"""
-        parts = command.split()
-        if len(parts) == 1:
+        console = self.console
+        display = self.terminal.display_manager
+
+        if len(parts_lower) == 1:
             # /cache seul = afficher stats
-            self.terminal.display_manager.show_cache_stats()
-        elif parts[1].lower() == 'stats':
-            self.terminal.display_manager.show_cache_stats()
-        elif parts[1].lower() == 'clear':
-            self.terminal.display_manager.clear_cache()
+            display.show_cache_stats()
+        elif parts_lower[1] == 'stats':
+            display.show_cache_stats()
+        elif parts_lower[1] == 'clear':
+            display.clear_cache()
         else:
-            self.console.print()
-            self.console.error("Commande cache inconnue")
-            self.console.print("[dim]Usage: /cache [stats|clear][/dim]")
+            console.print()
+            console.error("Commande cache inconnue")
+            console.print("[dim]Usage: /cache [stats|clear][/dim]")
 
     # ═══════════════════════════════════════════════════════════════
     # COMMANDES ROLLBACK
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_rollback_command(self, command: str):
+    @requires('agent', "Le mode agent n'est pas activé")
+    def _handle_rollback_command(self, command: str, parts_lower: List[str]):
         """Gère les commandes /rollback"""
-        if not self.terminal.agent:
-            self.console.print()
-            self.console.error("Le mode agent n'est pas activé")
-            return
+        console = self.console
+        display = self.terminal.display_manager
 
-        parts = command.split()
-        if len(parts) == 1:
+        if len(parts_lower) == 1:
             # /rollback seul = afficher snapshots disponibles
-            self.terminal.display_manager.show_snapshots()
-        elif parts[1].lower() == 'list':
-            self.terminal.display_manager.show_snapshots()
-        elif parts[1].lower() == 'restore':
-            # /rollback restore [snapshot_id]
-            snapshot_id = parts[2] if len(parts) > 2 else None
-            self.terminal.display_manager.restore_snapshot(snapshot_id)
-        elif parts[1].lower() == 'stats':
-            self.terminal.display_manager.show_rollback_stats()
+            display.show_snapshots()
+        elif parts_lower[1] == 'list':
+            display.show_snapshots()
+        elif parts_lower[1] == 'restore':
+            # /rollback restore [snapshot_id] (identifiant avec sa casse d'origine)
+            snapshot_id = command.split()[2] if len(parts_lower) > 2 else None
+            display.restore_snapshot(snapshot_id)
+        elif parts_lower[1] == 'stats':
+            display.show_rollback_stats()
         else:
-            self.console.print()
-            self.console.error("Commande rollback inconnue")
-            self.console.print("[dim]Usage: /rollback [list|restore|stats][/dim]")
+            console.print()
+            console.error("Commande rollback inconnue")
+            console.print("[dim]Usage: /rollback [list|restore|stats][/dim]")
 
     # ═══════════════════════════════════════════════════════════════
     # COMMANDES SÉCURITÉ & CORRECTIONS
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_security(self):
-        """Affiche le rapport de sécurité"""
-        self.terminal.display_manager.show_security_report()
+    def _handle_security_command(self, command: str, parts_lower: List[str]):
+        """Gère les commandes /security"""
+        console = self.console
+        security = self.terminal.security
+
+        if len(parts_lower) == 1:
+            # /security seul = rapport de sécurité
+            self.terminal.display_manager.show_security_report()
+        elif parts_lower[1] == 'reload':
+            # Règles modifiées: les validations mémorisées ne sont plus fiables
+            security.reload_rules()
+            console.print()
+            console.success(f"Règles de sécurité rechargées (version {security.ruleset_version})")
+        else:
+            console.print()
+            console.error("Commande security inconnue")
+            console.print("[dim]Usage: /security [reload][/dim]")
 
-    def _handle_corrections_command(self, command: str):
+    @requires('agent', "Le mode agent n'est pas activé")
+    def _handle_corrections_command(self, command: str, parts_lower: List[str]):
         """Gère les commandes /corrections"""
-        if not self.terminal.agent:
-            self.console.print()
-            self.console.error("Le mode agent n'est pas activé")
-            return
+        console = self.console
+        display = self.terminal.display_manager
 
-        parts = command.split()
-        if len(parts) == 1 or parts[1].lower() == 'stats':
-            self.terminal.display_manager.show_correction_stats()
-        elif parts[1].lower() == 'last':
-            self.terminal.display_manager.show_last_error()
+        if len(parts_lower) == 1 or parts_lower[1] == 'stats':
+            display.show_correction_stats()
+        elif parts_lower[1] == 'last':
+            display.show_last_error()
         else:
-            self.console.print()
-            self.console.error("Commande corrections inconnue")
-            self.console.print("[dim]Usage: /corrections [stats|last][/dim]")
+            console.print()
+            console.error("Commande corrections inconnue")
+            console.print("[dim]Usage: /corrections [stats|last][/dim]")
 
     # ═══════════════════════════════════════════════════════════════
     # COMMANDES PLAN
     # ═══════════════════════════════════════════════════════════════
 
-    def _handle_plan_command(self, command: str):
+    @requires('background_planner', "La planification en arrière-plan n'est pas activée")
+    def _handle_plan_command(self, command: str, parts_lower: List[str]):
         """Gère les commandes /plan"""
-        if not self.terminal.background_planner:
-            self.console.print()
-            self.console.error("La planification en arrière-plan n'est pas activée")
-            return
+        console = self.console
 
-        parts = command.split()
-        if len(parts) == 1:
+        if len(parts_lower) == 1:
             self._handle_plan_show()
-        elif parts[1].lower() == 'stats':
+        elif parts_lower[1] == 'stats':
             self._handle_plan_stats()
-        elif parts[1].lower() == 'list':
+        elif parts_lower[1] == 'list':
             self._handle_plan_list()
-        elif parts[1].lower() == 'clear':
+        elif parts_lower[1] == 'clear':
             self._handle_plan_clear()
         else:
-            self.console.print()
-            self.console.error("Commande plan inconnue")
-            self.console.print("[dim]Usage: /plan [stats|list|clear][/dim]")
+            console.print()
+            console.error("Commande plan inconnue")
+            console.print("[dim]Usage: /plan [stats|list|clear][/dim]")
 
     def _handle_plan_show(self):
         """Affiche le dernier plan disponible"""
+        console = self.console
+        plan_storage = self.terminal.plan_storage
+
         latest_plan_data = self.terminal.background_planner.get_plan_from_queue()
 
         if not latest_plan_data:
             # Vérifier dans le stockage
-            if self.terminal.plan_storage:
-                stored_plan = self.terminal.plan_storage.get_latest_plan(executed=False)
-                if stored_plan:
-                    latest_plan_data = {
-                        'plan': stored_plan['plan'],
-                        'analysis': stored_plan['analysis'],
-                        'request_id': stored_plan['request_id']
-                    }
+            if plan_storage:
+                # Le plan stocké a déjà les clés plan/analysis/request_id: pas de copie
+                latest_plan_data = plan_storage.get_latest_plan(executed=False)
 
         if latest_plan_data:
             self.terminal.display_manager.show_background_plan(latest_plan_data)
 
             # Proposer d'exécuter
-            self.console.print()
+            console.print()
             response = input("Exécuter ce plan ? (oui/non): ").strip().lower()
             if response in ['oui', 'o', 'yes', 'y']:
                 plan = latest_plan_data['plan']
                 exec_result = self.terminal.agent.execute_plan(plan)
 
                 if exec_result.get('success'):
-                    self.console.success("✓ Plan exécuté avec succès!")
+                    console.success("✓ Plan exécuté avec succès!")
 
                     # Marquer comme exécuté
-                    if self.terminal.plan_storage:
-                        recent_plans = self.terminal.plan_storage.get_recent_plans(limit=1, executed=False)
+                    if plan_storage:
+                        recent_plans = plan_storage.get_recent_plans(limit=1, executed=False)
                         if recent_plans:
-                            self.terminal.plan_storage.mark_executed(recent_plans[0]['id'], 'success')
+                            plan_storage.mark_executed(recent_plans[0]['id'], 'success')
                 else:
-                    self.console.error("❌ Échec de l'exécution du plan")
-                    if self.terminal.plan_storage:
-                        recent_plans = self.terminal.plan_storage.get_recent_plans(limit=1, executed=False)
+                    console.error("❌ Échec de l'exécution du plan")
+                    if plan_storage:
+                        recent_plans = plan_storage.get_recent_plans(limit=1, executed=False)
                         if recent_plans:
-                            self.terminal.plan_storage.mark_executed(recent_plans[0]['id'], 'failed')
+                            plan_storage.mark_executed(recent_plans[0]['id'], 'failed')
         else:
-            self.console.print()
-            self.console.warning("Aucun plan disponible")
+            console.print()
+            console.warning("Aucun plan disponible")
 
     def _handle_plan_stats(self):
         """Affiche les statistiques du planificateur"""
+        console = self.console
+        plan_storage = self.terminal.plan_storage
+
         stats = self.terminal.background_planner.get_stats()
         self.terminal.display_manager.show_plan_stats(stats)
 
         # Ajouter les stats du stockage
-        if self.terminal.plan_storage:
-            storage_stats = self.terminal.plan_storage.get_stats()
-            self.console.print()
-            self.console.print("[subtitle]Stockage des plans:[/subtitle]")
-            self.console.print(f"   [label]Total:[/label] {storage_stats['total_plans']}")
-            self.console.print(f"   [label]Exécutés:[/label] {storage_stats['executed']}")
-            self.console.print(f"   [label]En attente:[/label] {storage_stats['pending']}")
+        if plan_storage:
+            storage_stats = plan_storage.get_stats()
+            console.print()
+            console.print("[subtitle]Stockage des plans:[/subtitle]")
+            console.print(f"   [label]Total:[/label] {storage_stats['total_plans']}")
+            console.print(f"   [label]Exécutés:[/label] {storage_stats['executed']}")
+            console.print(f"   [label]En attente:[/label] {storage_stats['pending']}")
 
     def _handle_plan_list(self):
         """Liste les plans récents"""
-        if not self.terminal.plan_storage:
-            self.console.print()
-            self.console.error("Stockage des plans non disponible")
+        console = self.console
+        plan_storage = self.terminal.plan_storage
+
+        if not plan_storage:
+            console.print()
+            console.error("Stockage des plans non disponible")
             return
 
-        recent_plans = self.terminal.plan_storage.get_recent_plans(limit=10)
+        recent_plans = plan_storage.get_recent_plans(limit=10)
 
         if not recent_plans:
-            self.console.print()
-            self.console.warning("Aucun plan dans l'historique")
+            console.print()
+            console.warning("Aucun plan dans l'historique")
         else:
-            self.console.print()
-            self.console.print("[title]PLANS RÉCENTS[/title]")
-            self.console.print()
+            # Lignes accumulées puis rendues en un seul print (un rendu Rich au lieu de 5 par plan)
+            lines = ["", "[title]PLANS RÉCENTS[/title]", ""]
 
             for idx, plan_data in enumerate(recent_plans, 1):
-                status_icon = "✓" if plan_data['executed'] else "⏸"
-                status_text = "Exécuté" if plan_data['executed'] else "En attente"
-
-                self.console.print(f"[label]{idx}.[/label] {status_icon} {plan_data['user_request'][:60]}")
-                self.console.print(f"   [dim]Type:[/dim] {plan_data['analysis'].get('project_type', 'N/A')}")
-                self.console.print(f"   [dim]Date:[/dim] {plan_data['created_at']}")
-                self.console.print(f"   [dim]Statut:[/dim] {status_text}")
-                self.console.print()
+                executed = plan_data['executed']
+                status_icon = "✓" if executed else "⏸"
+                status_text = "Exécuté" if executed else "En attente"
+                snippet = plan_data['user_request'][:60]
+
+                lines.append(f"[label]{idx}.[/label] {status_icon} {snippet}")
+                lines.append(f"   [dim]Type:[/dim] {plan_data['analysis'].get('project_type', 'N/A')}")
+                lines.append(f"   [dim]Date:[/dim] {plan_data['created_at']}")
+                lines.append(f"   [dim]Statut:[/dim] {status_text}")
+                lines.append("")
+
+            console.print("\n".join(lines))
 
     def _handle_plan_clear(self):
         """Efface les résultats en attente"""
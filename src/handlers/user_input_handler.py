@@ -5,11 +5,47 @@ Extrait de terminal_interface.py pour centraliser la logique
 de validation et confirmation utilisateur.
 """
 
+import sys
 from typing import TYPE_CHECKING
+from config.constants import CONFIRMATION_KEYWORDS
 
 if TYPE_CHECKING:
     from src.terminal_interface import TerminalInterface
 
+# Réponses acceptées (tests d'appartenance par hash)
+_YES = frozenset(CONFIRMATION_KEYWORDS['YES'])
+_NO = frozenset(CONFIRMATION_KEYWORDS['NO'])
+
+
+def _read_answer(prompt: str) -> str:
+    """
+    Lit une ligne de réponse utilisateur.
+
+    En terminal interactif: input() (édition de ligne readline).
+    Sinon (scripts, CI, stdin redirigé): lecture directe de stdin,
+    sans passer par PyOS_Readline.
+
+    Args:
+        prompt: Texte affiché avant la saisie
+
+    Returns:
+        Ligne saisie, sans le saut de ligne final
+
+    Raises:
+        EOFError: Fin de l'entrée standard (comme input())
+    """
+    stdin = sys.stdin
+    if stdin.isatty():
+        return input(prompt)
+
+    stdout = sys.stdout
+    stdout.write(prompt)
+    stdout.flush()
+    line = stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
 
 class UserInputHandler:
     """
@@ -19,6 +55,8 @@ class UserInputHandler:
         terminal: Référence vers l'instance TerminalInterface parente
     """
 
+    __slots__ = ('terminal', 'console', 'logger', 'security')
+
     def __init__(self, terminal: 'TerminalInterface'):
         """
         Initialise le gestionnaire d'entrées utilisateur.
@@ -47,10 +85,10 @@ class UserInputHandler:
         print(message)
 
         while True:
-            response = input("\nVotre réponse (oui/non): ").strip().lower()
-            if response in ['oui', 'o', 'yes', 'y']:
+            response = _read_answer("\nVotre réponse (oui/non): ").strip().lower()
+            if response in _YES:
                 return True
-            elif response in ['non', 'n', 'no']:
+            elif response in _NO:
                 return False
             else:
                 print("Réponse invalide. Tapez 'oui' ou 'non'")
@@ -88,14 +126,14 @@ class UserInputHandler:
         prompt = f"\n{question} (oui/non, défaut: {default_text}): "
 
         while True:
-            response = input(prompt).strip().lower()
+            response = _read_answer(prompt).strip().lower()
 
             if not response:
                 return default
 
-            if response in ['oui', 'o', 'yes', 'y']:
+            if response in _YES:
                 return True
-            elif response in ['non', 'n', 'no']:
+            elif response in _NO:
                 return False
             else:
                 print("Réponse invalide. Tapez 'oui' ou 'non'")
@@ -11,9 +11,15 @@ from ..utils.rollback_manager import RollbackManager
 from ..utils.auto_corrector import AutoCorrector
 
 
+def _noop(*args, **kwargs) -> None:
+    """Méthode de log utilisée quand aucun logger n'est fourni"""
+
+
 class RollbackFacade:
     """Interface vers le gestionnaire de rollback"""
 
+    __slots__ = ('rollback_manager', 'logger', '_info', '_warning', '_error', '_debug')
+
     def __init__(self, rollback_manager: RollbackManager, logger=None):
         """
         Initialise la facade de rollback
@@ -24,6 +30,11 @@ class RollbackFacade:
         """
         self.rollback_manager = rollback_manager
         self.logger = logger
+        # Méthodes de log résolues une fois (pas de test 'if self.logger' par appel)
+        self._info = logger.info if logger else _noop
+        self._warning = logger.warning if logger else _noop
+        self._error = logger.error if logger else _noop
+        self._debug = logger.debug if logger else _noop
 
     def create_snapshot(self, project_path: str, plan: Dict) -> Dict:
         """
@@ -36,8 +47,7 @@ class RollbackFacade:
         Returns:
             Résultat de la création du snapshot
         """
-        if self.logger:
-            self.logger.info(f"Création snapshot pour: {project_path}")
+        self._info(f"Création snapshot pour: {project_path}")
 
         result = self.rollback_manager.create_snapshot(
             project_path=project_path,
@@ -45,11 +55,9 @@ class RollbackFacade:
         )
 
         if result['success']:
-            if self.logger:
-                self.logger.info(f"Snapshot créé: {result['snapshot_id']}")
+            self._info(f"Snapshot créé: {result['snapshot_id']}")
         else:
-            if self.logger:
-                self.logger.warning(f"Impossible de créer snapshot: {result.get('error')}")
+            self._warning(f"Impossible de créer snapshot: {result.get('error')}")
 
         return result
 
@@ -63,17 +71,14 @@ class RollbackFacade:
         Returns:
             Dict avec résultat du rollback
         """
-        if self.logger:
-            self.logger.info(f"Tentative de rollback: {snapshot_id or 'dernier snapshot'}")
+        self._info(f"Tentative de rollback: {snapshot_id or 'dernier snapshot'}")
 
         result = self.rollback_manager.rollback(snapshot_id)
 
         if result['success']:
-            if self.logger:
-                self.logger.info(f"Rollback réussi: {result['project_path']}")
+            self._info(f"Rollback réussi: {result['project_path']}")
         else:
-            if self.logger:
-                self.logger.error(f"Rollback échoué: {result.get('error')}")
+            self._error(f"Rollback échoué: {result.get('error')}")
 
         return result
 
@@ -99,6 +104,8 @@ class RollbackFacade:
 class CorrectionFacade:
     """Interface vers l'auto-correcteur"""
 
+    __slots__ = ('auto_corrector', 'logger', '_info', '_warning', '_error', '_debug')
+
     def __init__(self, auto_corrector: AutoCorrector, logger=None):
         """
         Initialise la facade de correction
@@ -109,6 +116,11 @@ class CorrectionFacade:
         """
         self.auto_corrector = auto_corrector
         self.logger = logger
+        # Méthodes de log résolues une fois (pas de test 'if self.logger' par appel)
+        self._info = logger.info if logger else _noop
+        self._warning = logger.warning if logger else _noop
+        self._error = logger.error if logger else _noop
+        self._debug = logger.debug if logger else _noop
 
     def analyze_error(self, command: str, error: str, exit_code: int = 1) -> Dict:
         """
@@ -122,8 +134,7 @@ class CorrectionFacade:
         Returns:
             Dict avec l'analyse
         """
-        if self.logger:
-            self.logger.debug(f"Analyse d'erreur pour: {command}")
+        self._debug(f"Analyse d'erreur pour: {command}")
 
         return self.auto_corrector.analyze_error(command, error, exit_code)
 
@@ -138,8 +149,7 @@ class CorrectionFacade:
         Returns:
             Dict avec l'analyse IA
         """
-        if self.logger:
-            self.logger.info(f"Analyse IA pour: {command}")
+        self._info(f"Analyse IA pour: {command}")
 
         return self.auto_corrector.analyze_with_ai(command, error)
 
@@ -8,6 +8,7 @@ Ce module gère:
 - Le timeout et les pauses
 """
 
+import threading
 import time
 from typing import Dict, Optional, Callable, List
 from datetime import datetime, timedelta
@@ -40,18 +41,58 @@ class AgentOrchestrator:
 
         # État de l'orchestrateur
         self.is_running = False
-        self.is_paused = False
+        # Levé = exécution autorisée, baissé = en pause (réveil immédiat à la reprise)
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self.current_plan = None
         self.current_step = 0
-        self.start_time = None
+        # start_time (datetime, affichage), son équivalent monotone (progression)
+        # et l'échéance monotone absolue du timeout, fixée au démarrage
+        self._start_time: Optional[datetime] = None
+        self._start_monotonic: Optional[float] = None
+        self._deadline: Optional[float] = None
         self.max_steps = constants.MAX_AGENT_STEPS
         self.max_duration = timedelta(minutes=constants.MAX_AGENT_DURATION_MINUTES)
+        self._max_duration_s = self.max_duration.total_seconds()
 
         # Callbacks pour l'interface
         self.on_step_start: Optional[Callable] = None
         self.on_step_complete: Optional[Callable] = None
         self.on_pause: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
+        # Variantes par groupe parallèle (un appel par groupe au lieu d'un par étape):
+        # on_group_start(step_numbers, steps), on_group_complete(step_numbers, steps, results).
+        # Si absentes, on_step_start/on_step_complete sont appelés pour chaque étape.
+        self.on_group_start: Optional[Callable] = None
+        self.on_group_complete: Optional[Callable] = None
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        """Début de la tâche en cours (None si aucune)"""
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]):
+        """Démarre (datetime) ou réinitialise (None) le chronomètre de la tâche"""
+        self._start_time = value
+        if value is None:
+            self._start_monotonic = self._deadline = None
+        else:
+            self._start_monotonic = time.monotonic()
+            self._deadline = self._start_monotonic + self._max_duration_s
+
+    @property
+    def is_paused(self) -> bool:
+        """True si l'exécution est en pause"""
+        return not self._resume_event.is_set()
+
+    @is_paused.setter
+    def is_paused(self, value: bool):
+        """Met en pause (True) ou reprend (False) l'exécution"""
+        if value:
+            self._resume_event.clear()
+        else:
+            self._resume_event.set()
 
     def execute_plan(self, plan: Dict, project_path: str, context: Dict) -> Dict:
         """
@@ -69,33 +110,49 @@ class AgentOrchestrator:
         self.is_running = True
         self.is_paused = False
         self.current_step = 0
+        # Le timeout couvre l'exécution du plan (pas l'analyse ni la confirmation)
+        self.start_time = datetime.now()
         results = []
 
+        # Références résolues une fois pour toute la boucle des étapes
+        # (callbacks fixés avant l'appel). Logs en formatage différé (%):
+        # rien n'est formaté si le niveau est filtré
+        log = self.logger
+        on_start = self.on_step_start
+        on_complete = self.on_step_complete
+        on_error = self.on_error
+        on_group_start = self.on_group_start
+        on_group_complete = self.on_group_complete
+        exec_step = self.step_executor.execute_step
+        serialize = self.step_executor.serialize_step_for_worker
+        step_costs = constants.PARALLEL_STEP_COST_MS
+
         try:
-            if self.logger:
-                self.logger.info(f"Démarrage exécution plan: {len(plan.get('steps', []))} étapes")
+            steps = plan['steps']
+            if log:
+                log.info("Démarrage exécution plan: %d étapes", len(steps))
 
             # Créer snapshot avant l'exécution (Phase 2: Sécurité)
             if self.rollback_facade:
                 snapshot_result = self.rollback_facade.create_snapshot(project_path, plan)
 
                 if snapshot_result['success']:
-                    if self.logger:
-                        self.logger.info(f"Snapshot créé: {snapshot_result['snapshot_id']}")
+                    if log:
+                        log.info("Snapshot créé: %s", snapshot_result['snapshot_id'])
                 else:
-                    if self.logger:
-                        self.logger.warning(f"Impossible de créer snapshot: {snapshot_result.get('error')}")
+                    if log:
+                        log.warning("Impossible de créer snapshot: %s", snapshot_result.get('error'))
 
             # Analyser la parallélisation possible (Phase 1: Performance)
-            parallel_groups = self.parallel_executor.can_parallelize(plan['steps'])
-            parallel_stats = self.parallel_executor.get_parallelization_stats(plan['steps'])
+            parallel_groups, parallel_stats = self.parallel_executor.analyze(steps)
 
-            if self.logger:
-                self.logger.info(f"Parallélisation: {parallel_stats['steps_parallelizable']} étapes sur {parallel_stats['total_steps']}")
-                self.logger.info(f"Gain estimé: {parallel_stats['estimated_time_saving_percent']}%")
+            if log:
+                log.info("Parallélisation: %d étapes sur %d",
+                         parallel_stats['steps_parallelizable'], parallel_stats['total_steps'])
+                log.info("Gain estimé: %s%%", parallel_stats['estimated_time_saving_percent'])
 
             # Exécuter par groupes parallélisables
-            for group_idx, group_indices in enumerate(parallel_groups):
+            for group_indices in parallel_groups:
                 # Vérifier timeout
                 if self._check_timeout():
                     return {
@@ -104,22 +161,18 @@ class AgentOrchestrator:
                         'results': results
                     }
 
-                # Vérifier pause
-                while self.is_paused:
-                    time.sleep(0.5)
+                # Vérifier pause: attente bloquante jusqu'à resume()/stop()
+                if self.is_paused:
                     if self.on_pause:
                         self.on_pause()
+                    self._resume_event.wait()
 
                 if not self.is_running:
-                    return {
-                        'success': False,
-                        'stopped': True,
-                        'message': 'Exécution arrêtée par l\'utilisateur',
-                        'results': results
-                    }
+                    return self._stopped_result(results)
 
-                # Récupérer les étapes de ce groupe
-                group_steps = [plan['steps'][i] for i in group_indices]
+                # Récupérer les étapes de ce groupe (une seule indexation dans steps;
+                # ensuite parcours parallèle de step_numbers / group_steps)
+                group_steps = [steps[i] for i in group_indices]
 
                 if len(group_steps) == 1:
                     # Une seule étape, exécution normale
@@ -127,84 +180,88 @@ class AgentOrchestrator:
                     i = group_indices[0] + 1
                     self.current_step = i
 
-                    if self.on_step_start:
-                        self.on_step_start(i, step)
-
-                    step_result = self.step_executor.execute_step(step, project_path, context)
+                    if on_start:
+                        on_start(i, step)
 
-                    results.append({
-                        'step': i,
-                        'action': step.get('action'),
-                        'result': step_result
-                    })
+                    step_result = exec_step(step, project_path, context)
+                    results.append(self._step_entry(i, step, step_result))
 
-                    if self.on_step_complete:
-                        self.on_step_complete(i, step, step_result)
+                    if on_complete:
+                        on_complete(i, step, step_result)
 
-                    if not step_result.get('success') and not step_result.get('can_continue'):
-                        if self.on_error:
-                            self.on_error(i, step, step_result)
-                        return {
-                            'success': False,
-                            'error': f'Erreur à l\'étape {i}',
-                            'step_error': step_result,
-                            'results': results
-                        }
+                    if self._is_blocking_failure(step_result):
+                        return self._step_error_result(i, step, step_result, results, on_error)
 
                 else:
                     # Plusieurs étapes, exécution parallèle!
-                    if self.logger:
-                        self.logger.info(f"⚡ Exécution parallèle de {len(group_steps)} étapes...")
+                    if log:
+                        log.info("⚡ Exécution parallèle de %d étapes...", len(group_steps))
 
                     # Notifier début pour toutes les étapes du groupe
-                    for idx in group_indices:
-                        i = idx + 1
-                        if self.on_step_start:
-                            self.on_step_start(i, plan['steps'][idx])
+                    step_numbers = [idx + 1 for idx in group_indices]
+                    if on_group_start:
+                        on_group_start(step_numbers, group_steps)
+                    elif on_start:
+                        for i, step in zip(step_numbers, group_steps):
+                            on_start(i, step)
 
                     # Sérialiser les étapes pour les workers multiprocessing
                     serialized_steps = [
-                        self.step_executor.serialize_step_for_worker(step, project_path, context)
+                        serialize(step, project_path, context)
                         for step in group_steps
                     ]
 
-                    # Exécuter en VRAI parallèle avec multiprocessing
-                    # Utiliser le worker standalone qui est picklable
+                    # Résultats traités dans l'ordre de complétion: on_step_complete
+                    # part dès qu'une étape finit, et le premier échec bloquant
+                    # abandonne les étapes du groupe pas encore démarrées
+                    step_complete = None if on_group_complete else on_complete
+                    group_failure = []
+
+                    def on_result(pos, result):
+                        i, step = step_numbers[pos], group_steps[pos]
+                        if step_complete:
+                            step_complete(i, step, result)
+                        if not group_failure and self._is_blocking_failure(result):
+                            group_failure.append((i, step, result))
+
+                    def stop_group():
+                        return bool(group_failure) or self._stop_requested()
+
+                    # Petits groupes d'étapes rapides: exécutés sur place par l'exécuteur
+                    estimated_ms = sum(
+                        step_costs.get(step.get('action'), constants.PARALLEL_DEFAULT_STEP_COST_MS)
+                        for step in group_steps
+                    )
                     group_results = self.parallel_executor.execute_parallel(
                         serialized_steps,
-                        parallel_workers.execute_step_worker
+                        parallel_workers.execute_step_worker,
+                        should_stop=stop_group,
+                        estimated_ms=estimated_ms,
+                        on_result=on_result
+                    )
+
+                    # Garder les étapes terminées, dans l'ordre du plan
+                    # (étapes abandonnées sur arrêt ou échec: absentes)
+                    results.extend(
+                        self._step_entry(i, step, result)
+                        for i, step, result in zip(step_numbers, group_steps, group_results)
+                        if not result.get('cancelled')
                     )
 
-                    # Traiter les résultats
-                    for idx, result in zip(group_indices, group_results):
-                        i = idx + 1
-                        step = plan['steps'][idx]
-
-                        results.append({
-                            'step': i,
-                            'action': step.get('action'),
-                            'result': result
-                        })
-
-                        if self.on_step_complete:
-                            self.on_step_complete(i, step, result)
-
-                        if not result.get('success') and not result.get('can_continue'):
-                            if self.on_error:
-                                self.on_error(i, step, result)
-                            return {
-                                'success': False,
-                                'error': f'Erreur à l\'étape {i}',
-                                'step_error': result,
-                                'results': results
-                            }
-
-                # Petite pause entre les groupes
-                time.sleep(0.5)
+                    if not self.is_running:
+                        # stop() pendant le groupe
+                        return self._stopped_result(results)
+
+                    if on_group_complete:
+                        on_group_complete(step_numbers, group_steps, group_results)
+
+                    if group_failure:
+                        i, step, result = group_failure[0]
+                        return self._step_error_result(i, step, result, results, on_error)
 
             # Succès!
-            if self.logger:
-                self.logger.info(f"Plan exécuté avec succès: {len(results)} étapes")
+            if log:
+                log.info("Plan exécuté avec succès: %d étapes", len(results))
 
             return {
                 'success': True,
@@ -214,8 +271,8 @@ class AgentOrchestrator:
             }
 
         except Exception as e:
-            if self.logger:
-                self.logger.error(f"Erreur exécution plan: {e}", exc_info=True)
+            if log:
+                log.error("Erreur exécution plan: %s", e, exc_info=True)
             return {
                 'success': False,
                 'error': str(e),
@@ -225,6 +282,90 @@ class AgentOrchestrator:
             self.is_running = False
             self.is_paused = False
 
+    @staticmethod
+    def _step_entry(step_number: int, step: Dict, result: Dict) -> Dict:
+        """
+        Construit l'entrée de résultat d'une étape exécutée
+
+        Args:
+            step_number: Numéro de l'étape (1-based)
+            step: Définition de l'étape
+            result: Résultat de l'étape
+
+        Returns:
+            Entrée pour la liste 'results' du plan
+        """
+        return {
+            'step': step_number,
+            'action': step.get('action'),
+            'result': result
+        }
+
+    @staticmethod
+    def _is_blocking_failure(result: Dict) -> bool:
+        """
+        Indique si le résultat d'une étape doit interrompre le plan
+
+        Args:
+            result: Résultat de l'étape
+
+        Returns:
+            True si l'étape a échoué sans possibilité de continuer
+        """
+        return not result.get('success') and not result.get('can_continue')
+
+    @staticmethod
+    def _step_error_result(step_number: int, step: Dict, result: Dict, results: List,
+                           on_error: Optional[Callable]) -> Dict:
+        """
+        Notifie l'échec bloquant d'une étape et construit le résultat du plan
+
+        Args:
+            step_number: Numéro de l'étape en échec (1-based)
+            step: Définition de l'étape
+            result: Résultat de l'étape
+            results: Résultats des étapes exécutées jusque-là
+            on_error: Callback d'erreur optionnel
+
+        Returns:
+            Dict de résultat d'exécution en échec
+        """
+        if on_error:
+            on_error(step_number, step, result)
+        return {
+            'success': False,
+            'error': f'Erreur à l\'étape {step_number}',
+            'step_error': result,
+            'results': results
+        }
+
+    @staticmethod
+    def _stopped_result(results: List) -> Dict:
+        """
+        Construit le résultat d'un plan arrêté par stop()
+
+        Args:
+            results: Résultats des étapes exécutées jusque-là
+
+        Returns:
+            Dict de résultat d'exécution arrêtée
+        """
+        return {
+            'success': False,
+            'stopped': True,
+            'message': 'Exécution arrêtée par l\'utilisateur',
+            'results': results
+        }
+
+    def _stop_requested(self) -> bool:
+        """
+        Indique si stop() a été appelé (consulté pendant un groupe parallèle)
+
+        Returns:
+            True si l'exécution doit s'arrêter
+        """
+        return not self.is_running
+
     def _check_timeout(self) -> bool:
         """
         Vérifie si le timeout est dépassé
@@ -232,11 +373,9 @@ class AgentOrchestrator:
         Returns:
             True si timeout dépassé
         """
-        if not self.start_time:
-            return False
-
-        elapsed = datetime.now() - self.start_time
-        return elapsed > self.max_duration
+        # Horloge monotone: insensible aux ajustements de l'heure système (NTP)
+        deadline = self._deadline
+        return deadline is not None and time.monotonic() > deadline
 
     def pause(self):
         """Met en pause l'exécution"""
@@ -278,5 +417,5 @@ class AgentOrchestrator:
             'current_step': self.current_step,
             'total_steps': total_steps,
             'progress_percent': progress_percent,
-            'elapsed_time': (datetime.now() - self.start_time).seconds if self.start_time else 0
+            'elapsed_time': int(time.monotonic() - self._start_monotonic) if self._start_monotonic is not None else 0
         }
@@ -7,6 +7,8 @@ Cette version est une façade qui délègue vers des modules spécialisés:
 - AgentFacades: Interfaces vers rollback et corrections
 """
 
+import queue
+import threading
 from typing import Dict, Optional, Callable
 
 from .project_planner import ProjectPlanner
@@ -19,6 +21,8 @@ from .agent_facades import RollbackFacade, CorrectionFacade
 from ..utils.parallel_executor import ParallelExecutor
 from ..utils.rollback_manager import RollbackManager
 from ..utils.auto_corrector import AutoCorrector
+from ..utils.plan_cache import PlanCache
+from config import constants
 
 
 class AutonomousAgent:
@@ -41,6 +45,18 @@ class AutonomousAgent:
 
         # Initialiser les modules de base
         self.planner = ProjectPlanner(ollama_client, logger)
+        # Plans déjà générés, réutilisés pour les demandes similaires (sans appel IA)
+        self.plan_cache = PlanCache()
+        # Revalidation des plans populaires en arrière-plan: la demande est servie
+        # depuis le cache, le modèle n'est appelé que par le thread de mise à jour
+        self._cache_update_queue = queue.Queue(maxsize=constants.PLAN_CACHE_REFRESH_QUEUE_SIZE)
+        self._cache_updater_running = True
+        self._cache_updater = threading.Thread(
+            target=self._cache_updater_loop,
+            name="PlanCacheUpdater",
+            daemon=True
+        )
+        self._cache_updater.start()
         code_editor = CodeEditor(ollama_client, logger)
         git_manager = GitManager(ollama_client, logger)
 
@@ -67,6 +83,10 @@ class AutonomousAgent:
             logger=logger
         )
 
+        # Pool de workers persistant, partagé par tous les groupes de tous les plans
+        # (libéré par close())
+        self.parallel_executor = parallel_executor
+
         # Créer l'orchestrateur
         self.orchestrator = AgentOrchestrator(
             step_executor=self.step_executor,
@@ -149,6 +169,26 @@ class AutonomousAgent:
         """Définit le callback d'erreur"""
         self.orchestrator.on_error = callback
 
+    @property
+    def on_group_start(self) -> Optional[Callable]:
+        """Callback appelé une fois au début de chaque groupe parallèle"""
+        return self.orchestrator.on_group_start
+
+    @on_group_start.setter
+    def on_group_start(self, callback: Optional[Callable]):
+        """Définit le callback de début de groupe"""
+        self.orchestrator.on_group_start = callback
+
+    @property
+    def on_group_complete(self) -> Optional[Callable]:
+        """Callback appelé une fois à la fin de chaque groupe parallèle"""
+        return self.orchestrator.on_group_complete
+
+    @on_group_complete.setter
+    def on_group_complete(self, callback: Optional[Callable]):
+        """Définit le callback de fin de groupe"""
+        self.orchestrator.on_group_complete = callback
+
     @property
     def on_pause(self) -> Optional[Callable]:
         """Callback appelé lors d'une pause"""
@@ -178,6 +218,22 @@ class AutonomousAgent:
             if self.logger:
                 self.logger.info(f"Démarrage tâche autonome: {user_request}")
 
+            cached = self.plan_cache.lookup(user_request)
+            if cached:
+                analysis, plan = cached
+                if self.logger:
+                    self.logger.info("Plan trouvé dans le cache, analyse et planification IA évitées")
+                try:
+                    self._cache_update_queue.put_nowait((user_request, analysis))
+                except queue.Full:
+                    pass
+                return {
+                    'success': True,
+                    'plan': plan,
+                    'analysis': analysis,
+                    'cached': True
+                }
+
             # Phase 1: Analyse de la demande
             if callback:
                 callback("analyse", "Analyse de votre demande...")
@@ -197,7 +253,9 @@ class AutonomousAgent:
             if callback:
                 callback("planning", "Génération du plan d'action...")
 
-            plan = self.planner.generate_plan(user_request, analysis)
+            plan = self.planner.generate_project_plan(
+                user_request, analysis.get('project_type', 'simple_command')
+            )
 
             if not plan or not plan.get('steps'):
                 return {
@@ -206,6 +264,10 @@ class AutonomousAgent:
                     'plan': None
                 }
 
+            # Plan de secours (échec IA): pas mis en cache, la prochaine demande réessaie
+            if not plan.get('is_fallback'):
+                self.plan_cache.store(user_request, analysis, plan)
+
             return {
                 'success': True,
                 'plan': plan,
@@ -247,6 +309,26 @@ class AutonomousAgent:
         """Arrête l'exécution (délégué à l'orchestrateur)"""
         self.orchestrator.stop()
 
+    def close(self):
+        """
+        Arrête l'exécution en cours, le thread de mise à jour du cache de plans
+        et libère le pool de workers parallèles
+        """
+        self.orchestrator.stop()
+        self._cache_updater_running = False
+        if self._cache_updater.is_alive():
+            self._cache_updater.join(timeout=2.0)
+        self.parallel_executor.shutdown()
+
+    def __enter__(self):
+        """Support du context manager"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Libère le pool de workers à la sortie du context manager"""
+        self.close()
+        return False
+
     def get_progress(self) -> Dict:
         """
         Retourne la progression actuelle (délégué à l'orchestrateur)
@@ -256,6 +338,38 @@ class AutonomousAgent:
         """
         return self.orchestrator.get_progress()
 
+    def _cache_updater_loop(self):
+        """
+        Boucle du thread de mise à jour du cache de plans.
+        Régénère les plans servis au moins PLAN_CACHE_REFRESH_HITS fois depuis
+        leur dernier calcul et remplace l'entrée si le nouveau plan diffère.
+        """
+        while self._cache_updater_running:
+            # Timeout pour permettre la vérification de _cache_updater_running
+            try:
+                user_request, analysis = self._cache_update_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            try:
+                if self.plan_cache.hits(user_request) < constants.PLAN_CACHE_REFRESH_HITS:
+                    continue
+
+                plan = self.planner.generate_project_plan(
+                    user_request, analysis.get('project_type', 'simple_command')
+                )
+                if plan.get('is_fallback') or not plan.get('steps'):
+                    # Régénération en échec: l'entrée actuelle reste servie
+                    continue
+
+                replaced = self.plan_cache.refresh(user_request, analysis, plan)
+                if self.logger:
+                    self.logger.info(f"Plan en cache revalidé ({'remplacé' if replaced else 'inchangé'})")
+
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Erreur mise à jour du cache de plans: {e}")
+
     # ========== Méthodes de facade vers RollbackManager ==========
 
     def rollback_last_execution(self, snapshot_id: Optional[str] = None) -> Dict:
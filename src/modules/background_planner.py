@@ -3,6 +3,7 @@
 import threading
 import queue
 import time
+from concurrent.futures import Future
 from typing import Optional, Callable, Dict
 from datetime import datetime
 
@@ -98,6 +99,7 @@ class BackgroundPlanner:
         Traite les requêtes de la queue et génère des plans.
         """
         while self.is_running:
+            future = None
             try:
                 # Récupérer une requête (timeout pour permettre vérif is_running)
                 try:
@@ -107,6 +109,11 @@ class BackgroundPlanner:
 
                 user_request = request_data['request']
                 request_id = request_data.get('id', 'unknown')
+                future = request_data.get('future')
+                if future is not None and not future.set_running_or_notify_cancel():
+                    # Requête abandonnée par l'appelant avant son traitement
+                    self.request_queue.task_done()
+                    continue
 
                 if self.logger:
                     self.logger.debug(f"[BG] Traitement requête: {user_request[:50]}...")
@@ -192,6 +199,15 @@ class BackgroundPlanner:
                         self.stats['total_requests']
                     )
 
+                # Résultat de CETTE requête (latest_plan peut venir d'une autre)
+                if future is not None:
+                    future.set_result({
+                        'plan': plan,
+                        'analysis': analysis,
+                        'request_id': request_id
+                    })
+                    future = None
+
                 # Callback planification complète
                 if self.on_planning_complete:
                     try:
@@ -208,6 +224,9 @@ class BackgroundPlanner:
                 if self.logger:
                     self.logger.error(f"[BG] Erreur dans planning_loop: {e}")
 
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
                 # Callback erreur
                 if self.on_error:
                     try:
@@ -215,7 +234,7 @@ class BackgroundPlanner:
                     except:
                         pass
 
-    def analyze_request_async(self, user_request: str, request_id: str = None) -> bool:
+    def analyze_request_async(self, user_request: str, request_id: str = None) -> Optional[Future]:
         """
         Ajoute une requête à la queue pour analyse en arrière-plan
 
@@ -224,18 +243,21 @@ class BackgroundPlanner:
             request_id: ID optionnel pour tracer la requête
 
         Returns:
-            True si ajouté à la queue, False si queue pleine
+            Future résolue avec {'plan', 'analysis', 'request_id'} une fois la
+            requête traitée (plan None si requête simple), None si non ajoutée
         """
         if not self.is_running:
             if self.logger:
                 self.logger.warning("BackgroundPlanner non démarré, impossible d'ajouter requête")
-            return False
+            return None
 
         try:
+            future = Future()
             request_data = {
                 'request': user_request,
                 'id': request_id or f"req_{int(time.time() * 1000)}",
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now().isoformat(),
+                'future': future
             }
 
             self.request_queue.put_nowait(request_data)
@@ -243,12 +265,12 @@ class BackgroundPlanner:
             if self.logger:
                 self.logger.debug(f"[BG] Requête ajoutée à la queue: {user_request[:50]}...")
 
-            return True
+            return future
 
         except queue.Full:
             if self.logger:
                 self.logger.warning("[BG] Queue de requêtes pleine, requête ignorée")
-            return False
+            return None
 
     def get_latest_plan(self) -> Optional[Dict]:
         """
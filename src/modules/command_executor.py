@@ -8,7 +8,7 @@ from typing import Dict, Optional, Tuple, Any, Callable
 from src.utils.command_helpers import create_success_result, create_error_result, SafeLogger
 from src.security import RiskAssessor
 from src.core.pty_shell import PersistentShell
-from config.constants import MAX_OUTPUT_SIZE_BYTES, OUTPUT_BUFFER_SIZE
+from config.constants import MAX_OUTPUT_SIZE_BYTES, OUTPUT_BUFFER_SIZE, OUTPUT_CALLBACK_BATCH_LINES
 
 class CommandExecutor:
     """Exécute des commandes shell de manière sécurisée"""
@@ -34,18 +34,9 @@ class CommandExecutor:
         self.max_output_size = max_output_size or self.MAX_OUTPUT_SIZE_BYTES
         self.use_pty = use_pty
 
-        # Shell PTY persistant (optionnel)
+        # Shell PTY persistant (optionnel) - démarré à la première commande PTY
+        # pour garder le spawn bash hors du chemin critique de démarrage
         self.pty_shell: Optional[PersistentShell] = None
-        if use_pty:
-            try:
-                self.pty_shell = PersistentShell()
-                if self.logger:
-                    self.logger.info(f"Shell PTY activé (PID: {self.pty_shell.shell.pid})")
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"Erreur lors de l'initialisation du PTY: {e}")
-                self.pty_shell = None
-                self.use_pty = False
 
         if self.logger:
             self.logger.debug(f"Buffer limit: max_output={self.max_output_size / 1024:.0f}KB, PTY: {self.use_pty}")
@@ -151,6 +142,25 @@ class CommandExecutor:
             self.logger.error(error_msg, exc_info=True)
             return create_error_result(error_msg)
 
+    def _get_pty_shell(self) -> Optional[PersistentShell]:
+        """
+        Retourne le shell PTY persistant, démarré au premier appel
+
+        Returns:
+            PersistentShell ou None si le PTY est désactivé / indisponible
+        """
+        if self.pty_shell is None and self.use_pty:
+            try:
+                self.pty_shell = PersistentShell()
+                if self.logger:
+                    self.logger.info(f"Shell PTY activé (PID: {self.pty_shell.shell.pid})")
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Erreur lors de l'initialisation du PTY: {e}")
+                self.pty_shell = None
+                self.use_pty = False
+        return self.pty_shell
+
     def execute_pty(self, command: str, output_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """
         Exécute une commande dans le shell PTY persistant
@@ -168,7 +178,8 @@ class CommandExecutor:
         Returns:
             Dict avec 'success', 'output', 'error', 'return_code'
         """
-        if not self.pty_shell or not self.pty_shell.is_alive():
+        pty_shell = self._get_pty_shell()
+        if not pty_shell or not pty_shell.is_alive():
             self.logger.warning("PTY shell non disponible, fallback sur subprocess")
             return self.execute(command, strict_mode=False)
 
@@ -178,11 +189,13 @@ class CommandExecutor:
             # Exécuter dans le shell PTY persistant
             result = self.pty_shell.execute(command)
 
-            # Appeler le callback avec l'output si fourni
+            # Appeler le callback avec l'output si fourni: la sortie PTY est déjà
+            # complète, on la transmet par blocs de lignes (un appel d'affichage
+            # par bloc au lieu d'un par ligne)
             if output_callback and result.get('output'):
-                for line in result['output'].split('\n'):
-                    if line.strip():
-                        output_callback(line)
+                lines = [line for line in result['output'].split('\n') if line.strip()]
+                for start in range(0, len(lines), OUTPUT_CALLBACK_BATCH_LINES):
+                    output_callback('\n'.join(lines[start:start + OUTPUT_CALLBACK_BATCH_LINES]))
 
             # Mettre à jour le current_directory depuis le PTY
             self.current_directory = self.pty_shell.get_current_directory()
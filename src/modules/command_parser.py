@@ -1,12 +1,43 @@
 """Parser pour convertir les demandes en langage naturel en commandes shell"""
 
 import re
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, NamedTuple
 
 from src.utils.command_helpers import SafeLogger
 from src.utils.tag_parser import TagParser
 from src.security import RiskAssessor
-from config.prompts import SYSTEM_PROMPT_MAIN
+from config.prompts import SYSTEM_PROMPT_MAIN, SYSTEM_PROMPT_FAST
+from config.constants import (
+    AUTO_HISTORY_MAX_TOKENS,
+    AUTO_HISTORY_FULL_STEPS
+)
+
+# Prompts système par clé: chaînes constantes, envoyées à l'identique à chaque
+# appel (seul le prompt système est garanti identique d'un appel à l'autre)
+SYSTEM_PROMPTS = {
+    'default': SYSTEM_PROMPT_MAIN,
+    'fast': SYSTEM_PROMPT_FAST
+}
+
+# Consignes finales du prompt itératif (bloc statique, identique à chaque étape)
+HISTORY_PROMPT_FOOTER = """Basé sur l'historique ci-dessus, génère la PROCHAINE commande logique pour continuer la tâche.
+Si la tâche est complétée, indique "✓ Tâche terminée" dans la description.
+Si tu ne peux pas continuer, indique "✗ Impossible de continuer" dans la description."""
+
+class HistoryStep(NamedTuple):
+    """
+    Étape exécutée du mode AUTO itératif (entrée de context_history)
+
+    Attributes:
+        command: Commande exécutée
+        output: Sortie de la commande (vide une fois l'étape compactée)
+        success: True si la commande a réussi
+        compacted: True si l'étape n'est plus rendue que sur une ligne
+    """
+    command: str
+    output: str
+    success: bool
+    compacted: bool = False
 
 class CommandParser:
     """Parse les demandes utilisateur et génère des commandes shell appropriées"""
@@ -61,12 +92,13 @@ Analyse cette demande et génère la commande appropriée."""
                 'parsed_sections': {}
             }
 
-    def parse_user_request_stream(self, user_input: str):
+    def parse_user_request_stream(self, user_input: str, system_prompt_key: str = 'default'):
         """
         Parse la demande utilisateur en mode streaming
 
         Args:
             user_input: La demande de l'utilisateur en langage naturel
+            system_prompt_key: Prompt système à utiliser ('default' ou 'fast')
 
         Yields:
             Tokens de la réponse IA
@@ -81,15 +113,15 @@ Analyse cette demande et génère la commande appropriée."""
             return self._handle_special_command(user_input)
 
         # Utiliser l'IA pour parser la demande
-        system_prompt = self._get_parsing_system_prompt()
+        system_prompt = self._get_parsing_system_prompt(system_prompt_key)
 
         prompt = f"""Demande utilisateur: "{user_input}"
 
 Analyse cette demande et génère la commande appropriée."""
 
         try:
-            # Mode streaming: yield depuis le générateur au lieu de le retourner
-            yield from self._stream_parse(prompt, system_prompt, user_input)
+            # Mode streaming: yield des tokens, puis retour du dict parsé par _stream_parse
+            return (yield from self._stream_parse(prompt, system_prompt, user_input))
 
         except Exception as e:
             self.logger.error(f"Erreur lors du streaming: {e}")
@@ -101,14 +133,14 @@ Analyse cette demande et génère la commande appropriée."""
                 'parsed_sections': {}
             }
 
-    def parse_with_history(self, user_input: str, context_history: List[Dict]):
+    def parse_with_history(self, user_input: str, context_history: List[HistoryStep]):
         """
         Parse la demande utilisateur en mode streaming AVEC historique (mode itératif)
 
         Args:
             user_input: La demande de l'utilisateur en langage naturel
             context_history: Historique des commandes et résultats précédents
-                Format: [{'command': str, 'output': str, 'success': bool}, ...]
+                Format: [HistoryStep(command, output, success), ...]
 
         Yields:
             Tokens de la réponse IA
@@ -126,23 +158,14 @@ Analyse cette demande et génère la commande appropriée."""
         # Utiliser l'IA pour parser la demande avec contexte
         system_prompt = self._get_parsing_system_prompt()
 
-        # Formater le contexte de l'historique
-        context_text = self._format_history_context(context_history)
-        self.logger.debug(f"Contexte formaté: {len(context_text)} caractères")
-
         # Construire le prompt avec le contexte
-        prompt = f"""Demande utilisateur initiale: "{user_input}"
-
-{context_text}
-
-Basé sur l'historique ci-dessus, génère la PROCHAINE commande logique pour continuer la tâche.
-Si la tâche est complétée, indique "✓ Tâche terminée" dans la description.
-Si tu ne peux pas continuer, indique "✗ Impossible de continuer" dans la description."""
+        prompt = self._build_history_prompt(user_input, context_history)
+        self.logger.debug(f"Prompt itératif: {len(prompt)} caractères")
 
         try:
             # Mode streaming avec contexte
             self.logger.debug("Lancement du streaming avec contexte historique")
-            yield from self._stream_parse(prompt, system_prompt, user_input)
+            return (yield from self._stream_parse(prompt, system_prompt, user_input))
 
         except Exception as e:
             self.logger.error(f"Erreur lors du streaming avec historique: {e}")
@@ -154,7 +177,59 @@ Si tu ne peux pas continuer, indique "✗ Impossible de continuer" dans la descr
                 'parsed_sections': {}
             }
 
-    def _format_history_context(self, context_history: List[Dict]) -> str:
+    def _build_history_prompt(self, user_input: str, context_history: List[HistoryStep]) -> str:
+        """
+        Construit le prompt d'une étape du mode itératif
+
+        Le prompt est entièrement reconstruit à chaque étape: compact_history
+        résume les étapes anciennes (leur rendu change) et une précision
+        "améliorer" modifie la demande initiale. Aucun préfixe stable au-delà
+        du prompt système n'est donc garanti.
+
+        Args:
+            user_input: Demande utilisateur initiale
+            context_history: Liste des étapes précédentes
+
+        Returns:
+            Prompt complet
+        """
+        context_text = self._format_history_context(context_history)
+        return f'Demande utilisateur initiale: "{user_input}"\n\n{context_text}\n\n{HISTORY_PROMPT_FOOTER}'
+
+    def compact_history(self, context_history: List[HistoryStep],
+                        max_tokens: int = AUTO_HISTORY_MAX_TOKENS) -> List[HistoryStep]:
+        """
+        Compacte l'historique du mode itératif (en place)
+
+        - les étapes antérieures aux AUTO_HISTORY_FULL_STEPS dernières sont
+          résumées sur une ligne (statut + commande) et leur sortie est libérée
+        - si l'historique formaté (_format_history_context, tel qu'envoyé au
+          modèle) dépasse encore le budget, les étapes récentes sont résumées
+          à leur tour (la dernière reste détaillée)
+
+        La taille du prompt reste ainsi bornée au lieu de croître à chaque étape.
+
+        Args:
+            context_history: Historique des étapes (modifié en place)
+            max_tokens: Budget de tokens estimé (~4 caractères par token)
+
+        Returns:
+            L'historique compacté (même liste)
+        """
+        full_steps = AUTO_HISTORY_FULL_STEPS
+        while True:
+            for index in range(max(len(context_history) - full_steps, 0)):
+                if not context_history[index].compacted:
+                    context_history[index] = context_history[index]._replace(output='', compacted=True)
+            if full_steps <= 1:
+                break
+            if len(self._format_history_context(context_history)) // 4 <= max_tokens:
+                break
+            full_steps -= 1
+
+        return context_history
+
+    def _format_history_context(self, context_history: List[HistoryStep]) -> str:
         """
         Formate l'historique des commandes pour le prompt IA
 
@@ -170,15 +245,17 @@ Si tu ne peux pas continuer, indique "✗ Impossible de continuer" dans la descr
         self.logger.debug(f"Formatage de {len(context_history)} étapes d'historique")
 
         lines = ["Historique des étapes précédentes:"]
-        for i, step in enumerate(context_history, 1):
-            command = step.get('command', 'N/A')
-            output = step.get('output', '')
-            success = step.get('success', False)
+        for i, (command, output, success, compacted) in enumerate(context_history, 1):
 
             # Limiter la taille de l'output pour ne pas surcharger le prompt
             output_preview = output[:300] + "..." if len(output) > 300 else output
 
             status = "✓ Succès" if success else "✗ Échec"
+            if compacted:
+                # Étape ancienne résumée sur une ligne
+                lines.append(f"\nÉtape {i}: {status} - {command}")
+                continue
+
             lines.append(f"\nÉtape {i}: {status}")
             lines.append(f"Commande: {command}")
             if output_preview:
@@ -230,9 +307,17 @@ Si tu ne peux pas continuer, indique "✗ Impossible de continuer" dans la descr
                 'parsed_sections': {}
             }
 
-    def _get_parsing_system_prompt(self) -> str:
-        """Retourne le prompt système pour le parsing"""
-        return SYSTEM_PROMPT_MAIN
+    def _get_parsing_system_prompt(self, key: str = 'default') -> str:
+        """
+        Retourne le prompt système pour le parsing
+
+        Args:
+            key: Clé du prompt ('default' ou 'fast')
+
+        Returns:
+            Prompt système (chaîne constante, identique octet pour octet entre appels)
+        """
+        return SYSTEM_PROMPTS.get(key, SYSTEM_PROMPT_MAIN)
 
     def _process_ai_response(self, response: str, original_request: str) -> Dict[str, any]:
         """
@@ -2,7 +2,7 @@
 
 import requests
 import json
-from typing import Dict, Optional, Generator
+from typing import Dict, List, Optional, Generator
 
 class OllamaClient:
     """Client pour l'API Ollama"""
@@ -13,7 +13,7 @@ class OllamaClient:
     MAX_STREAM_CHUNK_SIZE = 8192  # 8KB par chunk en streaming
 
     def __init__(self, host: str, model: str, timeout: int = 120, logger=None, cache_manager=None,
-                 max_history: Optional[int] = None):
+                 max_history: Optional[int] = None, embed_model: Optional[str] = None):
         """
         Initialise le client Ollama
 
@@ -24,9 +24,11 @@ class OllamaClient:
             logger: Logger pour les messages
             cache_manager: Gestionnaire de cache optionnel (CacheManager)
             max_history: Taille max de l'historique (None = utiliser MAX_CONVERSATION_HISTORY)
+            embed_model: Modèle d'embeddings (None = embeddings indisponibles)
         """
         self.host = host.rstrip('/')
         self.model = model
+        self.embed_model = embed_model
         self.timeout = timeout
         self.logger = logger
         self.cache_manager = cache_manager
@@ -112,32 +114,65 @@ class OllamaClient:
                 self.logger.error(error_msg)
             return f"Erreur: {error_msg}"
 
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Calcule l'embedding d'un texte via l'API Ollama (modèle d'embeddings dédié)
+
+        Args:
+            text: Texte à encoder
+
+        Returns:
+            Vecteur d'embedding, ou None si indisponible (pas de modèle d'embeddings
+            configuré, erreur)
+        """
+        if not self.embed_model:
+            return None
+
+        try:
+            response = requests.post(
+                f"{self.host}/api/embeddings",
+                json={"model": self.embed_model, "prompt": text},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json().get('embedding') or None
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if self.logger:
+                self.logger.debug(f"Embedding indisponible: {e}")
+            return None
+
     def _handle_stream(self, response) -> Generator[str, None, None]:
         """Gère le streaming de la réponse avec limite de buffer (CSAPP Ch.10)"""
         total_bytes = 0
 
-        for line in response.iter_lines(chunk_size=self.MAX_STREAM_CHUNK_SIZE):
-            if line:
-                try:
-                    data = json.loads(line)
-                    if 'response' in data:
-                        chunk = data['response']
-                        chunk_size = len(chunk.encode('utf-8'))
-
-                        # Vérifier la limite totale
-                        if total_bytes + chunk_size > self.MAX_RESPONSE_SIZE_BYTES:
-                            remaining = self.MAX_RESPONSE_SIZE_BYTES - total_bytes
-                            if remaining > 0:
-                                yield chunk[:remaining]
-                            if self.logger:
-                                self.logger.warning(f"Stream tronqué à {self.MAX_RESPONSE_SIZE_BYTES / 1024:.0f}KB")
-                            yield "\n\n[... Stream tronqué pour limiter l'utilisation mémoire ...]"
-                            break
-
-                        total_bytes += chunk_size
-                        yield chunk
-                except json.JSONDecodeError:
-                    continue
+        # try/finally: fermer le générateur (close()) libère la connexion HTTP
+        # et interrompt la génération côté serveur
+        try:
+            for line in response.iter_lines(chunk_size=self.MAX_STREAM_CHUNK_SIZE):
+                if line:
+                    try:
+                        data = json.loads(line)
+                        if 'response' in data:
+                            chunk = data['response']
+                            chunk_size = len(chunk.encode('utf-8'))
+
+                            # Vérifier la limite totale
+                            if total_bytes + chunk_size > self.MAX_RESPONSE_SIZE_BYTES:
+                                remaining = self.MAX_RESPONSE_SIZE_BYTES - total_bytes
+                                if remaining > 0:
+                                    yield chunk[:remaining]
+                                if self.logger:
+                                    self.logger.warning(f"Stream tronqué à {self.MAX_RESPONSE_SIZE_BYTES / 1024:.0f}KB")
+                                yield "\n\n[... Stream tronqué pour limiter l'utilisation mémoire ...]"
+                                break
+
+                            total_bytes += chunk_size
+                            yield chunk
+                    except json.JSONDecodeError:
+                        continue
+        finally:
+            response.close()
 
     def _trim_history(self):
         """Limite la taille de l'historique pour éviter surcharge mémoire (CSAPP Ch.10)"""
@@ -1,13 +1,17 @@
 """Planificateur de projets pour l'agent autonome"""
 
+import hashlib
 import json
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional
 from pathlib import Path
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
 from rich.text import Text
 from src.terminal.rich_console import get_console
+from src.utils.plan_cache import normalize_request, keywords
+from config.constants import ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_JACCARD
 
 class ProjectPlanner:
     """Analyse les demandes et génère des plans de projets"""
@@ -24,6 +28,48 @@ class ProjectPlanner:
         self.logger = logger
         self.current_plan = None
 
+        # Analyses déjà faites: par demande normalisée (exact) et par mots-clés
+        # (demande reformulée, similarité de Jaccard)
+        self._analysis_exact: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._analysis_bag: 'OrderedDict[FrozenSet[str], Dict]' = OrderedDict()
+
+    def _cached_analysis(self, exact_key: str, bag: FrozenSet[str]) -> Optional[Dict]:
+        """
+        Cherche une analyse déjà faite pour cette demande ou une demande proche
+
+        Args:
+            exact_key: Empreinte de la demande normalisée
+            bag: Mots-clés de la demande
+
+        Returns:
+            Copie de l'analyse, ou None
+        """
+        analysis = self._analysis_exact.get(exact_key)
+        if analysis is None and bag:
+            for cached_bag, cached in self._analysis_bag.items():
+                # Jaccard >= seuil impose des tailles proches: test gratuit d'abord
+                if min(len(bag), len(cached_bag)) < ANALYSIS_CACHE_JACCARD * max(len(bag), len(cached_bag)):
+                    continue
+                if len(bag & cached_bag) >= ANALYSIS_CACHE_JACCARD * len(bag | cached_bag):
+                    analysis = cached
+                    break
+        return dict(analysis) if analysis is not None else None
+
+    def _remember_analysis(self, exact_key: str, bag: FrozenSet[str], analysis: Dict):
+        """
+        Enregistre une analyse (éviction LRU au-delà de ANALYSIS_CACHE_SIZE)
+
+        Args:
+            exact_key: Empreinte de la demande normalisée
+            bag: Mots-clés de la demande
+            analysis: Analyse du modèle
+        """
+        for cache, key in ((self._analysis_exact, exact_key), (self._analysis_bag, bag)):
+            cache[key] = analysis
+            cache.move_to_end(key)
+            if len(cache) > ANALYSIS_CACHE_SIZE:
+                cache.popitem(last=False)
+
     def analyze_request(self, user_request: str) -> Dict:
         """
         Analyse une demande utilisateur et détermine si c'est un projet complexe
@@ -34,6 +80,15 @@ class ProjectPlanner:
         Returns:
             Dict avec 'is_complex', 'project_type', 'description'
         """
+        exact_key = hashlib.blake2b(normalize_request(user_request).encode('utf-8'),
+                                    digest_size=16).hexdigest()
+        bag = keywords(user_request)
+        cached = self._cached_analysis(exact_key, bag)
+        if cached is not None:
+            if self.logger:
+                self.logger.debug("Analyse de la demande trouvée dans le cache")
+            return cached
+
         prompt = f"""Analyse cette demande utilisateur et détermine s'il s'agit d'une demande de création de projet complexe nécessitant plusieurs fichiers et actions.
 
 Demande: "{user_request}"
@@ -64,6 +119,7 @@ Exemples:
                 response = response.split('```')[1].split('```')[0]
 
             analysis = json.loads(response.strip())
+            self._remember_analysis(exact_key, bag, analysis)
 
             if self.logger:
                 self.logger.info(f"Analyse de la demande: {analysis}")
@@ -257,7 +313,8 @@ Sois précis et complet. Liste TOUS les fichiers nécessaires (code, config, rea
             ],
             'dependencies': [],
             'git_init': True,
-            'estimated_time': '5'
+            'estimated_time': '5',
+            'is_fallback': True
         }
 
     def display_plan(self, plan: Dict) -> str:
@@ -13,6 +13,7 @@ from typing import Dict
 from .code_editor import CodeEditor
 from .git_manager import GitManager
 from ..utils.auto_corrector import AutoCorrector
+from ..utils.parallel_workers import leaf_dirs
 from config import constants
 
 
@@ -93,17 +94,14 @@ class StepExecutor:
         """
         details = step.get('details', [])
 
-        # Créer le dossier projet principal
-        os.makedirs(project_path, exist_ok=True)
-
-        created = [project_path]
-
-        # Créer les sous-dossiers
-        for detail in details:
-            if isinstance(detail, str):
-                folder_path = os.path.join(project_path, detail)
-                os.makedirs(folder_path, exist_ok=True)
-                created.append(folder_path)
+        # Dossier projet principal et sous-dossiers: un seul makedirs par branche
+        created = [project_path] + [
+            os.path.join(project_path, detail)
+            for detail in details
+            if isinstance(detail, str)
+        ]
+        for folder_path in leaf_dirs(created):
+            os.makedirs(folder_path, exist_ok=True)
 
         return {
             'success': True,
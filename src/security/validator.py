@@ -1,8 +1,8 @@
 """Module de sécurité pour la validation des commandes"""
 
 import re
-from typing import Tuple, List, Dict, Any
-from collections import deque
+from typing import Tuple, List, Dict, Any, Optional
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 
 from src.utils.command_helpers import SafeLogger
@@ -30,6 +30,20 @@ class SecurityValidator:
         'iptables', 'ufw', 'firewall-cmd', 'apt remove', 'apt purge', 'pip uninstall'
     ]
 
+    # Message de confirmation: en-tête par niveau de risque (tout autre niveau → 'low')
+    CONFIRMATION_HEADERS = {
+        'high': "!  DANGER ! ",
+        'medium': "*  ATTENTION * ",
+        'low': "i  INFO i ",
+    }
+    CONFIRMATION_TEMPLATE = (
+        "\n{header}\n"
+        "Commande: {command}\n"
+        "Raison: {reason}\n"
+        "\n"
+        "Voulez-vous vraiment exécuter cette commande? (oui/non)"
+    )
+
     # Commandes sûres (whitelist)
     SAFE_COMMANDS = [
         'ls', 'pwd', 'cd', 'cat', 'less', 'more', 'head', 'tail',
@@ -59,6 +73,9 @@ class SecurityValidator:
         '/etc', '/boot', '/sys', '/proc', '/dev'
     ]
 
+    # Résultats de validation mémorisés (la validation est pure pour un jeu de règles)
+    VALIDATION_CACHE_SIZE = 512
+
     def __init__(self, logger=None):
         """
         Initialise le validateur de sécurité
@@ -69,6 +86,12 @@ class SecurityValidator:
         self.logger = SafeLogger(logger)
         self.risk_assessor = RiskAssessor()
 
+        # Cache LRU commande → (is_valid, risk_level, reason), vidé à chaque
+        # changement de règles (ruleset_version)
+        self.ruleset_version = 0
+        self._validate_cache: 'OrderedDict[str, Tuple[bool, str, str]]' = OrderedDict()
+        self._blocked_substrings = self._load_blocked_substrings()
+
         # Phase 2: Historique des commandes pour détection de patterns suspects
         self.command_history = deque(maxlen=100)  # Garde les 100 dernières commandes
 
@@ -90,21 +113,67 @@ class SecurityValidator:
             - risk_level: 'low', 'medium', 'high', ou 'blocked'
             - reason: Raison du blocage ou avertissement
         """
-        # Utiliser le RiskAssessor centralisé pour toute l'évaluation
-        assessment = self.risk_assessor.assess_risk(command)
-
-        # Logger si bloqué ou à haut risque
-        if assessment.blocked:
+        result = self._validate_cache.get(command)
+        if result is not None:
+            self._validate_cache.move_to_end(command)
+        else:
+            # Utiliser le RiskAssessor centralisé pour toute l'évaluation
+            assessment = self.risk_assessor.assess_risk(command)
+
+            # Format attendu par l'appelant
+            result = (
+                not assessment.blocked,
+                assessment.level.value,
+                "; ".join(assessment.reasons) if assessment.reasons else "OK"
+            )
+
+            self._validate_cache[command] = result
+            if len(self._validate_cache) > self.VALIDATION_CACHE_SIZE:
+                self._validate_cache.popitem(last=False)
+
+        # Logger si bloqué ou à haut risque (à chaque validation, cache ou non)
+        is_valid, risk_level, _ = result
+        if not is_valid:
             self.logger.warning(f"Commande bloquée: {command}")
-        elif assessment.level.value == 'high':
+        elif risk_level == 'high':
             self.logger.warning(f"Commande à haut risque: {command}")
 
-        # Retourner au format attendu par l'appelant
-        is_valid = not assessment.blocked
-        risk_level = assessment.level.value
-        reason = "; ".join(assessment.reasons) if assessment.reasons else "OK"
+        return result
 
-        return is_valid, risk_level, reason
+    def reload_rules(self):
+        """
+        Signale une modification des règles de sécurité (listes, patterns)
+
+        Incrémente ruleset_version et invalide les validations mémorisées.
+        """
+        self.ruleset_version += 1
+        self._validate_cache.clear()
+        self._blocked_substrings = self._load_blocked_substrings()
+        self.logger.info(f"Règles de sécurité rechargées (version {self.ruleset_version})")
+
+    def _load_blocked_substrings(self) -> Tuple[str, ...]:
+        """Commandes interdites du RiskAssessor, en minuscules (pour validate_prefix)"""
+        return tuple(cmd.lower() for cmd in self.risk_assessor.BLOCKED_COMMANDS)
+
+    def validate_prefix(self, partial_command: str) -> Optional[bool]:
+        """
+        Valide un début de commande pendant sa génération en streaming
+
+        Un préfixe contenant déjà une commande interdite ne peut plus devenir
+        valide: la commande complète contiendra la même sous-chaîne et sera
+        bloquée par validate_command. La génération peut donc être abandonnée.
+
+        Args:
+            partial_command: Début de la commande générée
+
+        Returns:
+            False si la commande finale sera forcément bloquée, None si indéterminé
+        """
+        partial_lower = partial_command.lower()
+        for blocked in self._blocked_substrings:
+            if blocked in partial_lower:
+                return False
+        return None
 
     def requires_confirmation(self, risk_level: str) -> bool:
         """
@@ -130,24 +199,9 @@ class SecurityValidator:
         Returns:
             Message de confirmation
         """
-        if risk_level == 'high':
-            emoji = "! "
-            level_text = "DANGER"
-        elif risk_level == 'medium':
-            emoji = "* "
-            level_text = "ATTENTION"
-        else:
-            emoji = "i "
-            level_text = "INFO"
-
-        message = f"""
-{emoji} {level_text} {emoji}
-Commande: {command}
-Raison: {reason}
-
-Voulez-vous vraiment exécuter cette commande? (oui/non)"""
-
-        return message
+        # En-tête pré-assemblé par niveau: une recherche + un seul formatage
+        header = self.CONFIRMATION_HEADERS.get(risk_level, self.CONFIRMATION_HEADERS['low'])
+        return self.CONFIRMATION_TEMPLATE.format(header=header, command=command, reason=reason)
 
     def sanitize_output(self, output: str, max_length: int = 5000) -> str:
         """
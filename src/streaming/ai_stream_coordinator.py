@@ -21,7 +21,7 @@ class AIStreamCoordinator:
         logger: Logger pour les messages de debug
     """
 
-    def __init__(self, parser, stream_processor, logger=None):
+    def __init__(self, parser, stream_processor, logger=None, prefix_validator=None):
         """
         Initialise le coordinateur de streaming.
 
@@ -29,15 +29,18 @@ class AIStreamCoordinator:
             parser: CommandParser pour générer les requêtes IA
             stream_processor: AIStreamProcessor pour afficher le stream
             logger: Logger optionnel pour les messages
+            prefix_validator: Validation de préfixe de commande (ex: SecurityValidator.validate_prefix)
         """
         self.parser = parser
         self.stream_processor = stream_processor
         self.logger = logger
+        self.prefix_validator = prefix_validator
 
     def stream_ai_response(
         self,
         user_input: str,
-        context_history: Optional[list] = None
+        context_history: Optional[list] = None,
+        system_prompt_key: str = "default"
     ) -> Dict[str, Any]:
         """
         Stream une réponse IA avec ou sans historique de contexte.
@@ -49,6 +52,7 @@ class AIStreamCoordinator:
             user_input: Demande utilisateur
             context_history: Historique optionnel des étapes précédentes
                            (None pour première requête, list pour itérations suivantes)
+            system_prompt_key: Prompt système du parser ("default" ou "fast")
 
         Returns:
             Dict avec command, explanation, risk_level, parsed_sections
@@ -66,14 +70,15 @@ class AIStreamCoordinator:
             # Sans historique (première requête)
             if self.logger:
                 self.logger.debug("[STREAMING] Première requête sans historique")
-            stream_generator = self.parser.parse_user_request_stream(user_input)
+            stream_generator = self.parser.parse_user_request_stream(user_input, system_prompt_key)
             context_label = "STREAMING"
 
         # Déléguer au processeur de streaming
         return self.stream_processor.process_stream(
             stream_generator,
             user_input,
-            context_label=context_label
+            context_label=context_label,
+            prefix_validator=self.prefix_validator
         )
 
     def stream_fast_mode_response(self, user_input: str) -> Dict[str, Any]:
@@ -86,17 +91,4 @@ class AIStreamCoordinator:
         Returns:
             Dict avec command, explanation, risk_level, parsed_sections
         """
-        from config.prompts import SYSTEM_PROMPT_FAST
-
-        # Sauvegarder le prompt original
-        original_prompt_method = self.parser._get_parsing_system_prompt
-
-        # Override temporaire pour utiliser SYSTEM_PROMPT_FAST
-        self.parser._get_parsing_system_prompt = lambda: SYSTEM_PROMPT_FAST
-
-        try:
-            # Utiliser la méthode unifiée
-            return self.stream_ai_response(user_input, context_history=None)
-        finally:
-            # Restaurer le prompt original
-            self.parser._get_parsing_system_prompt = original_prompt_method
+        return self.stream_ai_response(user_input, context_history=None, system_prompt_key="fast")
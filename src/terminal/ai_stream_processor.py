@@ -3,7 +3,7 @@ Processeur de streaming IA avec affichage des balises en temps réel
 Centralise la logique de streaming pour éviter la duplication de code
 """
 
-from typing import Dict, Any, Iterator, Optional, List
+from typing import Dict, Any, Callable, Iterator, Optional, List
 import logging
 from src.utils.tag_parser import TagParser
 from src.terminal.tag_display import TagDisplay
@@ -11,6 +11,9 @@ from src.core.exceptions import StreamingError
 
 logger = logging.getLogger(__name__)
 
+# Balises contenant la commande générée (soumises à la validation de préfixe)
+_COMMAND_TAGS = frozenset({'commande', 'danger'})
+
 
 class AIStreamProcessor:
     """
@@ -48,7 +51,8 @@ class AIStreamProcessor:
         self,
         stream_generator: Iterator[str],
         user_input: str,
-        context_label: str = "STREAMING"
+        context_label: str = "STREAMING",
+        prefix_validator: Optional[Callable[[str], Optional[bool]]] = None
     ) -> Dict[str, Any]:
         """
         Traite un stream IA token par token avec affichage des balises
@@ -57,6 +61,8 @@ class AIStreamProcessor:
             stream_generator: Générateur de tokens IA
             user_input: Demande utilisateur originale
             context_label: Label pour les logs (ex: "STREAMING", "STREAMING WITH HISTORY")
+            prefix_validator: Validation de la commande en cours de génération
+                (False = commande forcément bloquée: le stream est interrompu)
 
         Returns:
             Dict avec command, explanation, risk_level, parsed_sections
@@ -106,9 +112,15 @@ class AIStreamProcessor:
                 # Accumuler le contenu de la balise courante
                 if current_tag and not in_tag:
                     tag_content += token
+
+                    if (prefix_validator and current_tag.lower() in _COMMAND_TAGS
+                            and prefix_validator(tag_content.strip()) is False):
+                        return self._abort_blocked_stream(
+                            stream_generator, tag_content.strip(), user_input, context_label
+                        )
                 elif not current_tag:
                     # Pas encore de balise, afficher brut
-                    self.console.print(token, end="")
+                    self.console.print(token, end="", markup=False, highlight=False)
 
             # Afficher la dernière section si existante
             if current_tag and tag_content.strip():
@@ -152,6 +164,42 @@ class AIStreamProcessor:
                 partial_data=None
             )
 
+    def _abort_blocked_stream(
+        self,
+        stream_generator: Iterator[str],
+        partial_command: str,
+        user_input: str,
+        context_label: str
+    ) -> Dict[str, Any]:
+        """
+        Interrompt un stream dont la commande sera forcément bloquée
+
+        Fermer le générateur ferme la requête HTTP sous-jacente: le modèle
+        cesse de générer des tokens inutiles.
+
+        Args:
+            stream_generator: Générateur de tokens IA à fermer
+            partial_command: Début de commande ayant déclenché le blocage
+            user_input: Demande utilisateur originale
+            context_label: Label pour les logs
+
+        Returns:
+            Dict sans commande (risk_level 'blocked')
+        """
+        stream_generator.close()
+        logger.warning(f"[{context_label} ABORT] Commande interdite en cours de génération: {partial_command}")
+
+        self.console.print()
+        self.console.error("Génération interrompue: commande interdite")
+
+        return {
+            'command': None,
+            'explanation': f"Commande interdite détectée pendant la génération: {partial_command}",
+            'risk_level': 'blocked',
+            'original_request': user_input,
+            'parsed_sections': {}
+        }
+
     def _extract_generator_result(self, stream_generator: Iterator[str]) -> Optional[Dict[str, Any]]:
         """
         Extrait la valeur de retour d'un générateur Python
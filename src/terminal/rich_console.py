@@ -18,6 +18,9 @@ from rich import box
 
 logger = logging.getLogger(__name__)
 
+# Style du thème appliqué aux sorties de commandes (print_output)
+_OUTPUT_STYLE = "output"
+
 # Import optionnel du PromptManager (pour historique navigable + auto-complétion)
 try:
     from src.terminal.prompt_manager import PromptManager
@@ -112,6 +115,15 @@ class RichConsoleManager:
         """Affichage générique via Rich Console."""
         self.console.print(*args, **kwargs)
 
+    def print_output(self, text: str):
+        """
+        Sortie de commande (callback de streaming, appelé par ligne ou bloc de lignes).
+
+        Texte brut stylé: pas de f-string ni de parsing de markup par ligne
+        (un '[...]' dans la sortie n'est plus interprété comme une balise Rich).
+        """
+        self.console.print(text, style=_OUTPUT_STYLE, markup=False, highlight=False)
+
     def print_panel(self, content: str, title: str = "", style: str = "border", **kwargs):
         """Affiche un panel Rich."""
         self.console.print(Panel(content, title=title, border_style=style, **kwargs))
@@ -124,21 +136,21 @@ class RichConsoleManager:
     # MESSAGES D'ÉTAT
     # ═══════════════════════════════════════════════════════════════
 
-    def success(self, message: str):
-        """Message de succès."""
-        self.console.print(f"[success]✓[/success] {message}")
+    def success(self, message: str, blank_before: bool = False):
+        """Message de succès (blank_before: ligne vide avant, dans la même écriture)."""
+        self.console.print(("\n" if blank_before else "") + f"[success]✓[/success] {message}")
 
-    def error(self, message: str):
-        """Message d'erreur."""
-        self.console.print(f"[error]✗[/error] {message}")
+    def error(self, message: str, blank_before: bool = False):
+        """Message d'erreur (blank_before: ligne vide avant, dans la même écriture)."""
+        self.console.print(("\n" if blank_before else "") + f"[error]✗[/error] {message}")
 
-    def warning(self, message: str):
-        """Message d'avertissement."""
-        self.console.print(f"[warning]![/warning] {message}")
+    def warning(self, message: str, blank_before: bool = False):
+        """Message d'avertissement (blank_before: ligne vide avant, dans la même écriture)."""
+        self.console.print(("\n" if blank_before else "") + f"[warning]![/warning] {message}")
 
-    def info(self, message: str):
-        """Message d'information."""
-        self.console.print(f"[info]i[/info] {message}")
+    def info(self, message: str, blank_before: bool = False):
+        """Message d'information (blank_before: ligne vide avant, dans la même écriture)."""
+        self.console.print(("\n" if blank_before else "") + f"[info]i[/info] {message}")
 
     # ═══════════════════════════════════════════════════════════════
     # BANNER & DÉMARRAGE
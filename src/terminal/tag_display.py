@@ -206,7 +206,7 @@ class TagDisplay:
         # Pour les panels (commande/code), on accumule et affiche à la fin
         # Pour les autres, on affiche token par token
         if not style_config.get('use_panel'):
-            self.console.print(token, end="", style=color)
+            self.console.print(token, end="", style=color, markup=False, highlight=False)
 
     def display_section_end(self):
         """Affiche la fin d'une section."""
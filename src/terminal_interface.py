@@ -2,6 +2,7 @@
 
 import sys
 import os
+import re
 from typing import Optional
 from src.modules import OllamaClient, CommandParser, CommandExecutor, AutonomousAgent
 from src.modules.background_planner import BackgroundPlanner
@@ -18,10 +19,27 @@ from src.terminal.display_manager import DisplayManager
 from src.terminal.tag_display import TagDisplay
 from src.terminal.ai_stream_processor import AIStreamProcessor
 from src.terminal.rich_console import get_console
+from src.handlers.mode_handler import ModeHandler
+from src.handlers.special_command_handler import SpecialCommandHandler
+from src.handlers.user_input_handler import UserInputHandler
 from src.terminal import rich_components
 from simple_term_menu import TerminalMenu
+from rich.rule import Rule
 from config import prompts, project_templates, constants
-from config.constants import MAX_AUTO_ITERATIONS
+
+# Marqueurs de fin de tâche dans l'explication de l'IA (mode AUTO itératif),
+# compilés en une alternance: un seul parcours du texte au lieu d'un par marqueur
+_TASK_COMPLETED_RE = re.compile(
+    '|'.join(re.escape(marker) for marker in (
+        "tâche terminée",
+        "tâche complétée",
+        "objectif atteint",
+        "impossible de continuer",
+        "pas de solution",
+        "aucune commande appropriée"
+    )),
+    re.IGNORECASE
+)
 
 class TerminalInterface:
     """Interface en ligne de commande pour le Terminal IA"""
@@ -77,7 +95,8 @@ class TerminalInterface:
                 model=settings.ollama_model,
                 timeout=settings.ollama_timeout,
                 logger=logger,
-                cache_manager=cache_manager
+                cache_manager=cache_manager,
+                embed_model=settings.ollama_embed_model
             )
 
             # Préchauffer le modèle pour éviter le timeout sur la première requête
@@ -159,6 +178,14 @@ class TerminalInterface:
                 self.background_planner.on_analysis_complete = self._on_background_analysis_complete
                 self.background_planner.on_error = self._on_background_planning_error
 
+            # Confirmations et saisies utilisateur (utilisé par le gestionnaire des modes)
+            self.user_input = UserInputHandler(self)
+
+            # Gestionnaire des modes (MANUAL/AUTO/FAST/AGENT), une fois les composants prêts
+            self.mode_handler = ModeHandler(self)
+            # Commandes spéciales (/help, /cache...): le display_manager doit exister
+            self.special_commands = SpecialCommandHandler(self)
+
             self.logger.info("Composants initialisés avec succès")
 
         except Exception as e:
@@ -257,402 +284,42 @@ class TerminalInterface:
 
     def _handle_special_command(self, command: str):
         """
-        Gère les commandes spéciales
+        Gère les commandes spéciales (table de dispatch de SpecialCommandHandler)
 
         Args:
             command: Commande spéciale (commence par /)
         """
-        cmd_lower = command.lower()
-
-        if cmd_lower == '/quit' or cmd_lower == '/exit':
-            self._quit()
-
-        elif cmd_lower == '/help':
-            self.console.print_help(prompts.HELP_TEXT)
-
-        elif cmd_lower == '/manual':
-            # Basculer en mode MANUAL
-            if self.shell_engine.switch_to_manual():
-                self.logger.info("Changement de mode: → MANUAL")
-                self.console.print()
-                self.console.success("Mode MANUAL activé")
-                self.console.print(f"[dim]{self.shell_engine.get_mode_description()}[/dim]")
-            else:
-                self.console.print()
-                self.console.info("Déjà en mode MANUAL")
-
-        elif cmd_lower == '/auto':
-            # Basculer en mode AUTO
-            if self.shell_engine.switch_to_auto():
-                self.logger.info("Changement de mode: → AUTO (itératif)")
-                self.console.print()
-                self.console.success("Mode AUTO activé")
-                self.console.print(f"[dim]{self.shell_engine.get_mode_description()}[/dim]")
-            else:
-                self.console.print()
-                self.console.info("Déjà en mode AUTO")
-
-        elif cmd_lower == '/fast':
-            # Basculer en mode FAST
-            if self.shell_engine.switch_to_fast():
-                self.logger.info("Changement de mode: → FAST (one-shot)")
-                self.console.print()
-                self.console.success("Mode FAST activé")
-                self.console.print(f"[dim]{self.shell_engine.get_mode_description()}[/dim]")
-            else:
-                self.console.print()
-                self.console.info("Déjà en mode FAST")
-
-        elif cmd_lower == '/status':
-            # Afficher le statut du shell
-            self.display_manager.show_shell_status()
-
-        elif cmd_lower == '/clear':
-            self.logger.info("Effacement de l'historique demandé")
-            self.parser.clear_history()
-            self.ollama.clear_history()
-            self.console.print()
-            self.console.success("Historique effacé")
-
-        elif cmd_lower == '/history':
-            self.display_manager.show_history()
-
-        elif cmd_lower == '/models' or cmd_lower == '/change':
-            self.display_manager.list_models()
-
-        elif cmd_lower == '/info':
-            self.display_manager.show_system_info()
-
-        elif cmd_lower == '/templates':
-            self.display_manager.list_templates()
-
-        elif cmd_lower.startswith('/agent'):
-            # Mode agent autonome
-            if self.agent:
-                # Basculer en mode AGENT
-                self.shell_engine.switch_to_agent()
-
-                # Extraire la demande après /agent
-                request = command[6:].strip()
-                if request:
-                    self._handle_autonomous_mode(request)
-                else:
-                    self.console.print()
-                    self.console.info("Usage: /agent <votre demande>")
-                    self.console.print("[dim]Exemple: /agent crée-moi une API FastAPI[/dim]")
-            else:
-                self.console.print()
-                self.console.error("Mode agent autonome désactivé")
-
-        elif cmd_lower == '/pause':
-            if self.agent and self.agent.is_running:
-                self.agent.pause()
-                self.console.print()
-                self.console.print(prompts.AGENT_PAUSED)
-            else:
-                self.console.print()
-                self.console.error("Aucun agent en cours d'exécution")
-
-        elif cmd_lower == '/resume':
-            if self.agent and self.agent.is_paused:
-                self.agent.resume()
-                self.console.print()
-                self.console.success("Agent repris")
-            else:
-                self.console.print()
-                self.console.error("Aucun agent en pause")
-
-        elif cmd_lower == '/stop':
-            if self.agent and self.agent.is_running:
-                self.agent.stop()
-                self.console.print()
-                self.console.print(prompts.AGENT_STOPPED)
-            else:
-                self.console.print()
-                self.console.error("Aucun agent en cours d'exécution")
-
-        elif cmd_lower.startswith('/cache'):
-            # Commandes de gestion du cache (Phase 1)
-            parts = command.split()
-            if len(parts) == 1:
-                # /cache seul = afficher stats
-                self.display_manager.show_cache_stats()
-            elif parts[1].lower() == 'stats':
-                self.display_manager.show_cache_stats()
-            elif parts[1].lower() == 'clear':
-                self.display_manager.clear_cache()
-            else:
-                self.console.print()
-                self.console.error("Commande cache inconnue")
-                self.console.print("[dim]Usage: /cache [stats|clear][/dim]")
-
-        elif cmd_lower == '/hardware':
-            self.display_manager.show_hardware_info()
-
-        elif cmd_lower.startswith('/rollback'):
-            # Commandes de rollback (Phase 2)
-            if not self.agent:
-                self.console.print()
-                self.console.error("Le mode agent n'est pas activé")
-                return
-
-            parts = command.split()
-            if len(parts) == 1:
-                # /rollback seul = afficher snapshots disponibles
-                self.display_manager.show_snapshots()
-            elif parts[1].lower() == 'list':
-                self.display_manager.show_snapshots()
-            elif parts[1].lower() == 'restore':
-                # /rollback restore [snapshot_id]
-                snapshot_id = parts[2] if len(parts) > 2 else None
-                self.display_manager.restore_snapshot(snapshot_id)
-            elif parts[1].lower() == 'stats':
-                self.display_manager.show_rollback_stats()
-            else:
-                self.console.print()
-                self.console.error("Commande rollback inconnue")
-                self.console.print("[dim]Usage: /rollback [list|restore|stats][/dim]")
-
-        elif cmd_lower == '/security':
-            # Commande de rapport de sécurité (Phase 2)
-            self.display_manager.show_security_report()
-
-        elif cmd_lower.startswith('/corrections'):
-            # Commandes d'auto-correction (Phase 3)
-            if not self.agent:
-                self.console.print()
-                self.console.error("Le mode agent n'est pas activé")
-                return
-
-            parts = command.split()
-            if len(parts) == 1 or parts[1].lower() == 'stats':
-                self.display_manager.show_correction_stats()
-            elif parts[1].lower() == 'last':
-                self.display_manager.show_last_error()
-            else:
-                self.console.print()
-                self.console.error("Commande corrections inconnue")
-                self.console.print("[dim]Usage: /corrections [stats|last][/dim]")
-
-        elif cmd_lower.startswith('/plan'):
-            # Commandes de gestion des plans en arrière-plan
-            if not self.background_planner:
-                self.console.print()
-                self.console.error("La planification en arrière-plan n'est pas activée")
-                return
-
-            parts = command.split()
-            if len(parts) == 1:
-                # /plan seul = afficher le dernier plan
-                latest_plan_data = self.background_planner.get_plan_from_queue()
-
-                if not latest_plan_data:
-                    # Vérifier dans le stockage
-                    if self.plan_storage:
-                        stored_plan = self.plan_storage.get_latest_plan(executed=False)
-                        if stored_plan:
-                            latest_plan_data = {
-                                'plan': stored_plan['plan'],
-                                'analysis': stored_plan['analysis'],
-                                'request_id': stored_plan['request_id']
-                            }
-
-                if latest_plan_data:
-                    self.display_manager.show_background_plan(latest_plan_data)
-
-                    # Proposer d'exécuter
-                    self.console.print()
-                    response = input("Exécuter ce plan ? (oui/non): ").strip().lower()
-                    if response in ['oui', 'o', 'yes', 'y']:
-                        plan = latest_plan_data['plan']
-                        exec_result = self.agent.execute_plan(plan)
-
-                        if exec_result.get('success'):
-                            self.console.success("✓ Plan exécuté avec succès!")
-
-                            # Marquer comme exécuté
-                            if self.plan_storage:
-                                recent_plans = self.plan_storage.get_recent_plans(limit=1, executed=False)
-                                if recent_plans:
-                                    self.plan_storage.mark_executed(recent_plans[0]['id'], 'success')
-                        else:
-                            self.console.error("❌ Échec de l'exécution du plan")
-                            if self.plan_storage:
-                                recent_plans = self.plan_storage.get_recent_plans(limit=1, executed=False)
-                                if recent_plans:
-                                    self.plan_storage.mark_executed(recent_plans[0]['id'], 'failed')
-                else:
-                    self.console.print()
-                    self.console.warning("Aucun plan disponible")
-
-            elif parts[1].lower() == 'stats':
-                # /plan stats = statistiques du planificateur
-                stats = self.background_planner.get_stats()
-                self.display_manager.show_plan_stats(stats)
-
-                # Ajouter les stats du stockage
-                if self.plan_storage:
-                    storage_stats = self.plan_storage.get_stats()
-                    self.console.print()
-                    self.console.print("[subtitle]Stockage des plans:[/subtitle]")
-                    self.console.print(f"   [label]Total:[/label] {storage_stats['total_plans']}")
-                    self.console.print(f"   [label]Exécutés:[/label] {storage_stats['executed']}")
-                    self.console.print(f"   [label]En attente:[/label] {storage_stats['pending']}")
-
-            elif parts[1].lower() == 'list':
-                # /plan list = lister les plans récents
-                if self.plan_storage:
-                    recent_plans = self.plan_storage.get_recent_plans(limit=10)
-
-                    if not recent_plans:
-                        self.console.print()
-                        self.console.warning("Aucun plan dans l'historique")
-                    else:
-                        self.console.print()
-                        self.console.print("[title]PLANS RÉCENTS[/title]")
-                        self.console.print()
-
-                        for idx, plan_data in enumerate(recent_plans, 1):
-                            status_icon = "✓" if plan_data['executed'] else "⏸"
-                            status_text = "Exécuté" if plan_data['executed'] else "En attente"
-
-                            self.console.print(f"[label]{idx}.[/label] {status_icon} {plan_data['user_request'][:60]}")
-                            self.console.print(f"   [dim]Type:[/dim] {plan_data['analysis'].get('project_type', 'N/A')}")
-                            self.console.print(f"   [dim]Date:[/dim] {plan_data['created_at']}")
-                            self.console.print(f"   [dim]Statut:[/dim] {status_text}")
-                            self.console.print()
-                else:
-                    self.console.print()
-                    self.console.error("Stockage des plans non disponible")
-
-            elif parts[1].lower() == 'clear':
-                # /plan clear = effacer les résultats en attente
-                self.background_planner.clear_results()
-                self.console.print()
-                self.console.success("Plans en attente effacés")
-
-            else:
-                self.console.print()
-                self.console.error("Commande plan inconnue")
-                self.console.print("[dim]Usage: /plan [stats|list|clear][/dim]")
-
-        else:
-            self.console.print()
-            self.console.error(f"Commande inconnue: {command}")
-            self.console.print("[dim]Tapez /help pour voir les commandes disponibles[/dim]")
+        self.special_commands.handle_command(command)
 
     def _handle_user_request(self, user_input: str):
         """
-        Gère une demande utilisateur normale
+        Gère une demande utilisateur normale (routée selon le mode par ModeHandler)
 
         Args:
             user_input: Demande de l'utilisateur
         """
-        # Incrémenter le compteur de commandes
-        self.shell_engine.increment_command_count()
-
-        try:
-            # MODE MANUAL : Exécution directe sans IA
-            if self.shell_engine.is_manual_mode():
-                self._handle_manual_mode(user_input)
-                return
-
-            # MODE AUTO : Parsing IA itératif avec boucle
-            elif self.shell_engine.is_auto_mode():
-                self.console.print()
-                self._handle_auto_mode(user_input)
-                return
-
-            # MODE FAST : Parsing IA one-shot (une commande et c'est fini)
-            elif self.shell_engine.is_fast_mode():
-                self.console.print()
-                self._handle_fast_mode(user_input)
-                return
-
-            # MODE AGENT : Toujours proposer le mode autonome
-            elif self.shell_engine.is_agent_mode():
-                self.console.print()
-                self.console.info("Mode AGENT : Analyse en cours...")
-                self._handle_autonomous_mode(user_input)
-                return
+        self.mode_handler.handle_user_request(user_input)
 
-        except Exception as e:
-            self.logger.error(f"Erreur lors du traitement: {e}", exc_info=True)
-            self.console.print()
-            self.console.error(f"Erreur: {e}")
-
-    def _handle_manual_mode(self, user_input: str):
-        """
-        Gère les commandes en mode MANUAL (exécution directe)
-
-        Args:
-            user_input: Commande shell à exécuter
-        """
-        try:
-            # Vérifier si c'est une commande builtin
-            if self.builtins.is_builtin(user_input):
-                result = self.builtins.execute(user_input)
-                if result is not None:
-                    # Commande builtin exécutée - utiliser le handler unifié
-                    self.result_handler.handle_result(
-                        result=result,
-                        command=user_input,
-                        user_input=user_input,
-                        mode="manual"
-                    )
-                    return
-
-            # Exécuter via shell PTY persistant (VRAI TERMINAL)
-            # Avantages vs subprocess :
-            # - Variables d'environnement persistent (export fonctionne)
-            # - cd natif fonctionne
-            # - Aliases et functions shell fonctionnent
-            # - Session unique (comme bash/zsh)
-
-            # Callback pour afficher la sortie en temps réel
-            def stream_output(line):
-                """Affiche chaque ligne de sortie en temps réel"""
-                self.console.print(f"[output]{line}[/output]")
-
-            # Exécution avec shell PTY
-            self.console.print()  # Ligne vide avant la sortie
-            result = self.executor.execute_pty(
-                user_input,
-                output_callback=stream_output
-            )
-
-            # Traiter le résultat via le handler unifié (display + history + logging)
-            # skip_output=True car déjà affiché en temps réel
-            self.result_handler.handle_result(
-                result=result,
-                command=user_input,
-                user_input=user_input,
-                mode="manual",
-                skip_output=True
-            )
-
-        except Exception as e:
-            self.logger.error(f"Erreur mode manuel: {e}", exc_info=True)
-            self.console.error(f"Erreur: {e}")
-
-    def _stream_ai_response_with_tags(self, user_input: str) -> dict:
+    def _stream_ai_response_with_tags(self, user_input: str, system_prompt_key: str = "default") -> dict:
         """
         Stream la réponse IA avec affichage des balises en temps réel
 
         Args:
             user_input: Demande utilisateur
+            system_prompt_key: Prompt système du parser ("default" ou "fast")
 
         Returns:
             Dict avec command, explanation, risk_level, parsed_sections
         """
         # Obtenir le générateur de streaming
-        stream_gen = self.parser.parse_user_request_stream(user_input)
+        stream_gen = self.parser.parse_user_request_stream(user_input, system_prompt_key)
 
         # Déléguer au processeur de streaming (Refactoring: élimination duplication)
         return self.stream_processor.process_stream(
             stream_gen,
             user_input,
-            context_label="STREAMING"
+            context_label="STREAMING",
+            prefix_validator=self.security.validate_prefix
         )
 
     def _stream_ai_response_with_history(self, user_input: str, context_history: list) -> dict:
@@ -675,7 +342,8 @@ class TerminalInterface:
         return self.stream_processor.process_stream(
             stream_gen,
             user_input,
-            context_label="STREAMING WITH HISTORY"
+            context_label="STREAMING WITH HISTORY",
+            prefix_validator=self.security.validate_prefix
         )
 
     def _is_task_completed(self, explanation: str) -> bool:
@@ -691,25 +359,8 @@ class TerminalInterface:
         if not explanation:
             return False
 
-        # Chercher les marqueurs de complétion
-        completion_markers = [
-            "✓ Tâche terminée",
-            "✓ tâche terminée",
-            "tâche terminée",
-            "tâche complétée",
-            "objectif atteint",
-            "✗ Impossible de continuer",
-            "impossible de continuer",
-            "pas de solution",
-            "aucune commande appropriée"
-        ]
-
-        explanation_lower = explanation.lower()
-        for marker in completion_markers:
-            if marker.lower() in explanation_lower:
-                return True
-
-        return False
+        # Un seul passage regex pour tous les marqueurs de complétion
+        return _TASK_COMPLETED_RE.search(explanation) is not None
 
     def _prompt_next_action_with_arrows(self) -> str:
         """
@@ -755,307 +406,6 @@ class TerminalInterface:
             self.logger.error(f"Erreur lors de la sélection: {e}")
             return "stop"
 
-    def _handle_fast_mode(self, user_input: str):
-        """
-        Gère les commandes en mode FAST (IA one-shot, pas de boucle itérative)
-
-        Args:
-            user_input: Demande en langage naturel
-        """
-        self.logger.info(f"Entrée en mode FAST one-shot - Demande: {user_input[:100]}...")
-        try:
-            # Parser la demande avec streaming (affichage en temps réel avec balises)
-            # Utilise SYSTEM_PROMPT_FAST via un prompt système modifié
-            self.console.info("⚡ Mode FAST - Génération d'une commande optimale...")
-
-            # Temporairement changer le prompt système pour mode FAST
-            from config.prompts import SYSTEM_PROMPT_FAST
-            original_prompt = self.parser._get_parsing_system_prompt
-
-            # Override temporaire de la méthode pour utiliser SYSTEM_PROMPT_FAST
-            self.parser._get_parsing_system_prompt = lambda: SYSTEM_PROMPT_FAST
-
-            try:
-                parsed = self._stream_ai_response_with_tags(user_input)
-            finally:
-                # Restaurer le prompt original
-                self.parser._get_parsing_system_prompt = original_prompt
-
-            command = parsed.get('command')
-            risk_level = parsed.get('risk_level', 'unknown')
-            explanation = parsed.get('explanation', '')
-
-            if not command:
-                # Pas de commande générée
-                return
-
-            # Valider la sécurité
-            is_valid, security_level, security_reason = self.security.validate_command(command)
-
-            if not is_valid:
-                self.console.print()
-                self.console.error("Commande bloquée")
-                self.console.print(f"   Raison: {security_reason}")
-                self.logger.warning(f"Commande bloquée: {command} - {security_reason}")
-                return
-
-            # Demander confirmation si nécessaire
-            if security_level == 'high' or risk_level == 'high':
-                if not self._confirm_command(command, security_level, security_reason):
-                    self.console.error("Commande annulée")
-                    return
-
-            # Exécuter la commande avec streaming
-            self.console.info("Exécution...")
-            self.console.print()  # Ligne vide avant la sortie
-
-            # Callback pour afficher la sortie en temps réel
-            def stream_output(line):
-                """Affiche chaque ligne de sortie en temps réel"""
-                self.console.print(f"[output]{line}[/output]")
-
-            result = self.executor.execute_streaming(
-                command,
-                output_callback=stream_output,
-                strict_mode=False
-            )
-
-            # Traiter le résultat
-            self.result_handler.handle_result(
-                result,
-                command,
-                user_input,
-                "fast",
-                skip_output=True
-            )
-
-            # Enregistrer dans l'historique de sécurité
-            self.security.record_command_execution(
-                command=command,
-                success=result['success'],
-                risk_level=security_level
-            )
-
-            # Ajouter à l'historique du parser
-            self.parser.add_to_history(user_input, command, result.get('output', ''))
-
-            self.logger.info(f"Fin du mode FAST one-shot - Commande: {command}")
-
-        except Exception as e:
-            self.logger.error(f"Erreur mode fast: {e}", exc_info=True)
-            self.console.error(f"Erreur: {e}")
-
-    def _handle_auto_mode(self, user_input: str):
-        """
-        Gère les commandes en mode AUTO (avec IA - MODE ITÉRATIF)
-        Boucle itérative : commande → résultat → IA décide prochaine étape
-
-        Args:
-            user_input: Demande en langage naturel
-        """
-        self.logger.info(f"Entrée en mode AUTO itératif - Demande: {user_input[:100]}...")
-        try:
-            # PLANIFICATION EN ARRIÈRE-PLAN (si activée)
-            if self.background_planner and self.background_planner.is_running:
-                # Envoyer la requête pour analyse en arrière-plan
-                self.background_planner.analyze_request_async(user_input)
-                self.logger.debug("Requête envoyée au planificateur en arrière-plan")
-
-                # Vérifier si un plan est déjà disponible (analyse rapide)
-                import time
-                time.sleep(0.1)  # Petit délai pour laisser l'analyse démarrer
-
-                # Récupérer le dernier plan disponible
-                latest_plan = self.background_planner.get_latest_plan()
-                latest_analysis = self.background_planner.get_latest_analysis()
-
-                # Si un plan complexe est disponible et auto-exécution activée
-                if (latest_plan and latest_analysis and
-                    latest_analysis.get('is_complex') and
-                    getattr(self.settings, 'background_planning_auto_execute', True)):
-
-                    self.console.print()
-                    self.console.info("🎯 Plan détecté pour cette requête")
-
-                    # Exécuter le plan automatiquement
-                    self.logger.info("Exécution automatique du plan en arrière-plan")
-
-                    exec_result = self.agent.execute_plan(latest_plan)
-
-                    if exec_result.get('success'):
-                        self.console.success("✓ Plan exécuté avec succès!")
-
-                        # Marquer comme exécuté dans le stockage
-                        if self.plan_storage:
-                            request_id = latest_plan.get('_metadata', {}).get('request_id')
-                            if request_id:
-                                # Récupérer l'ID du plan depuis la storage
-                                recent_plans = self.plan_storage.get_recent_plans(limit=1)
-                                if recent_plans:
-                                    self.plan_storage.mark_executed(recent_plans[0]['id'], 'success')
-
-                        return
-                    else:
-                        self.console.warning("⚠️  Le plan a échoué, passage en mode itératif")
-
-            # BOUCLE ITÉRATIVE
-            context_history = []  # Historique des commandes et résultats
-            step_number = 0
-            self.logger.info(f"Démarrage de la boucle itérative (max {MAX_AUTO_ITERATIONS} étapes)")
-
-            while step_number < MAX_AUTO_ITERATIONS:
-                step_number += 1
-                self.logger.debug(f"Itération {step_number}/{MAX_AUTO_ITERATIONS}")
-                self.console.print()
-                self.console.info(f"🔄 Étape {step_number}/{MAX_AUTO_ITERATIONS}")
-
-                # Utiliser parse_with_history pour le contexte conversationnel
-                if context_history:
-                    # Avec historique (étapes > 1)
-                    self.logger.debug(f"Génération avec historique ({len(context_history)} étapes précédentes)")
-                    parsed = self._stream_ai_response_with_history(user_input, context_history)
-                else:
-                    # Première étape, pas d'historique
-                    self.logger.debug("Première génération (sans historique)")
-                    self.console.info("Analyse de votre demande...")
-                    parsed = self._stream_ai_response_with_tags(user_input)
-
-                command = parsed.get('command')
-                risk_level = parsed.get('risk_level', 'unknown')
-                explanation = parsed.get('explanation', '')
-
-                self.logger.info(f"Commande générée: {command}")
-                self.logger.debug(f"Risk level: {risk_level}, Explication: {explanation[:100]}...")
-
-                if not command:
-                    # Pas de commande générée
-                    self.logger.warning("Aucune commande générée par l'IA")
-                    self.console.warning("Aucune commande générée")
-                    break
-
-                # Valider la sécurité
-                is_valid, security_level, security_reason = self.security.validate_command(command)
-
-                if not is_valid:
-                    self.console.print()
-                    self.console.error("Commande bloquée")
-                    self.console.print(f"   Raison: {security_reason}")
-                    self.logger.warning(f"Commande bloquée: {command} - {security_reason}")
-                    break
-
-                # Demander confirmation si nécessaire
-                if security_level == 'high' or risk_level == 'high':
-                    if not self._confirm_command(command, security_level, security_reason):
-                        self.console.error("Commande annulée")
-                        break
-
-                # Exécuter la commande
-                self.console.info("Exécution...")
-                self.console.print()
-
-                def stream_output(line):
-                    self.console.print(f"[output]{line}[/output]")
-
-                result = self.executor.execute_streaming(
-                    command,
-                    output_callback=stream_output,
-                    strict_mode=False
-                )
-
-                # Enregistrer dans l'historique
-                self.result_handler.handle_result(
-                    result,
-                    command,
-                    user_input,
-                    "auto",
-                    skip_output=True
-                )
-
-                self.security.record_command_execution(
-                    command=command,
-                    success=result['success'],
-                    risk_level=security_level
-                )
-
-                self.parser.add_to_history(user_input, command, result.get('output', ''))
-
-                # Ajouter au contexte itératif
-                context_history.append({
-                    'command': command,
-                    'output': result.get('output', ''),
-                    'success': result['success']
-                })
-                self.logger.debug(f"Contexte mis à jour: {len(context_history)} étapes au total")
-
-                # Détecter si la tâche est complétée
-                is_completed = self._is_task_completed(explanation)
-
-                if is_completed:
-                    self.logger.info("Tâche détectée comme complétée par l'IA")
-                    self.console.print()
-                    self.console.success("✓ Tâche complétée!")
-                    break
-
-                # Demander à l'utilisateur s'il veut continuer
-                user_choice = self._prompt_next_action_with_arrows()
-                self.logger.info(f"Choix utilisateur: {user_choice}")
-
-                if user_choice == "stop":
-                    self.logger.info("Arrêt de la boucle itérative demandé par l'utilisateur")
-                    self.console.info("Arrêt demandé par l'utilisateur")
-                    break
-                elif user_choice == "improve":
-                    # Demander des précisions supplémentaires
-                    improvement = input("\n💬 Que voulez-vous préciser/améliorer ? ").strip()
-                    if improvement:
-                        self.logger.info(f"Précision utilisateur ajoutée: {improvement[:100]}...")
-                        user_input = f"{user_input}\n\nPrécision: {improvement}"
-                        self.console.success("Précision prise en compte")
-                    continue
-                elif user_choice == "continue":
-                    # Continuer l'itération
-                    self.logger.debug("Utilisateur a choisi de continuer")
-                    continue
-
-            # Fin de la boucle
-            if step_number >= MAX_AUTO_ITERATIONS:
-                self.logger.warning(f"Limite de {MAX_AUTO_ITERATIONS} itérations atteinte")
-                self.console.warning(f"⚠️  Limite de {MAX_AUTO_ITERATIONS} itérations atteinte")
-
-            self.logger.info(f"Fin du mode AUTO itératif - {step_number} étapes exécutées")
-
-        except KeyboardInterrupt:
-            self.logger.info("Interruption par l'utilisateur (Ctrl+C) en mode AUTO")
-            self.console.print()
-            self.console.warning("Interruption par l'utilisateur (Ctrl+C)")
-        except Exception as e:
-            self.logger.error(f"Erreur mode auto: {e}", exc_info=True)
-            self.console.error(f"Erreur: {e}")
-
-    def _confirm_command(self, command: str, risk_level: str, reason: str) -> bool:
-        """
-        Demande confirmation pour une commande à risque
-
-        Args:
-            command: La commande à confirmer
-            risk_level: Niveau de risque
-            reason: Raison du risque
-
-        Returns:
-            True si l'utilisateur confirme
-        """
-        message = self.security.get_confirmation_message(command, risk_level, reason)
-        print(message)
-
-        while True:
-            response = input("\nVotre réponse (oui/non): ").strip().lower()
-            if response in ['oui', 'o', 'yes', 'y']:
-                return True
-            elif response in ['non', 'n', 'no']:
-                return False
-            else:
-                print("Réponse invalide. Tapez 'oui' ou 'non'")
-
     def _handle_autonomous_mode(self, user_request: str):
         """
         Gère une demande en mode agent autonome
@@ -1093,7 +443,6 @@ class TerminalInterface:
             print("\n" + self.agent.planner.display_plan(plan))
 
             # Demander confirmation
-            from rich.rule import Rule
             self.console.print(Rule(style="dim"))
             response = input("\nVoulez-vous lancer l'exécution? (oui/non/modifier): ").strip().lower()
 
@@ -1141,6 +490,13 @@ class TerminalInterface:
             self.background_planner.stop()
             self.logger.info("BackgroundPlanner arrêté")
 
+        # Interrompre la pré-génération AUTO et le plan en attente
+        self.mode_handler.close()
+
+        # Libérer le pool de workers de l'agent (processus persistants)
+        if self.agent:
+            self.agent.close()
+
         print(prompts.GOODBYE_MESSAGE)
         self.logger.info("Terminal IA arrêté")
         sys.exit(0)
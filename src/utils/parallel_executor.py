@@ -1,83 +1,40 @@
 """Exécuteur parallèle pour les tâches indépendantes de l'agent autonome"""
 
 import concurrent.futures
-from typing import List, Dict, Callable, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Callable, Any, Iterable, Iterator, Optional, Tuple
 import time
-import multiprocessing
-import platform
 from config import constants
 
+
 class ParallelExecutor:
-    """Exécute des tâches en VRAI parallèle pour accélérer l'agent autonome (multiprocessing)"""
+    """
+    Exécute des tâches en parallèle pour accélérer l'agent autonome
+
+    Les groupes d'un plan (execute_plan) ne contiennent que des créations de
+    fichiers (voir can_parallelize): du travail I/O, pendant lequel le GIL est
+    relâché. Ils tournent sur un pool de threads persistant, sans processus
+    ni pickling.
+    """
 
-    def __init__(self, max_workers: int = None, logger=None, executor_type: str = None,
-                 persistent_pool: bool = True):
+    def __init__(self, max_workers: int = None, logger=None):
         """
         Initialise l'exécuteur parallèle
 
         Args:
             max_workers: Nombre maximum de workers (None = auto-détection)
             logger: Logger pour les messages
-            executor_type: 'process' ou 'thread' (None = utiliser constante)
-            persistent_pool: Si True, maintient un pool persistant (CSAPP Ch.8 - réduit overhead ARM)
         """
         self.max_workers = max_workers or self._get_optimal_workers()
         self.logger = logger
-        self.persistent_pool = persistent_pool
-
-        # Détection ARM pour optimisations spécifiques
-        self.is_arm = self._detect_arm()
-
-        # Utiliser la constante si non spécifié
-        self.executor_type = executor_type or constants.PARALLEL_EXECUTOR_TYPE
-
-        # Pool persistant pour réduire overhead de création/destruction (CSAPP Ch.8)
-        self._pool: Optional[concurrent.futures.Executor] = None
-        self._pool_task_count = 0
-        self._pool_max_tasks = 100 if self.is_arm else 200  # Recycler plus souvent sur ARM
 
-        # Configurer multiprocessing pour Windows
-        if self.executor_type == 'process':
-            try:
-                # Vérifier si la méthode n'est pas déjà configurée
-                current_method = multiprocessing.get_start_method(allow_none=True)
-                if current_method is None:
-                    multiprocessing.set_start_method(constants.PARALLEL_PROCESS_START_METHOD, force=False)
-                    if self.logger:
-                        self.logger.debug(f"Méthode multiprocessing configurée: {constants.PARALLEL_PROCESS_START_METHOD}")
-                elif current_method != constants.PARALLEL_PROCESS_START_METHOD:
-                    if self.logger:
-                        self.logger.warning(f"Méthode multiprocessing déjà configurée ({current_method}), forçage en {constants.PARALLEL_PROCESS_START_METHOD}")
-                    multiprocessing.set_start_method(constants.PARALLEL_PROCESS_START_METHOD, force=True)
-                else:
-                    if self.logger:
-                        self.logger.debug(f"Méthode multiprocessing déjà correctement configurée: {current_method}")
-            except RuntimeError as e:
-                # Déjà configuré avec la même méthode
-                if self.logger:
-                    self.logger.debug("Méthode multiprocessing déjà configurée (RuntimeError ignoré)")
-            except Exception as e:
-                # Autre erreur lors de la configuration
-                if self.logger:
-                    self.logger.error(f"Erreur configuration multiprocessing: {e}")
-                raise
+        # Pool de threads persistant (créé au premier groupe parallèle)
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Résultats de analyze() par forme de plan (actions et fichiers des étapes)
+        self._analysis_cache: 'OrderedDict[Tuple, Tuple[List[List[int]], Dict[str, Any]]]' = OrderedDict()
 
         if self.logger:
-            mode = "MULTIPROCESSING (vrai parallélisme)" if self.executor_type == 'process' else "THREADING (concurrent I/O)"
-            pool_mode = "pool persistant" if self.persistent_pool else "pool temporaire"
-            arm_info = " [ARM optimisé]" if self.is_arm else ""
-            self.logger.info(f"ParallelExecutor initialisé avec {self.max_workers} workers en mode {mode} ({pool_mode}){arm_info}")
-
-    def _detect_arm(self) -> bool:
-        """
-        Détecte si on est sur architecture ARM (CSAPP Ch.8)
-
-        Returns:
-            True si ARM
-        """
-        machine = platform.machine().lower()
-        arm_archs = ['aarch64', 'armv7l', 'armv8', 'arm64']
-        return any(arch in machine for arch in arm_archs)
+            self.logger.info(f"ParallelExecutor initialisé avec {self.max_workers} workers (pool de threads)")
 
     def _get_optimal_workers(self) -> int:
         """
@@ -106,55 +63,24 @@ class ParallelExecutor:
             # 8+ GB RAM
             return min(cpu_count, 8)
 
-    def _get_pool(self) -> concurrent.futures.Executor:
+    def _get_pool(self) -> concurrent.futures.ThreadPoolExecutor:
         """
-        Obtient ou crée le pool d'exécution (CSAPP Ch.8 - pool persistant)
+        Obtient ou crée le pool de threads (persistant)
 
         Returns:
-            Pool d'exécution
+            Pool de threads
         """
-        # Si pool existe et pas besoin de recycler, le réutiliser
-        if self._pool is not None and self._pool_task_count < self._pool_max_tasks:
-            return self._pool
-
-        # Sinon, recycler le pool
-        if self._pool is not None:
-            if self.logger:
-                self.logger.debug(f"Recyclage du pool après {self._pool_task_count} tâches")
-            self._recycle_pool()
-
-        # Créer nouveau pool
-        executor_class = (concurrent.futures.ProcessPoolExecutor
-                         if self.executor_type == 'process'
-                         else concurrent.futures.ThreadPoolExecutor)
-
-        self._pool = executor_class(max_workers=self.max_workers)
-        self._pool_task_count = 0
-
-        if self.logger:
-            pool_type = "Process" if self.executor_type == 'process' else "Thread"
-            self.logger.debug(f"{pool_type}Pool créé avec {self.max_workers} workers")
-
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
         return self._pool
 
-    def _recycle_pool(self):
-        """Recycle le pool d'exécution pour libérer ressources (CSAPP Ch.8)"""
-        if self._pool is not None:
-            try:
-                self._pool.shutdown(wait=True)
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"Erreur lors du recyclage du pool: {e}")
-            finally:
-                self._pool = None
-                self._pool_task_count = 0
-
     def shutdown(self):
         """Arrête proprement le pool d'exécution"""
         if self._pool is not None:
             if self.logger:
                 self.logger.debug("Arrêt du pool d'exécution")
-            self._recycle_pool()
+            self._pool.shutdown(wait=True)
+            self._pool = None
 
     def __enter__(self):
         """Support du context manager"""
@@ -169,9 +95,48 @@ class ParallelExecutor:
         """Nettoyage lors de la destruction de l'objet"""
         self.shutdown()
 
+    def _iter_completed(self, futures: Iterable[concurrent.futures.Future],
+                        should_stop: Optional[Callable[[], bool]]) -> Iterator[concurrent.futures.Future]:
+        """
+        Itère sur les futures au fur et à mesure qu'elles se terminent
+
+        Si should_stop est fourni, il est consulté toutes les
+        PARALLEL_STOP_POLL_SECONDS: dès qu'il retourne True, les tâches pas
+        encore démarrées sont annulées et l'itération s'arrête (les tâches
+        déjà en cours dans un worker vont à leur terme, sans être attendues).
+
+        Args:
+            futures: Futures soumises
+            should_stop: Fonction retournant True si l'exécution doit s'arrêter
+
+        Yields:
+            Futures terminées
+        """
+        if should_stop is None:
+            yield from concurrent.futures.as_completed(futures)
+            return
+
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=constants.PARALLEL_STOP_POLL_SECONDS,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            yield from done
+
+            if pending and should_stop():
+                for future in pending:
+                    future.cancel()
+                if self.logger:
+                    self.logger.info(f"Arrêt demandé: {len(pending)} tâche(s) parallèle(s) abandonnée(s)")
+                return
+
     def _execute_tasks(self, executor: concurrent.futures.Executor,
                       tasks: List[Dict], executor_func: Callable,
-                      results: List) -> List[Dict]:
+                      results: List,
+                      should_stop: Optional[Callable[[], bool]] = None,
+                      on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
         """
         Exécute les tâches sur un executor donné
 
@@ -180,6 +145,8 @@ class ParallelExecutor:
             tasks: Liste de tâches
             executor_func: Fonction à appeler
             results: Liste des résultats à remplir
+            should_stop: Fonction retournant True si l'exécution doit s'arrêter
+            on_result: Appelé avec (index, résultat) dès qu'une tâche se termine
 
         Returns:
             Liste des résultats
@@ -191,7 +158,7 @@ class ParallelExecutor:
         }
 
         # Récupérer les résultats au fur et à mesure
-        for future in concurrent.futures.as_completed(future_to_index):
+        for future in self._iter_completed(future_to_index, should_stop):
             index = future_to_index[future]
             try:
                 result = future.result()
@@ -209,81 +176,88 @@ class ParallelExecutor:
                     'task_index': index
                 }
 
+            if on_result:
+                on_result(index, results[index])
+
         return results
 
-    def execute_parallel(self, tasks: List[Dict], executor_func: Callable) -> List[Dict]:
+    def execute_parallel(self, tasks: List[Dict], executor_func: Callable,
+                         should_stop: Optional[Callable[[], bool]] = None,
+                         estimated_ms: Optional[float] = None,
+                         on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
         """
-        Exécute une liste de tâches en VRAI parallèle (multiprocessing)
+        Exécute une liste de tâches en parallèle sur le pool de threads
 
         Args:
             tasks: Liste de tâches (dicts avec les paramètres)
             executor_func: Fonction à appeler pour chaque tâche
+            should_stop: Fonction optionnelle consultée pendant l'attente;
+                si elle retourne True, les tâches non terminées sont abandonnées
+            estimated_ms: Coût total estimé des tâches (ms); sous
+                PARALLEL_MIN_GROUP_COST_MS, exécution séquentielle directe
+            on_result: Fonction optionnelle appelée avec (index, résultat) dans
+                l'ordre de complétion, dès qu'une tâche se termine (le
+                should_stop suivant peut alors abandonner le reste du groupe)
 
         Returns:
             Liste des résultats dans le même ordre que les tâches
+            (tâches abandonnées: {'success': False, 'cancelled': True, ...})
         """
         if not tasks:
             return []
 
+        results = [None] * len(tasks)
+
         # Seuil minimum de tâches
-        if len(tasks) < constants.MIN_TASKS_FOR_PARALLEL:
-            # Pas assez de tâches, exécution séquentielle
-            return [executor_func(task) for task in tasks]
+        if (len(tasks) < constants.MIN_TASKS_FOR_PARALLEL
+                or (estimated_ms is not None and estimated_ms < constants.PARALLEL_MIN_GROUP_COST_MS)):
+            # Pas assez de tâches (ou trop courtes), exécution séquentielle
+            for index, task in enumerate(tasks):
+                if should_stop and should_stop():
+                    break
+                results[index] = executor_func(task)
+                if on_result:
+                    on_result(index, results[index])
+            self._mark_cancelled(results)
+            return results
 
-        results = [None] * len(tasks)
         start_time = time.time()
+        results = self._execute_tasks(self._get_pool(), tasks, executor_func,
+                                      results, should_stop, on_result)
+        self._mark_cancelled(results)
 
         if self.logger:
-            mode = "MULTIPROCESSING" if self.executor_type == 'process' else "THREADING"
-            pool_info = f" [pool persistant, {self._pool_task_count} tâches]" if self.persistent_pool else ""
-            self.logger.info(f"Exécution {mode} de {len(tasks)} tâches avec {self.max_workers} workers{pool_info}")
-
-        try:
-            # Utiliser pool persistant ou créer nouveau pool
-            if self.persistent_pool:
-                executor = self._get_pool()
-                use_context_manager = False
-            else:
-                # Mode legacy: créer nouveau pool à chaque fois
-                executor_class = (concurrent.futures.ProcessPoolExecutor
-                                 if self.executor_type == 'process'
-                                 else concurrent.futures.ThreadPoolExecutor)
-                executor = executor_class(max_workers=self.max_workers)
-                use_context_manager = True
-
-            # Exécuter les tâches
-            if use_context_manager:
-                with executor:
-                    results = self._execute_tasks(executor, tasks, executor_func, results)
-            else:
-                results = self._execute_tasks(executor, tasks, executor_func, results)
-                # Incrémenter compteur pour recyclage
-                self._pool_task_count += len(tasks)
-
-        except Exception as e:
-            # Fallback sur threading si multiprocessing échoue
-            if self.executor_type == 'process' and constants.PARALLEL_FALLBACK_TO_THREAD:
-                if self.logger:
-                    self.logger.warning(f"Multiprocessing échoué ({e}), fallback sur threading")
-
-                # Retry avec threading
-                self.executor_type = 'thread'
-                return self.execute_parallel(tasks, executor_func)
-            else:
-                raise
+            self.logger.info(f"Exécution de {len(tasks)} tâches ({self.max_workers} threads) "
+                             f"terminée en {time.time() - start_time:.2f}s")
 
-        elapsed = time.time() - start_time
+        return results
 
-        if self.logger:
-            mode = "MULTIPROCESSING" if self.executor_type == 'process' else "THREADING"
-            self.logger.info(f"Exécution {mode} terminée en {elapsed:.2f}s")
+    def _mark_cancelled(self, results: List) -> None:
+        """
+        Remplace les résultats manquants (tâches abandonnées sur arrêt) par une erreur
 
-        return results
+        Args:
+            results: Résultats à compléter (modifiés en place)
+        """
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {
+                    'success': False,
+                    'cancelled': True,
+                    'error': 'Exécution arrêtée',
+                    'task_index': index
+                }
 
     def can_parallelize(self, steps: List[Dict]) -> List[List[int]]:
         """
         Analyse une liste d'étapes et détermine lesquelles peuvent être exécutées en parallèle
 
+        Seules les créations de fichiers sont parallélisables; toute autre action
+        est une barrière exécutée seule. Entre deux barrières, chaque fichier ne
+        dépend que des fichiers précédents en conflit de chemin (même fichier ou
+        préfixe): il rejoint le premier groupe qui suit son dernier conflit, au
+        lieu d'attendre la fin de tout le groupe précédent.
+
         Args:
             steps: Liste des étapes du plan
 
@@ -293,73 +267,45 @@ class ParallelExecutor:
                      puis 3 seul, puis 4,5 en parallèle
         """
         groups = []
-        current_group = []
-        seen_files = set()
-        seen_dirs = set()
+        # Groupes de fichiers depuis la dernière barrière; pour chacun, ses chemins
+        # et tous leurs préfixes: le test de conflit (un chemin préfixe de l'autre)
+        # devient des recherches dans des sets au lieu d'un parcours du groupe
+        file_groups: List[List[int]] = []
+        group_paths: List[set] = []
+        group_prefixes: List[set] = []
 
         for i, step in enumerate(steps):
-            action = step.get('action')
-            can_add_to_group = True
-
-            if action == 'create_file':
+            if step.get('action') == 'create_file':
                 file_path = step.get('file_path', '')
-
-                # Vérifier si un fichier parent/enfant est déjà dans le groupe
-                for seen_file in seen_files:
-                    if file_path.startswith(seen_file) or seen_file.startswith(file_path):
-                        can_add_to_group = False
+                prefixes = {file_path[:end] for end in range(len(file_path) + 1)}
+
+                # Premier groupe après le dernier groupe contenant un fichier parent/enfant
+                level = 0
+                for previous in range(len(file_groups) - 1, -1, -1):
+                    if (file_path in group_prefixes[previous]
+                            or not group_paths[previous].isdisjoint(prefixes)):
+                        level = previous + 1
                         break
 
-                if can_add_to_group:
-                    seen_files.add(file_path)
-                    current_group.append(i)
-                else:
-                    # Finaliser le groupe actuel
-                    if current_group:
-                        groups.append(current_group)
-                    current_group = [i]
-                    seen_files = {file_path}
-                    seen_dirs = set()
-
-            elif action == 'create_structure':
-                # Les créations de structure doivent être isolées
-                if current_group:
-                    groups.append(current_group)
-                groups.append([i])
-                current_group = []
-                seen_files = set()
-                seen_dirs = set()
-
-            elif action == 'git_commit':
-                # Git commit doit attendre toutes les étapes précédentes
-                if current_group:
-                    groups.append(current_group)
-                groups.append([i])
-                current_group = []
-                seen_files = set()
-                seen_dirs = set()
-
-            elif action == 'run_command':
-                # Les commandes shell ne peuvent pas être parallélisées (sauf cas spéciaux)
-                if current_group:
-                    groups.append(current_group)
-                groups.append([i])
-                current_group = []
-                seen_files = set()
-                seen_dirs = set()
+                if level == len(file_groups):
+                    file_groups.append([])
+                    group_paths.append(set())
+                    group_prefixes.append(set())
+                file_groups[level].append(i)
+                group_paths[level].add(file_path)
+                group_prefixes[level].update(prefixes)
 
             else:
-                # Action inconnue, isoler par sécurité
-                if current_group:
-                    groups.append(current_group)
+                # create_structure, git_commit, run_command, action inconnue:
+                # attendent toutes les étapes précédentes et s'exécutent seules
+                groups.extend(file_groups)
                 groups.append([i])
-                current_group = []
-                seen_files = set()
-                seen_dirs = set()
+                file_groups = []
+                group_paths = []
+                group_prefixes = []
 
-        # Ajouter le dernier groupe
-        if current_group:
-            groups.append(current_group)
+        # Ajouter les derniers groupes
+        groups.extend(file_groups)
 
         return groups
 
@@ -392,6 +338,34 @@ class ParallelExecutor:
 
         return results
 
+    def analyze(self, steps: List[Dict]) -> Tuple[List[List[int]], Dict[str, Any]]:
+        """
+        Calcule les groupes parallélisables et leurs statistiques en une seule analyse
+
+        Le résultat est mis en cache par forme de plan: le regroupement ne dépend
+        que de l'action et du fichier de chaque étape, un plan ré-exécuté (après
+        rollback, plan sauvegardé) n'est pas ré-analysé.
+
+        Args:
+            steps: Liste des étapes du plan
+
+        Returns:
+            Tuple (groupes, statistiques), voir can_parallelize et get_parallelization_stats
+        """
+        key = tuple((step.get('action'), step.get('file_path', '')) for step in steps)
+        cached = self._analysis_cache.get(key)
+        if cached is None:
+            groups = self.can_parallelize(steps)
+            cached = (groups, self._stats_from_groups(steps, groups))
+            self._analysis_cache[key] = cached
+            if len(self._analysis_cache) > constants.PARALLEL_ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        else:
+            self._analysis_cache.move_to_end(key)
+
+        groups, stats = cached
+        return [list(group) for group in groups], dict(stats)
+
     def get_parallelization_stats(self, steps: List[Dict]) -> Dict[str, Any]:
         """
         Analyse les étapes et retourne des statistiques sur la parallélisation possible
@@ -402,8 +376,19 @@ class ParallelExecutor:
         Returns:
             Dict avec les statistiques
         """
-        groups = self.can_parallelize(steps)
+        return self._stats_from_groups(steps, self.can_parallelize(steps))
+
+    def _stats_from_groups(self, steps: List[Dict], groups: List[List[int]]) -> Dict[str, Any]:
+        """
+        Statistiques de parallélisation pour des groupes déjà calculés
+
+        Args:
+            steps: Liste des étapes
+            groups: Groupes retournés par can_parallelize(steps)
 
+        Returns:
+            Dict avec les statistiques
+        """
         total_steps = len(steps)
         parallel_groups = len(groups)
         steps_in_parallel = sum(len(g) for g in groups if len(g) > 1)
@@ -3,10 +3,37 @@
 import os
 import subprocess
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
 
 
+def leaf_dirs(paths: List[str]) -> List[str]:
+    """
+    Dossiers à créer réellement pour obtenir tous les chemins demandés
+
+    os.makedirs crée les parents: un dossier parent d'un autre chemin de la
+    liste n'a pas besoin de son propre appel (un seul makedirs par branche).
+
+    Args:
+        paths: Dossiers demandés
+
+    Returns:
+        Dossiers sans descendant dans la liste (normalisés, ordre conservé)
+
+    Examples:
+        >>> leaf_dirs(['p', 'p/src', 'p/src/api', 'p/tests'])
+        ['p/src/api', 'p/tests']
+    """
+    unique = list(dict.fromkeys(os.path.normpath(path) for path in paths))
+    ancestors = set()
+    for path in unique:
+        parent = os.path.dirname(path)
+        while parent and parent not in ancestors:
+            ancestors.add(parent)
+            parent = os.path.dirname(parent)
+    return [path for path in unique if path not in ancestors]
+
+
 def execute_create_file_worker(task_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Worker pour créer un fichier (picklable, top-level function)
@@ -125,15 +152,10 @@ def execute_create_structure_worker(task_data: Dict[str, Any]) -> Dict[str, Any]
                 'error': 'base_path manquant'
             }
 
-        # Créer le dossier de base
-        os.makedirs(base_path, exist_ok=True)
-        created = [base_path]
-
-        # Créer les sous-dossiers
-        for folder in folders:
-            folder_path = os.path.join(base_path, folder)
+        # Dossier de base et sous-dossiers: un seul makedirs par branche
+        created = [base_path] + [os.path.join(base_path, folder) for folder in folders]
+        for folder_path in leaf_dirs(created):
             os.makedirs(folder_path, exist_ok=True)
-            created.append(folder_path)
 
         return {
             'success': True,
@@ -0,0 +1,341 @@
+"""Cache de plans de projet (demande normalisée → analyse + template de plan)"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from config.constants import PLAN_CACHE_FILE, PLAN_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Nom de projet explicite dans une demande ("une API nommée todo-api")
+_NAME_RE = re.compile(
+    r'\b(?:nomm[ée]e?s?|appel[ée]e?s?|named|called)\s+["\']?([\w][\w.-]*)',
+    re.IGNORECASE
+)
+_TOKEN_RE = re.compile(r'\w+')
+# Emplacement du nom de projet dans un template de plan
+_NAME_SLOT = '{{project_name}}'
+# Jeton mis à la place de "nommé <nom>" dans la clé (la clé ne contient pas le
+# nom lui-même: deux demandes ne différant que par le nom partagent le plan)
+_NAME_MARKER = 'projectnameslot'
+# Version du format de clé (personnalisation blake2b): les entrées persistées
+# avec un ancien format ne sont plus servies
+_KEY_VERSION = b'plan-key-v2'
+
+_STOPWORDS = frozenset({
+    'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'd', 'l', 'et', 'ou',
+    'en', 'avec', 'pour', 'par', 'sur', 'dans', 'qui', 'que', 'moi', 'me', 'm',
+    'mon', 'ma', 'mes', 'stp', 'svp', 'a', 'an', 'the', 'and', 'or', 'with',
+    'for', 'of', 'to', 'in', 'on', 'my', 'please'
+})
+
+
+def extract_project_name(user_request: str) -> Optional[str]:
+    """
+    Extrait le nom de projet explicite d'une demande
+
+    Args:
+        user_request: Demande en langage naturel
+
+    Returns:
+        Nom du projet, ou None si la demande n'en donne pas (ou nom inutilisable
+        comme chemin)
+
+    Examples:
+        >>> extract_project_name("Crée une API FastAPI nommée todo-api")
+        'todo-api'
+    """
+    match = _NAME_RE.search(user_request)
+    if not match:
+        return None
+    name = match.group(1).rstrip('.')
+    return name if name and '..' not in name else None
+
+
+def normalize_request(user_request: str) -> str:
+    """
+    Forme canonique d'une demande: NFKC, casefold, espaces compactés
+
+    Args:
+        user_request: Demande en langage naturel
+
+    Returns:
+        Demande normalisée
+
+    Examples:
+        >>> normalize_request("  Crée une  API\tFastAPI ")
+        'crée une api fastapi'
+    """
+    return ' '.join(unicodedata.normalize('NFKC', user_request).casefold().split())
+
+
+def keywords(user_request: str) -> FrozenSet[str]:
+    """
+    Mots significatifs d'une demande (normalisée, sans mots vides)
+
+    Args:
+        user_request: Demande en langage naturel
+
+    Returns:
+        Ensemble des mots-clés
+    """
+    return frozenset(_TOKEN_RE.findall(normalize_request(user_request))) - _STOPWORDS
+
+
+def fingerprint(user_request: str) -> str:
+    """
+    Clé de cache d'une demande: mots-clés (normalisés, sans mots vides ni
+    "nommé <nom>") dans leur ordre d'apparition, hachés avec blake2b
+
+    L'ordre est gardé: "copie src vers backup" et "copie backup vers src"
+    demandent des plans différents (source et cible inversées).
+
+    Args:
+        user_request: Demande en langage naturel
+
+    Returns:
+        Empreinte hexadécimale
+
+    Examples:
+        >>> fingerprint("Crée une API FastAPI") == fingerprint("crée l'api  fastapi")
+        True
+        >>> fingerprint("copie src vers backup") == fingerprint("copie backup vers src")
+        False
+    """
+    text = normalize_request(user_request)
+    if extract_project_name(user_request) is not None:
+        text = _NAME_RE.sub(' ' + _NAME_MARKER + ' ', text, count=1)
+    tokens = [token for token in _TOKEN_RE.findall(text) if token not in _STOPWORDS]
+    return hashlib.blake2b(' '.join(tokens).encode('utf-8'), digest_size=16,
+                           person=_KEY_VERSION).hexdigest()
+
+
+def _map_name_fields(plan: Dict, func: Callable[[str], str]) -> Dict:
+    """
+    Copie d'un plan avec func appliquée aux seuls champs qui portent le nom du
+    projet: project_name, chemins de la structure, file_path des étapes et
+    dossiers des étapes create_structure. Le contenu des fichiers, les
+    descriptions, commandes et messages ne sont jamais modifiés (un nom de
+    projet "app" y est souvent aussi un identifiant: "app = FastAPI()").
+
+    Args:
+        plan: Plan ou template de plan
+        func: Transformation des chaînes concernées
+
+    Returns:
+        Copie du plan
+    """
+    plan = copy.deepcopy(plan)
+
+    if isinstance(plan.get('project_name'), str):
+        plan['project_name'] = func(plan['project_name'])
+
+    for entry in plan.get('structure') or []:
+        if isinstance(entry, dict) and isinstance(entry.get('path'), str):
+            entry['path'] = func(entry['path'])
+
+    for step in plan.get('steps') or []:
+        if not isinstance(step, dict):
+            continue
+        if isinstance(step.get('file_path'), str):
+            step['file_path'] = func(step['file_path'])
+        if step.get('action') == 'create_structure' and isinstance(step.get('details'), list):
+            step['details'] = [func(folder) if isinstance(folder, str) else folder
+                               for folder in step['details']]
+
+    return plan
+
+
+def _to_template(user_request: str, plan: Dict) -> Dict:
+    """
+    Template d'un plan: le nom de projet (celui de la demande et celui choisi
+    par le modèle) est remplacé par un emplacement dans les champs de nom et de
+    chemin (voir _map_name_fields)
+
+    Args:
+        user_request: Demande en langage naturel
+        plan: Plan généré
+
+    Returns:
+        Copie du plan avec emplacements
+    """
+    name = extract_project_name(user_request)
+    if not name:
+        return copy.deepcopy(plan)
+
+    names = {name, str(plan.get('project_name') or name)}
+    name_re = re.compile(
+        '|'.join(r'(?<![\w.-])' + re.escape(n) + r'(?![\w-])'
+                 for n in sorted(names, key=len, reverse=True))
+    )
+    return _map_name_fields(plan, lambda s: name_re.sub(_NAME_SLOT, s))
+
+
+def _plan_shape(plan: Dict) -> List[Tuple]:
+    """Ce que fait un plan (actions, fichiers, commandes), sans les textes descriptifs"""
+    return [
+        (step.get('action'), step.get('file_path'), step.get('command'), step.get('details'))
+        for step in plan.get('steps', [])
+    ]
+
+
+class PlanCache:
+    """
+    Cache LRU persistant: demande normalisée → (analyse, template de plan)
+
+    Une demande de projet déjà planifiée, aux mots près ("crée une API
+    FastAPI nommée todo" puis "API FastAPI nommée shop, crée-la") est servie
+    sans appel au modèle: le nom de projet est réinjecté dans le template.
+
+    Thread-safe: les entrées peuvent être rafraîchies en arrière-plan
+    (refresh) pendant que le premier plan sert les demandes.
+    """
+
+    def __init__(self, path: Path = PLAN_CACHE_FILE, max_size: int = PLAN_CACHE_SIZE):
+        """
+        Initialise le cache et charge les plans persistés
+
+        Args:
+            path: Fichier JSON de persistance
+            max_size: Nombre maximum de plans (éviction LRU)
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+        self._plans: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Charge les plans depuis le disque (fichier absent ou invalide: cache vide)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._plans.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de plans illisible ({self.path}): {e}")
+
+    def _save(self) -> None:
+        """Écrit les plans sur le disque (fichier temporaire puis renommage atomique)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self._plans, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Impossible de sauvegarder le cache de plans: {e}")
+
+    def lookup(self, user_request: str) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Résout une demande via un plan connu
+
+        Args:
+            user_request: Demande en langage naturel
+
+        Returns:
+            (analyse, plan) avec le nom de projet de la demande, ou None
+        """
+        key = fingerprint(user_request)
+        name = extract_project_name(user_request)
+        with self._lock:
+            entry = self._plans.get(key)
+            if entry is None:
+                return None
+
+            self._plans.move_to_end(key)
+            entry['hits'] = entry.get('hits', 0) + 1
+            if name:
+                plan = _map_name_fields(entry['plan'], lambda s: s.replace(_NAME_SLOT, name))
+            else:
+                plan = copy.deepcopy(entry['plan'])
+            return dict(entry['analysis']), plan
+
+    def hits(self, user_request: str) -> int:
+        """
+        Nombre de demandes servies par l'entrée depuis son dernier (re)calcul
+
+        Args:
+            user_request: Demande en langage naturel
+
+        Returns:
+            Nombre de hits (0 si pas d'entrée)
+        """
+        with self._lock:
+            entry = self._plans.get(fingerprint(user_request))
+            return entry.get('hits', 0) if entry else 0
+
+    def store(self, user_request: str, analysis: Dict, plan: Dict) -> None:
+        """
+        Enregistre le plan généré pour une demande
+
+        Args:
+            user_request: Demande en langage naturel
+            analysis: Analyse de la demande
+            plan: Plan généré
+        """
+        template = _to_template(user_request, plan)
+        key = fingerprint(user_request)
+        with self._lock:
+            self._plans[key] = {'analysis': analysis, 'plan': template, 'hits': 0}
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+            self._save()
+
+    def refresh(self, user_request: str, analysis: Dict, plan: Dict) -> bool:
+        """
+        Revalide une entrée avec un plan régénéré
+
+        Le plan en cache n'est remplacé que si le nouveau fait autre chose
+        (actions, fichiers, commandes): une simple reformulation des
+        descriptions ne change pas l'entrée. Dans tous les cas le compteur de
+        hits repart à zéro.
+
+        Args:
+            user_request: Demande en langage naturel
+            analysis: Analyse de la demande
+            plan: Plan régénéré
+
+        Returns:
+            True si le plan en cache a été remplacé
+        """
+        template = _to_template(user_request, plan)
+        key = fingerprint(user_request)
+        with self._lock:
+            entry = self._plans.get(key)
+            if entry is None:
+                return False
+
+            replaced = _plan_shape(template) != _plan_shape(entry['plan'])
+            if replaced:
+                entry['analysis'] = analysis
+                entry['plan'] = template
+            entry['hits'] = 0
+
+            self._save()
+            return replaced
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque)"""
+        with self._lock:
+            self._plans.clear()
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._plans)
@@ -0,0 +1,93 @@
+"""Arbre de préfixes compact (radix) pour le dispatch de commandes"""
+
+from typing import Any, Dict, Optional, Tuple
+
+
+class _Node:
+    """Nœud de l'arbre: arêtes indexées par leur premier caractère"""
+
+    __slots__ = ('edges', 'value')
+
+    def __init__(self):
+        self.edges: Dict[str, Tuple[str, '_Node']] = {}  # 1er caractère → (libellé, enfant)
+        self.value: Any = None
+
+
+class PrefixTrie:
+    """
+    Arbre radix: chaque arête porte un suffixe entier (pas un caractère par
+    nœud), ce qui garde l'arbre minuscule pour un petit jeu de commandes.
+
+    La recherche retourne la valeur du plus long préfixe enregistré, en un
+    seul parcours du texte (indépendant du nombre de préfixes).
+
+    Examples:
+        >>> trie = PrefixTrie()
+        >>> trie.insert('/cache', 'cache')
+        >>> trie.insert('/corrections', 'corrections')
+        >>> trie.longest_prefix('/cache clear')
+        'cache'
+        >>> trie.longest_prefix('/corr') is None
+        True
+    """
+
+    def __init__(self):
+        """Initialise un arbre vide"""
+        self._root = _Node()
+
+    def insert(self, key: str, value: Any) -> None:
+        """
+        Enregistre un préfixe
+
+        Args:
+            key: Préfixe (non vide)
+            value: Valeur associée (ex: handler), remplace l'éventuelle précédente
+        """
+        node = self._root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.edges[key[0]] = (key, child)
+                node = child
+                break
+
+            label, child = edge
+            common = 0
+            limit = min(len(label), len(key))
+            while common < limit and label[common] == key[common]:
+                common += 1
+
+            if common < len(label):
+                # Scinder l'arête: label[:common] → nœud intermédiaire → label[common:]
+                middle = _Node()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[key[0]] = (label[:common], middle)
+                child = middle
+
+            node = child
+            key = key[common:]
+
+        node.value = value
+
+    def longest_prefix(self, text: str) -> Optional[Any]:
+        """
+        Valeur du plus long préfixe enregistré de text
+
+        Args:
+            text: Texte à tester (ex: commande utilisateur)
+
+        Returns:
+            Valeur associée, ou None si aucun préfixe ne correspond
+        """
+        node, pos, found = self._root, 0, None
+        while True:
+            edge = node.edges.get(text[pos]) if pos < len(text) else None
+            if edge is None:
+                return found
+            label, node = edge
+            if not text.startswith(label, pos):
+                return found
+            pos += len(label)
+            if node.value is not None:
+                found = node.value
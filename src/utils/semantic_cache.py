@@ -0,0 +1,160 @@
+"""Cache sémantique des réponses IA (demandes reformulées → même commande)"""
+
+import math
+import re
+from collections import deque
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from config.constants import (
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_CRITICAL_TOKENS
+)
+from src.utils.template_cache import extract_slots
+
+_WORD_RE = re.compile(r'[\w-]+')
+# Chemin ou nom de fichier non quoté (contient /, \, ., ~ ou *)
+_PATH_RE = re.compile(r'[^\s"\']*[/\\.~*][^\s"\']*')
+
+
+class SemanticCache:
+    """
+    Cache des réponses IA indexé par l'embedding de la demande utilisateur
+
+    Une demande proche (similarité cosinus >= seuil) d'une demande déjà
+    traitée renvoie la réponse en cache sans appel au modèle. Garde-fous:
+    - les verbes critiques (rm, sudo, supprime...) doivent être identiques
+    - les valeurs littérales (nombres, chaînes quotées, chemins) aussi:
+      "supprime logs/a.txt" n'est jamais servi par "supprime logs/b.txt"
+    - le scope (ex: mode FAST vs AUTO, prompts système différents) aussi
+    - les réponses à risque élevé ne sont jamais mises en cache
+    - le cache est vidé quand le répertoire courant change
+    """
+
+    def __init__(self, embed_func: Callable[[str], Optional[Sequence[float]]],
+                 max_size: int = SEMANTIC_CACHE_SIZE,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        """
+        Initialise le cache
+
+        Args:
+            embed_func: Fonction texte → embedding (None si indisponible)
+            max_size: Nombre maximum d'entrées (les plus anciennes sont évincées)
+            threshold: Similarité cosinus minimale pour un hit
+        """
+        self.embed_func = embed_func
+        self.threshold = threshold
+        self._entries = deque(maxlen=max_size)  # (vecteur normalisé, clé (scope, verbes, littéraux), réponse)
+        self._cwd = None
+        self._last_query = (None, None)  # (texte, vecteur): évite un 2e embedding au store
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> Optional[List[float]]:
+        """Normalise un vecteur (le produit scalaire devient la similarité cosinus)"""
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+
+    @staticmethod
+    def _critical_tokens(text: str) -> FrozenSet[str]:
+        """Extrait les verbes critiques d'une demande"""
+        return frozenset(_WORD_RE.findall(text.lower())) & SEMANTIC_CACHE_CRITICAL_TOKENS
+
+    @staticmethod
+    def _literals(text: str) -> Tuple[str, ...]:
+        """Valeurs littérales d'une demande: slots du cache de templates puis chemins non quotés"""
+        paths = []
+        for token in _PATH_RE.findall(text):
+            token = token.rstrip(',;:!?')
+            if token.endswith('.') and token.strip('.'):
+                token = token[:-1]  # point final de la phrase ("liste les fichiers.")
+            if _PATH_RE.fullmatch(token):
+                paths.append(token)
+        return tuple(extract_slots(text)) + tuple(paths)
+
+    def _key(self, user_input: str, scope: str) -> tuple:
+        """Clé exacte d'une demande: scope, verbes critiques et valeurs littérales"""
+        return (scope, self._critical_tokens(user_input), self._literals(user_input))
+
+    def _sync_cwd(self, cwd: Optional[str]) -> None:
+        """Invalide le cache si le répertoire courant a changé"""
+        if cwd != self._cwd:
+            self._entries.clear()
+            self._cwd = cwd
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embedding normalisé, None si indisponible"""
+        if self._last_query[0] == text:
+            return self._last_query[1]
+        vector = self.embed_func(text)
+        vector = self._normalize(vector) if vector else None
+        self._last_query = (text, vector)
+        return vector
+
+    def lookup(self, user_input: str, cwd: Optional[str] = None, scope: str = '') -> Optional[Dict]:
+        """
+        Cherche une réponse en cache pour une demande
+
+        Args:
+            user_input: Demande en langage naturel
+            cwd: Répertoire courant (un changement invalide le cache)
+            scope: Espace de clés (ex: mode IA ayant produit la réponse)
+
+        Returns:
+            Copie de la réponse en cache, ou None
+        """
+        self._sync_cwd(cwd)
+        if not self._entries:
+            self.misses += 1
+            return None
+
+        query = self._embed(user_input)
+        if query is None:
+            self.misses += 1
+            return None
+
+        key = self._key(user_input, scope)
+        best_score, best_response = 0.0, None
+        for vector, entry_key, response in self._entries:
+            if entry_key != key or len(vector) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(vector, query))
+            if score > best_score:
+                best_score, best_response = score, response
+
+        if best_response is None or best_score < self.threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return dict(best_response)
+
+    def store(self, user_input: str, response: Dict, cwd: Optional[str] = None, scope: str = '') -> None:
+        """
+        Met en cache la réponse IA d'une demande
+
+        Args:
+            user_input: Demande en langage naturel
+            response: Réponse IA (command, risk_level, explanation, ...)
+            cwd: Répertoire courant au moment de la demande
+            scope: Espace de clés (ex: mode IA ayant produit la réponse)
+        """
+        if not response.get('command') or response.get('risk_level') == 'high':
+            return
+
+        self._sync_cwd(cwd)
+        vector = self._embed(user_input)
+        if vector is None:
+            return
+
+        self._entries.append((vector, self._key(user_input, scope), dict(response)))
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,176 @@
+"""Cache de templates de commandes (forme de demande récurrente → commande)"""
+
+import json
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+from config.constants import TEMPLATE_CACHE_FILE, TEMPLATE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Valeurs variables d'une demande: nombres et chaînes entre guillemets
+_SLOT_RE = re.compile(r'\d+|"[^"]*"|\'[^\']*\'')
+# Emplacement d'un slot dans un template: \x00 + caractère de zone privée
+# (pas de chiffre, qu'un slot numérique suivant pourrait matcher)
+_PLACEHOLDER_BASE = 0xE000
+_PLACEHOLDER_RE = re.compile('\x00([\ue000-\uf8ff])\x00')
+# Valeur réinjectable telle quelle dans une commande shell (pas d'espace, de
+# métacaractère, de glob ni de ~: une valeur ne peut pas changer la structure
+# de la commande ni désigner d'autres fichiers que ceux nommés)
+_SAFE_VALUE_RE = re.compile(r'[\w./+,:=@%-]+')
+# Séparateur scope / demande normalisée dans les clés
+_SCOPE_SEP = '\x1f'
+
+
+def normalize(user_input: str) -> str:
+    """
+    Normalise une demande: minuscules, nombres → #, chaînes entre guillemets → "
+
+    Args:
+        user_input: Demande en langage naturel
+
+    Returns:
+        Clé de template
+
+    Examples:
+        >>> normalize('Affiche les 20 dernières lignes de "app.log"')
+        'affiche les # dernières lignes de "'
+    """
+    return _SLOT_RE.sub(lambda m: '#' if m.group().isdigit() else '"', user_input.strip().lower())
+
+
+def extract_slots(user_input: str) -> List[str]:
+    """Valeurs des slots d'une demande, dans l'ordre (sans les guillemets)"""
+    return [s if s.isdigit() else s[1:-1] for s in _SLOT_RE.findall(user_input.strip())]
+
+
+def _is_safe_value(value: str) -> bool:
+    """Valeur réinjectable sans risque (caractères sûrs, pas de remontée de dossier "..")"""
+    return _SAFE_VALUE_RE.fullmatch(value) is not None and '..' not in value
+
+
+def _slot_pattern(value: str) -> 're.Pattern[str]':
+    """Regex d'une valeur de slot dans une commande (un nombre ne matche pas '3' dans 'python3')"""
+    if value.isdigit():
+        return re.compile(r'(?<![\w.])' + value + r'(?![\w.])')
+    return re.compile(r'(?<!\w)' + re.escape(value) + r'(?!\w)')
+
+
+class TemplateCache:
+    """
+    Cache LRU persistant: demande normalisée → template de commande
+
+    Une demande déjà vue à des nombres/chaînes près ("les 20 dernières lignes
+    de "a.log"" puis "les 50 dernières lignes de "b.log"") est résolue sans
+    appel au modèle en réinjectant les nouvelles valeurs dans le template.
+
+    Les templates sont rangés par scope (prompt système de la demande): une
+    commande apprise en mode FAST ne sert pas une demande AUTO.
+    """
+
+    def __init__(self, path: Path = TEMPLATE_CACHE_FILE, max_size: int = TEMPLATE_CACHE_SIZE):
+        """
+        Initialise le cache et charge les templates persistés
+
+        Args:
+            path: Fichier JSON de persistance
+            max_size: Nombre maximum de templates (éviction LRU)
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+        self._templates: 'OrderedDict[str, str]' = OrderedDict()
+        self._load()
+
+    def _load(self) -> None:
+        """Charge les templates depuis le disque (fichier absent ou invalide: cache vide)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._templates.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de templates illisible ({self.path}): {e}")
+
+    def _save(self) -> None:
+        """Écrit les templates sur le disque"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._templates, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"Impossible de sauvegarder le cache de templates: {e}")
+
+    def lookup(self, user_input: str, scope: str = '') -> Optional[str]:
+        """
+        Résout une demande via un template connu
+
+        Args:
+            user_input: Demande en langage naturel
+            scope: Scope du template (ex: prompt système "fast" ou "default")
+
+        Returns:
+            Commande avec les valeurs de la demande, ou None (pas de template,
+            ou valeur non réinjectable sans risque: l'IA reprend la main)
+        """
+        key = scope + _SCOPE_SEP + normalize(user_input)
+        template = self._templates.get(key)
+        if template is None:
+            return None
+
+        slots = extract_slots(user_input)
+        if not all(_is_safe_value(value) for value in slots):
+            return None
+
+        self._templates.move_to_end(key)
+        try:
+            return _PLACEHOLDER_RE.sub(
+                lambda m: slots[ord(m.group(1)) - _PLACEHOLDER_BASE], template
+            )
+        except IndexError:
+            return None
+
+    def store(self, user_input: str, command: str, scope: str = '') -> bool:
+        """
+        Enregistre le template d'une commande exécutée avec succès
+
+        Chaque valeur de slot de la demande doit apparaître exactement une fois
+        dans la commande: absente, une nouvelle valeur serait ignorée en
+        silence; répétée, l'emplacement serait ambigu. Sinon pas de template.
+
+        Args:
+            user_input: Demande en langage naturel
+            command: Commande générée pour cette demande
+            scope: Scope du template (ex: prompt système "fast" ou "default")
+
+        Returns:
+            True si le template a été enregistré
+        """
+        template = command
+        for index, value in enumerate(extract_slots(user_input)):
+            if not value or '\x00' in value or index >= 0x1900:
+                return False
+            template, count = _slot_pattern(value).subn(
+                f'\x00{chr(_PLACEHOLDER_BASE + index)}\x00', template
+            )
+            if count != 1:
+                return False
+
+        key = scope + _SCOPE_SEP + normalize(user_input)
+        self._templates[key] = template
+        self._templates.move_to_end(key)
+        while len(self._templates) > self.max_size:
+            self._templates.popitem(last=False)
+
+        self._save()
+        return True
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque)"""
+        self._templates.clear()
+        self._save()
+
+    def __len__(self) -> int:
+        return len(self._templates)
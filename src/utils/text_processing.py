@@ -4,9 +4,19 @@ Centralise les fonctions de nettoyage et formatage de texte
 """
 
 import re
+from functools import lru_cache
 from typing import List
 
 
+# Séquences ANSI (ESC [ params letter) OU caractères de contrôle non-imprimables
+# (sauf newline \n, tab \t, carriage return \r), supprimés en une seule passe
+ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[a-zA-Zhl]|[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Lignes vides en début / fin de sortie
+_LEADING_BLANK_LINES_RE = re.compile(r'\A(?:[^\S\n]*\n)+')
+_TRAILING_BLANK_LINES_RE = re.compile(r'(?:\n[^\S\n]*)+\Z')
+
+
 def strip_ansi_codes(text: str) -> str:
     """
     Supprime toutes les séquences d'échappement ANSI/VT100 d'une chaîne
@@ -29,19 +39,7 @@ def strip_ansi_codes(text: str) -> str:
         >>> strip_ansi_codes("Normal \\x1b[1;32mVert gras\\x1b[0m Normal")
         'Normal Vert gras Normal'
     """
-    # Pattern regex pour capturer TOUTES les séquences ANSI
-    # Format: ESC [ params letter
-    ansi_escape = re.compile(r'\x1b\[[0-9;?]*[a-zA-Zhl]')
-
-    # Supprimer aussi les caractères de contrôle non-imprimables
-    # sauf newline \n, tab \t, carriage return \r
-    control_chars = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
-
-    # Nettoyer en deux passes
-    text = ansi_escape.sub('', text)
-    text = control_chars.sub('', text)
-
-    return text
+    return ANSI_RE.sub('', text)
 
 
 def clean_command_echo(output: str, command: str) -> str:
@@ -81,6 +79,41 @@ def clean_command_echo(output: str, command: str) -> str:
     return '\n'.join(lines)
 
 
+@lru_cache(maxsize=128)
+def _echo_pattern(command: str) -> 're.Pattern[str]':
+    """Regex (mise en cache par commande) de la ligne d'écho d'une commande"""
+    return re.compile(r'\A[^\S\n]*' + re.escape(command.strip()) + r'[^\S\n]*(?:\n|\Z)')
+
+
+def clean_pty_output(raw_output: str, command: str) -> str:
+    """
+    Nettoie l'output brut d'un shell PTY en une seule fonction
+
+    Équivalent à clean_command_echo(strip_ansi_codes(raw_output), command)
+    mais sans découpage en lignes: une passe ANSI, l'écho retiré par un
+    regex ancré mis en cache par commande, puis les lignes vides aux bords.
+
+    Args:
+        raw_output: Output brut du shell (séquences ANSI + écho)
+        command: Commande qui a été exécutée
+
+    Returns:
+        Output nettoyé
+
+    Examples:
+        >>> clean_pty_output("ls\\n\\x1b[31mfichier\\x1b[0m\\n", "ls")
+        'fichier'
+    """
+    text = ANSI_RE.sub('', raw_output)
+    text = _echo_pattern(command).sub('', text, count=1)
+
+    if not text.strip():
+        return ''
+
+    text = _LEADING_BLANK_LINES_RE.sub('', text)
+    return _TRAILING_BLANK_LINES_RE.sub('', text)
+
+
 def extract_exit_code_from_output(output: str) -> int:
     """
     Extrait l'exit code depuis l'output de 'echo $?'
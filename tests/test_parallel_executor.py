@@ -0,0 +1,85 @@
+"""Tests pour le regroupement des étapes parallélisables de l'agent"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.parallel_executor import ParallelExecutor
+
+
+def _file(path):
+    return {'action': 'create_file', 'file_path': path}
+
+
+def _group(steps):
+    """Groupes calculés par un exécuteur à 2 workers"""
+    with ParallelExecutor(max_workers=2) as executor:
+        return executor.can_parallelize(steps)
+
+
+def test_independent_files_grouped():
+    """Test: des fichiers sans conflit de chemin forment un seul groupe"""
+    steps = [_file('app/main.py'), _file('app/models.py'), _file('README.md')]
+
+    assert _group(steps) == [[0, 1, 2]]
+    print("✅ Test fichiers indépendants: PASSED")
+
+
+def test_path_conflicts():
+    """Test: même fichier ou chemin parent/enfant → groupe suivant le dernier conflit"""
+    steps = [
+        _file('app'),            # 0
+        _file('app/main.py'),    # 1: sous 'app' → après 0
+        _file('docs/index.md'),  # 2: sans conflit → premier groupe
+        _file('app/main.py'),    # 3: même fichier que 1 → après 1
+        _file('docs'),           # 4: parent de 2 → après 2
+    ]
+
+    assert _group(steps) == [[0, 2], [1, 4], [3]]
+    print("✅ Test conflits de chemins: PASSED")
+
+
+def test_barriers():
+    """Test: toute autre action s'exécute seule et sépare les groupes"""
+    steps = [
+        _file('a.py'),                                    # 0
+        _file('b.py'),                                    # 1
+        {'action': 'run_command', 'command': 'pytest'},   # 2
+        _file('c.py'),                                    # 3
+        {'action': 'create_structure', 'details': ['x']}, # 4
+        {'action': 'git_commit'},                         # 5
+        _file('a.py'),                                    # 6
+    ]
+
+    assert _group(steps) == [[0, 1], [2], [3], [4], [5], [6]]
+    print("✅ Test barrières: PASSED")
+
+
+def test_analyze_matches_can_parallelize():
+    """Test: analyze() (en cache) retourne les mêmes groupes et des copies"""
+    steps = [_file('a.py'), _file('b.py'), {'action': 'run_command', 'command': 'ls'}]
+    with ParallelExecutor(max_workers=2) as executor:
+        groups, stats = executor.analyze(steps)
+        assert groups == executor.can_parallelize(steps)
+        assert stats['steps_parallelizable'] == 2
+        groups.append([99])
+        assert executor.analyze(steps)[0] == [[0, 1], [2]]
+    print("✅ Test analyse en cache: PASSED")
+
+
+def test_execute_parallel_order_and_stop():
+    """Test: résultats dans l'ordre des tâches; arrêt → tâches restantes annulées"""
+    tasks = [{'value': i} for i in range(4)]
+    with ParallelExecutor(max_workers=2) as executor:
+        results = executor.execute_parallel(tasks, lambda task: {'success': True, 'value': task['value']})
+        assert [r['value'] for r in results] == [0, 1, 2, 3]
+
+        # Groupe trop court: exécution séquentielle, arrêtée après la 1re tâche
+        done = []
+        results = executor.execute_parallel(tasks, lambda task: {'success': True}, should_stop=lambda: bool(done),
+                                            estimated_ms=1, on_result=lambda i, r: done.append(i))
+        assert done == [0]
+        assert all(r['cancelled'] for r in results[1:])
+    print("✅ Test exécution parallèle: PASSED")
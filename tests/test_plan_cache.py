@@ -0,0 +1,77 @@
+"""Tests pour le cache de plans de projet"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.plan_cache import PlanCache, fingerprint
+
+
+def _make_plan(name):
+    """Plan FastAPI minimal dont le nom de projet est aussi un identifiant du code"""
+    return {
+        'project_name': name,
+        'structure': [{'path': f'{name}/main.py'}],
+        'steps': [
+            {'action': 'create_structure', 'details': [name, f'{name}/tests']},
+            {'action': 'create_file', 'file_path': f'{name}/main.py',
+             'content': 'from fastapi import FastAPI\napp = FastAPI()\n',
+             'description': f'Point d\'entrée de {name}'},
+            {'action': 'run_command', 'command': 'pip install fastapi'},
+        ]
+    }
+
+
+def test_fingerprint_reformulation():
+    """Test: casse, espaces et mots vides ne changent pas la clé"""
+    assert fingerprint("Crée une API FastAPI") == fingerprint("crée l'api   fastapi")
+    print("✅ Test empreinte reformulation: PASSED")
+
+
+def test_fingerprint_keeps_order():
+    """Test: source et cible inversées donnent des clés différentes"""
+    assert fingerprint("copie src vers backup") != fingerprint("copie backup vers src")
+    assert fingerprint("crée une api puis une cli") != fingerprint("crée une cli puis une api")
+    print("✅ Test empreinte ordre des mots: PASSED")
+
+
+def test_fingerprint_ignores_project_name():
+    """Test: deux demandes ne différant que par le nom partagent la clé"""
+    assert (fingerprint("Crée une API FastAPI nommée todo")
+            == fingerprint("Crée une API FastAPI nommée shop"))
+    assert fingerprint("Crée une API FastAPI nommée todo") != fingerprint("Crée une API FastAPI")
+    print("✅ Test empreinte sans nom de projet: PASSED")
+
+
+def test_lookup_substitutes_name_fields_only(tmp_path):
+    """Test: le nouveau nom remplace l'ancien dans les noms et chemins, pas dans le contenu"""
+    cache = PlanCache(path=tmp_path / 'plans.json')
+    cache.store("Crée une API FastAPI nommée app", {'is_complex': True}, _make_plan('app'))
+
+    analysis, plan = cache.lookup("Crée une API FastAPI nommée shop")
+
+    assert analysis == {'is_complex': True}
+    assert plan['project_name'] == 'shop'
+    assert plan['structure'][0]['path'] == 'shop/main.py'
+    assert plan['steps'][0]['details'] == ['shop', 'shop/tests']
+    assert plan['steps'][1]['file_path'] == 'shop/main.py'
+    # Contenu, descriptions et commandes intacts
+    assert plan['steps'][1]['content'] == 'from fastapi import FastAPI\napp = FastAPI()\n'
+    assert plan['steps'][1]['description'] == "Point d'entrée de app"
+    assert plan['steps'][2]['command'] == 'pip install fastapi'
+    print("✅ Test substitution du nom de projet: PASSED")
+
+
+def test_persistence_and_miss(tmp_path):
+    """Test: les plans survivent au rechargement, une autre demande ne matche pas"""
+    path = tmp_path / 'plans.json'
+    PlanCache(path=path).store("Crée une API FastAPI nommée todo", {}, _make_plan('todo'))
+
+    cache = PlanCache(path=path)
+    assert len(cache) == 1
+    assert cache.lookup("Crée une API Flask nommée todo") is None
+    assert cache.lookup("Crée une API FastAPI nommée blog")[1]['project_name'] == 'blog'
+    assert cache.hits("Crée une API FastAPI nommée blog") == 1
+    print("✅ Test persistance du cache de plans: PASSED")
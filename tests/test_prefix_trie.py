@@ -0,0 +1,51 @@
+"""Tests pour l'arbre de préfixes du dispatch de commandes"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.prefix_trie import PrefixTrie
+
+
+def _make_trie():
+    """Arbre avec des préfixes imbriqués et une arête à scinder"""
+    trie = PrefixTrie()
+    for key in ('/c', '/cache', '/cache clear', '/corrections', '/agent'):
+        trie.insert(key, key)
+    return trie
+
+
+def test_longest_prefix():
+    """Test: le plus long préfixe enregistré l'emporte"""
+    trie = _make_trie()
+
+    assert trie.longest_prefix('/cache clear now') == '/cache clear'
+    assert trie.longest_prefix('/cache stats') == '/cache'
+    assert trie.longest_prefix('/cache') == '/cache'
+    assert trie.longest_prefix('/corrections last') == '/corrections'
+    # Arête '/corrections' partiellement parcourue: repli sur '/c'
+    assert trie.longest_prefix('/corr') == '/c'
+    print("✅ Test plus long préfixe: PASSED")
+
+
+def test_no_prefix():
+    """Test: aucun préfixe enregistré"""
+    trie = _make_trie()
+
+    assert trie.longest_prefix('/help') is None
+    assert trie.longest_prefix('/') is None
+    assert trie.longest_prefix('') is None
+    assert PrefixTrie().longest_prefix('/cache') is None
+    print("✅ Test absence de préfixe: PASSED")
+
+
+def test_insert_replaces_value():
+    """Test: réinsérer une clé remplace sa valeur"""
+    trie = _make_trie()
+    trie.insert('/cache', 'nouveau')
+
+    assert trie.longest_prefix('/cache stats') == 'nouveau'
+    assert trie.longest_prefix('/cache clear') == '/cache clear'
+    print("✅ Test remplacement de valeur: PASSED")
@@ -54,6 +54,41 @@ def test_sudo_command():
     assert risk_level == "high"
     print("✅ Test commande sudo: PASSED")
 
+def test_validate_prefix():
+    """Test de la validation d'un début de commande (streaming)"""
+    validator = SecurityValidator()
+
+    # Préfixe contenant déjà une commande interdite: forcément bloqué
+    assert validator.validate_prefix("sudo rm -rf / --no-preserve") == False
+    # Préfixe encore indéterminé
+    assert validator.validate_prefix("rm -rf ") is None
+    assert validator.validate_prefix("ls -") is None
+    print("✅ Test validation de préfixe: PASSED")
+
+def test_validation_cache():
+    """Test du cache de validation et de son invalidation par reload_rules"""
+    validator = SecurityValidator()
+    calls = []
+    assess_risk = validator.risk_assessor.assess_risk
+
+    def counting_assess_risk(command):
+        calls.append(command)
+        return assess_risk(command)
+
+    validator.risk_assessor.assess_risk = counting_assess_risk
+
+    first = validator.validate_command("chmod 755 script.sh")
+    second = validator.validate_command("chmod 755 script.sh")
+    assert first == second
+    assert len(calls) == 1
+
+    # Règles rechargées: la commande est réévaluée
+    validator.reload_rules()
+    assert validator.ruleset_version == 1
+    assert validator.validate_command("chmod 755 script.sh") == first
+    assert len(calls) == 2
+    print("✅ Test cache de validation: PASSED")
+
 def run_all_tests():
     """Lance tous les tests"""
     print("\n" + "="*60)
@@ -65,7 +100,9 @@ def run_all_tests():
         test_dangerous_command,
         test_high_risk_command,
         test_medium_risk_command,
-        test_sudo_command
+        test_sudo_command,
+        test_validate_prefix,
+        test_validation_cache
     ]
 
     passed = 0
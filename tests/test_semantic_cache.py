@@ -0,0 +1,76 @@
+"""Tests pour le cache sémantique des réponses IA"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.semantic_cache import SemanticCache
+
+# Embeddings factices: les reformulations partagent leur vecteur
+VECTORS = {
+    'liste les fichiers': [1.0, 0.0, 0.0],
+    'affiche les fichiers': [0.99, 0.05, 0.0],
+    'supprime les fichiers': [0.98, 0.1, 0.0],
+    'quelle heure est-il': [0.0, 1.0, 0.0],
+    'supprime logs/a.txt': [0.0, 0.0, 1.0],
+    'efface logs/a.txt': [0.0, 0.05, 0.99],
+    'supprime logs/b.txt': [0.0, 0.0, 1.0],
+    'affiche les 20 dernières lignes': [0.5, 0.5, 0.0],
+    'affiche les 5 dernières lignes': [0.5, 0.5, 0.0],
+}
+RESPONSE = {'command': 'ls', 'explanation': '', 'risk_level': 'low'}
+
+
+def _make_cache():
+    """Cache contenant la réponse à 'liste les fichiers' (scope FAST, /tmp)"""
+    cache = SemanticCache(VECTORS.get)
+    cache.store('liste les fichiers', RESPONSE, '/tmp', 'fast')
+    return cache
+
+
+def test_similar_request_hits():
+    """Test: une reformulation proche est servie par le cache"""
+    cache = _make_cache()
+
+    assert cache.lookup('affiche les fichiers', '/tmp', 'fast') == RESPONSE
+    assert cache.lookup('quelle heure est-il', '/tmp', 'fast') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    print("✅ Test demande similaire: PASSED")
+
+
+def test_guards():
+    """Test: verbe critique, scope et répertoire différents → pas de hit"""
+    cache = _make_cache()
+
+    # 'supprime' est critique: jamais servi par une entrée qui ne l'a pas
+    assert cache.lookup('supprime les fichiers', '/tmp', 'fast') is None
+    assert cache.lookup('affiche les fichiers', '/tmp', 'default') is None
+    # Changement de répertoire: cache vidé
+    assert cache.lookup('affiche les fichiers', '/home', 'fast') is None
+    assert len(cache) == 0
+    print("✅ Test garde-fous du cache sémantique: PASSED")
+
+
+def test_literal_guard():
+    """Test: nombres, chaînes et chemins différents → pas de hit malgré un embedding identique"""
+    cache = SemanticCache(VECTORS.get)
+    cache.store('supprime logs/a.txt', dict(RESPONSE, command='rm logs/a.txt'), '/tmp')
+    cache.store('affiche les 20 dernières lignes', dict(RESPONSE, command='tail -n 20'), '/tmp')
+
+    assert cache.lookup('supprime logs/b.txt', '/tmp') is None
+    assert cache.lookup('affiche les 5 dernières lignes', '/tmp') is None
+    assert cache.lookup('affiche les 20 dernières lignes', '/tmp')['command'] == 'tail -n 20'
+    print("✅ Test garde-fou des valeurs littérales: PASSED")
+
+
+def test_store_skips_risky_and_unembeddable():
+    """Test: réponses à risque élevé, sans commande ou sans embedding non mises en cache"""
+    cache = SemanticCache(VECTORS.get)
+
+    cache.store('liste les fichiers', dict(RESPONSE, risk_level='high'), '/tmp')
+    cache.store('liste les fichiers', dict(RESPONSE, command=None), '/tmp')
+    cache.store('demande inconnue', RESPONSE, '/tmp')
+    assert len(cache) == 0
+    print("✅ Test réponses non mises en cache: PASSED")
@@ -0,0 +1,57 @@
+"""Tests pour le cache de templates de commandes"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.template_cache import TemplateCache
+
+REQUEST = 'affiche les 20 dernières lignes de "app.log"'
+
+
+def _make_cache(tmp_path):
+    """Cache avec un template appris en mode FAST"""
+    cache = TemplateCache(path=tmp_path / 'templates.json')
+    assert cache.store(REQUEST, 'tail -n 20 app.log', 'fast')
+    return cache
+
+
+def test_template_round_trip(tmp_path):
+    """Test: les nouvelles valeurs sont réinjectées dans le template"""
+    cache = _make_cache(tmp_path)
+
+    assert cache.lookup('affiche les 5 dernières lignes de "error.log"', 'fast') == 'tail -n 5 error.log'
+    # Rechargé depuis le disque
+    reloaded = TemplateCache(path=tmp_path / 'templates.json')
+    assert reloaded.lookup('Affiche les 7 dernières lignes de "a/b.log"', 'fast') == 'tail -n 7 a/b.log'
+    print("✅ Test aller-retour de template: PASSED")
+
+
+def test_template_scope(tmp_path):
+    """Test: un template FAST ne sert pas un autre prompt système"""
+    cache = _make_cache(tmp_path)
+
+    assert cache.lookup('affiche les 5 dernières lignes de "error.log"', 'default') is None
+    print("✅ Test scope des templates: PASSED")
+
+
+def test_unsafe_values_rejected(tmp_path):
+    """Test: une valeur qui changerait la portée de la commande n'est pas réinjectée"""
+    cache = _make_cache(tmp_path)
+
+    for value in ('*.log', 'app?.log', '~/.bashrc', '../etc/passwd', 'a.log; rm x', 'a b', '$(id)'):
+        request = f'affiche les 5 dernières lignes de "{value}"'
+        assert cache.lookup(request, 'fast') is None, value
+    print("✅ Test rejet des valeurs dangereuses: PASSED")
+
+
+def test_store_requires_unique_slots(tmp_path):
+    """Test: pas de template si une valeur est absente ou répétée dans la commande"""
+    cache = TemplateCache(path=tmp_path / 'templates.json')
+
+    assert not cache.store('affiche les 20 dernières lignes de "app.log"', 'tail app.log', 'fast')
+    assert not cache.store('copie "a" vers "a.bak"', 'cp a a.bak && ls a', 'fast')
+    assert len(cache) == 0
+    print("✅ Test slots ambigus: PASSED")